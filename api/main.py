@@ -1,6 +1,9 @@
 # api/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from src.knowledge_base.cache import AsyncCacheStore, close_async_redis_client
+from src.knowledge_base.graph_store import close_async_graph_driver
+from src.memory.episodic_memory import get_episodic_memory
 
 # Import routes
 from api.routes.query import router as query_router
@@ -35,7 +38,18 @@ def create_app() -> FastAPI:
 
     @app.get("/health")
     async def health_check():
-        return {"status": "healthy"}
+        cache = AsyncCacheStore(use_local_cache=False)
+        return {
+            "status": "healthy",
+            "cache": "connected" if await cache.ping() else "unavailable",
+        }
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        await close_async_redis_client()
+        await close_async_graph_driver()
+        if get_episodic_memory.cache_info().currsize:
+            get_episodic_memory().close()
 
     return app
 
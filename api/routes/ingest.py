@@ -1,5 +1,6 @@
 # api/routes/ingest.py
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Dict, Any
 from loguru import logger
@@ -37,7 +38,7 @@ async def ingest_document(file: UploadFile = File(...)):
 
         try:
             # Process the file
-            result = processor.process_file(temp_file_path)
+            result = await run_in_threadpool(processor.process_file, temp_file_path)
 
             if result.get("status") == "success":
                 return IngestResponse(
@@ -79,7 +80,9 @@ async def ingest_text(request: TextIngestRequest):
         logger.info(f"Received text of length: {len(request.text)}")
 
         # Process the text
-        result = processor.process_text(request.text, request.metadata)
+        result = await run_in_threadpool(
+            processor.process_text, request.text, request.metadata
+        )
 
         if result.get("status") == "success":
             return IngestResponse(
@@ -103,6 +106,28 @@ async def ingest_text(request: TextIngestRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.delete("/document/{doc_id}")
+async def delete_document(doc_id: str):
+    """Delete a document from the knowledge base"""
+    try:
+        result = await run_in_threadpool(processor.delete_document, doc_id)
+
+        if result.get("status") == "success":
+            return {
+                "message": f"Document {doc_id} deleted successfully",
+                "chunks_deleted": result.get("chunks", 0),
+            }
+        else:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Deletion failed: {result.get('error', 'Unknown error')}",
+            )
+
+    except Exception as e:
+        logger.error(f"Error deleting document: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/stats")
 async def get_ingestion_stats():
     """Get ingestion statistics"""
@@ -9,10 +9,34 @@ class Settings(BaseSettings):
     gemini_api_key: str = ""
     llm_provider: str = "gemini"  # "openai" or "gemini"
 
+    # Graph backend
+    graph_backend: str = "neo4j"  # "neo4j" or "embedded" (SQLite)
+    graph_embedded_path: str = "./data/graph.db"
+
     # Neo4j
     neo4j_uri: str = "bolt://localhost:7687"
     neo4j_user: str = "neo4j"
     neo4j_password: str = "password123"
+    neo4j_database: str = "neo4j"
+    neo4j_max_connection_pool_size: int = 50
+    neo4j_connection_acquisition_timeout: float = 10.0  # seconds
+    neo4j_max_connection_lifetime: int = 3600  # seconds
+    neo4j_read_timeout: float = 5.0  # seconds per read transaction
+    graph_schema_auto_apply: bool = True
+    graph_legacy_entity_labels: str = ""  # comma-separated types to migrate
+    graph_write_batch_size: int = 5000
+    graph_write_parallelism: int = 4
+    graph_snapshot_enabled: bool = False
+    graph_snapshot_refresh_interval: int = 60  # seconds
+    graph_snapshot_full_reload_interval: int = 3600  # catches deletions
+    graph_snapshot_max_depth: int = 2
+    graph_traversal_mode: str = "bfs"  # "bfs" or "path"
+    graph_bfs_fanout: int = 50  # edges expanded per frontier node
+    graph_bfs_max_frontier: int = 200  # frontier nodes per seed per hop
+    graph_bfs_max_degree: int = 1000  # super-nodes above this are not expanded
+    graph_centrality_weight: float = 0.5  # boost for central entities in ranking
+    graph_ppr_enabled: bool = False  # query-time personalised PageRank
+    graph_centrality_cache_path: str = "./data/graph_centrality.npz"
 
     # PostgreSQL
     postgres_host: str = "localhost"
@@ -24,6 +48,35 @@ class Settings(BaseSettings):
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
+    redis_max_connections: int = 50
+    redis_socket_timeout: float = 5.0
+    redis_health_check_interval: int = 30
+
+    # Cache value serialisation
+    cache_codec: str = "msgpack"  # "msgpack", "pickle" or "json"
+    cache_compression: str = "zstd"  # "zstd", "lz4" or "none"
+    cache_compression_threshold: int = 1024
+
+    # In-process L1 cache in front of Redis
+    l1_cache_enabled: bool = False
+    l1_cache_max_entries: int = 1024
+    l1_cache_max_bytes: int = 64 * 1024 * 1024
+    l1_cache_ttl: int = 60
+
+    # Search result cache (keys are versioned by corpus generation)
+    search_cache_ttl: int = 86400
+
+    # Request coalescing for concurrent cache misses
+    single_flight_distributed: bool = False
+    single_flight_lock_ttl_ms: int = 10000
+    single_flight_wait_timeout: float = 10.0
+
+    # Semantic result cache
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_max_entries: int = 1000
+    semantic_cache_ttl: int = 3600
+    semantic_cache_sample_rate: float = 0.01
 
     # Embedding
     embedding_model: str = "models/text-embedding-004"  # Gemini embedding model
@@ -34,6 +87,12 @@ class Settings(BaseSettings):
     llm_temperature: float = 0.7
     llm_max_tokens: int = 2000
 
+    # Ingestion-time graph extraction
+    graph_extraction_enabled: bool = False
+    entity_extractor: str = "rule"  # "rule" or "package.module:ClassName"
+    entity_gazetteer_path: str = ""
+    entity_extraction_workers: int = 4
+
     # ChromaDB
     chroma_persist_dir: str = "./data/chroma_db"
 
@@ -41,6 +100,37 @@ class Settings(BaseSettings):
     chunk_size: int = 1000
     chunk_overlap: int = 200
     max_retrieval_results: int = 10
+    context_token_budget: int = 3000
+    context_token_encoding: str = "cl100k_base"
+    context_max_item_tokens: int = 800
+
+    # Session compaction
+    session_compaction_enabled: bool = True
+    session_compaction_threshold: int = 20  # raw turns that trigger a fold
+    session_compaction_keep_recent: int = 6  # raw turns kept after a fold
+    session_compaction_workers: int = 1
+    session_summary_max_tokens: int = 400
+
+    # Session tiering: idle sessions move from Redis to Postgres
+    session_archive_enabled: bool = False
+    session_spill_idle_seconds: int = 1800  # keep below the session TTL
+    session_spill_interval: int = 60
+    session_spill_batch_size: int = 200
+
+    # Episodic memory (per-user vector index of past interactions)
+    episodic_memory_enabled: bool = False
+    episodic_batch_size: int = 32
+    episodic_flush_interval: float = 2.0
+    episodic_max_queue: int = 10000
+    episodic_half_life_days: float = 30.0
+    episodic_decay_floor: float = 0.3
+    episodic_candidate_multiplier: int = 4
+
+    # Semantic memory (deduplicated per-user facts)
+    semantic_fact_merge_threshold: float = 0.92
+    semantic_fact_cache_ttl: int = 300
+    semantic_fact_cache_max_users: int = 1024
+
     log_level: str = "INFO"
 
     @property
@@ -12,7 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from loguru import logger
 from config.settings import get_settings
 from src.knowledge_base.vector_store import VectorStore
-from src.knowledge_base.graph_store import GraphStore
+from src.knowledge_base.graph_backend import create_graph_store
 import redis
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
@@ -35,7 +35,16 @@ def setup_graph_store():
     """Initialize Neo4j graph store"""
     try:
         logger.info("Setting up graph store...")
-        graph_store = GraphStore()
+        graph_store = create_graph_store()
+
+        # Apply entity constraints/indexes and label nodes created before them
+        graph_store.ensure_schema()
+        legacy_labels = [
+            label.strip()
+            for label in get_settings().graph_legacy_entity_labels.split(",")
+            if label.strip()
+        ]
+        graph_store.migrate_entity_labels(labels=legacy_labels or None)
 
         # Test connection by getting stats
         stats = graph_store.get_graph_stats()
@@ -24,7 +24,7 @@ def test_imports():
         from src.ingestion.embedder import Embedder
         from src.ingestion.processor import IngestionProcessor
         from src.knowledge_base.vector_store import VectorStore
-        from src.knowledge_base.graph_store import GraphStore
+        from src.knowledge_base.graph_backend import create_graph_store
         from src.knowledge_base.metadata_store import MetadataStore
         from src.knowledge_base.cache import CacheStore
         from src.memory.working_memory import WorkingMemory
@@ -61,9 +61,9 @@ def test_databases():
 
     # Test Graph Store
     try:
-        from src.knowledge_base.graph_store import GraphStore
+        from src.knowledge_base.graph_backend import create_graph_store
 
-        gs = GraphStore()
+        gs = create_graph_store()
         stats = gs.get_graph_stats()
         logger.info(
             f"✅ Graph Store: {stats['nodes']} nodes, {stats['relationships']} relationships"
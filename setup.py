@@ -36,6 +36,8 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.0.0",
+            "pytest-asyncio>=0.21.0",
+            "fakeredis[lua]>=2.20.0",
             "black>=22.0.0",
             "isort>=5.0.0",
             "flake8>=4.0.0",
@@ -0,0 +1,261 @@
+# src/ingestion/extractor.py
+import hashlib
+import importlib
+import json
+import multiprocessing
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from config.settings import get_settings
+
+# Runs of capitalised words, allowing inner connectors ("Bank of England")
+_CANDIDATE = re.compile(
+    r"\b[A-Z][\w&\-]*(?:\s+(?:of\s+|de\s+)?[A-Z][\w&\-]*)*"
+)
+
+_STOPWORDS = {
+    "A", "An", "And", "As", "At", "But", "By", "For", "From", "He", "Her",
+    "His", "How", "I", "If", "In", "It", "Its", "Me", "My", "No", "Not",
+    "Of", "On", "Or", "Our", "She", "So", "That", "The", "Their", "There",
+    "These", "They", "This", "Those", "To", "We", "What", "When", "Where",
+    "Which", "Who", "Why", "With", "You", "Your",
+}
+
+_ORGANIZATION_SUFFIXES = (
+    "Inc", "Corp", "Corporation", "Ltd", "LLC", "Company", "Group",
+    "University", "Institute", "Foundation", "Bank", "Agency",
+)
+
+
+def entity_id(name: str) -> str:
+    """Stable entity ID for a normalised name"""
+    return "entity_" + hashlib.md5(name.lower().encode()).hexdigest()
+
+
+# Per-process extractor state, set once by the pool initializer so the
+# gazetteer is not pickled with every task
+_worker_state: Tuple[Dict[str, Tuple[str, str]], Optional[re.Pattern], int] = (
+    {},
+    None,
+    3,
+)
+
+
+def _init_worker(
+    gazetteer: Dict[str, Tuple[str, str]],
+    gazetteer_pattern: Optional[re.Pattern],
+    min_length: int,
+):
+    global _worker_state
+    _worker_state = (gazetteer, gazetteer_pattern, min_length)
+
+
+def _worker_extract(task: Tuple[str, str]) -> Tuple[str, Dict[str, Tuple[str, int]]]:
+    chunk_id, text = task
+    return chunk_id, _extract_chunk(text, *_worker_state)
+
+
+def _extract_chunk(
+    text: str,
+    gazetteer: Dict[str, Tuple[str, str]],
+    gazetteer_pattern: Optional[re.Pattern],
+    min_length: int,
+) -> Dict[str, Tuple[str, int]]:
+    """Extract entity mentions from one chunk as name -> (type, count)
+
+    Mentions are counted case-insensitively, like entity ids; each entity
+    keeps the first spelling seen, or its gazetteer name.
+    """
+    mentions: Counter = Counter()
+    names: Dict[str, str] = {}
+    types: Dict[str, str] = {}
+
+    for match in _CANDIDATE.finditer(text):
+        words = match.group(0).split()
+        # Drop leading stopwords picked up at sentence starts
+        while words and words[0] in _STOPWORDS:
+            words = words[1:]
+        name = " ".join(words)
+        key = name.lower()
+        if len(name) < min_length or key in gazetteer:
+            continue
+        mentions[key] += 1
+        if key not in types:
+            names[key] = name
+            types[key] = (
+                "Organization" if name.endswith(_ORGANIZATION_SUFFIXES) else "Concept"
+            )
+
+    # Known terms are matched case-insensitively and keep their canonical name
+    if gazetteer_pattern is not None:
+        for match in gazetteer_pattern.finditer(text):
+            key = match.group(0).lower()
+            names[key], types[key] = gazetteer[key]
+            mentions[key] += 1
+
+    return {names[key]: (types[key], count) for key, count in mentions.items()}
+
+
+class EntityExtractor(ABC):
+    """Base class for pluggable entity and relation extractors"""
+
+    @abstractmethod
+    def extract(self, chunks: List[Dict[str, Any]], doc_id: str) -> Dict[str, Any]:
+        """Return ``entities``, ``relationships`` and ``mentions`` rows
+
+        Rows use the formats accepted by ``GraphStore.merge_entities``,
+        ``merge_relationships`` and ``merge_mentions``.
+        """
+
+    def close(self):
+        """Release any resources held by the extractor"""
+
+
+class RuleBasedExtractor(EntityExtractor):
+    """Fast capitalisation/gazetteer extractor with co-occurrence edges
+
+    Large documents are spread over a process pool; small ones are handled
+    inline, where pool IPC would cost more than the extraction itself. Pool
+    workers are spawned rather than forked, since extraction is called from
+    threads of a multi-threaded server.
+    """
+
+    def __init__(
+        self,
+        gazetteer: Optional[Dict[str, str]] = None,
+        workers: int = 4,
+        min_length: int = 3,
+        max_pair_entities: int = 15,
+        parallel_threshold: int = 32,
+    ):
+        # lowercased term -> (canonical name, entity type)
+        self.gazetteer = {
+            name.lower(): (name, entity_type)
+            for name, entity_type in (gazetteer or {}).items()
+        }
+        self.gazetteer_pattern = (
+            re.compile(
+                r"\b(?:"
+                + "|".join(
+                    re.escape(term)
+                    for term in sorted(self.gazetteer, key=len, reverse=True)
+                )
+                + r")\b",
+                re.IGNORECASE,
+            )
+            if self.gazetteer
+            else None
+        )
+        self.workers = workers
+        self.min_length = min_length
+        self.max_pair_entities = max_pair_entities
+        self.parallel_threshold = parallel_threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def extract(self, chunks: List[Dict[str, Any]], doc_id: str) -> Dict[str, Any]:
+        tasks = [(chunk["chunk_id"], chunk["text"]) for chunk in chunks]
+
+        if self.workers > 1 and len(tasks) >= self.parallel_threshold:
+            per_chunk = list(
+                self._get_pool().map(
+                    _worker_extract,
+                    tasks,
+                    chunksize=max(1, len(tasks) // (self.workers * 4)),
+                )
+            )
+        else:
+            per_chunk = [
+                (
+                    chunk_id,
+                    _extract_chunk(
+                        text, self.gazetteer, self.gazetteer_pattern, self.min_length
+                    ),
+                )
+                for chunk_id, text in tasks
+            ]
+
+        entities: Dict[str, Dict[str, Any]] = {}
+        pair_counts: Counter = Counter()
+        mentions = []
+
+        for chunk_id, found in per_chunk:
+            for name, (entity_type, count) in found.items():
+                eid = entity_id(name)
+                entities.setdefault(
+                    eid,
+                    {"id": eid, "type": entity_type, "properties": {"name": name}},
+                )
+                mentions.append(
+                    {"from": eid, "to": chunk_id, "doc_id": doc_id, "count": count}
+                )
+
+            # Co-occurrence edges between the most frequent entities in the chunk
+            top = sorted(found, key=lambda n: -found[n][1])[: self.max_pair_entities]
+            # Names differing only in case share an id; never pair them
+            for a, b in combinations(sorted({entity_id(n) for n in top}), 2):
+                pair_counts[(a, b)] += 1
+
+        relationships = [
+            {
+                "from": a,
+                "to": b,
+                "type": "CO_OCCURS_WITH",
+                "properties": {"weight": count, "doc_id": doc_id},
+            }
+            for (a, b), count in pair_counts.items()
+        ]
+
+        return {
+            "entities": list(entities.values()),
+            "relationships": relationships,
+            "mentions": mentions,
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.gazetteer, self.gazetteer_pattern, self.min_length),
+                )
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+def load_extractor(name: Optional[str] = None) -> EntityExtractor:
+    """Build the configured extractor
+
+    ``rule`` selects the built-in extractor; anything else is imported as
+    ``package.module:ClassName`` and constructed without arguments.
+    """
+    settings = get_settings()
+    name = name or settings.entity_extractor
+
+    if name == "rule":
+        gazetteer = {}
+        if settings.entity_gazetteer_path:
+            with open(settings.entity_gazetteer_path, "r", encoding="utf-8") as f:
+                gazetteer = json.load(f)
+        logger.info(f"Using rule-based extractor ({len(gazetteer)} gazetteer terms)")
+        return RuleBasedExtractor(
+            gazetteer=gazetteer, workers=settings.entity_extraction_workers
+        )
+
+    module_name, _, class_name = name.partition(":")
+    extractor_class = getattr(importlib.import_module(module_name), class_name)
+    logger.info(f"Using extractor {name}")
+    return extractor_class()
@@ -5,6 +5,10 @@ from src.ingestion.chunker import DocumentChunker
 from src.ingestion.embedder import Embedder
 from src.knowledge_base.vector_store import VectorStore
 from src.knowledge_base.metadata_store import MetadataStore
+from src.knowledge_base.cache import CacheStore
+from src.knowledge_base.graph_backend import create_graph_store
+from src.ingestion.extractor import load_extractor
+from config.settings import get_settings
 from loguru import logger
 from tqdm import tqdm
 
@@ -18,6 +22,15 @@ class IngestionProcessor:
         self.embedder = Embedder()
         self.vector_store = VectorStore()
         self.metadata_store = MetadataStore()
+        self.cache = CacheStore()
+        self.settings = get_settings()
+
+        # Entity/relation extraction feeding the graph store
+        self.graph_store = None
+        self.extractor = None
+        if self.settings.graph_extraction_enabled:
+            self.graph_store = create_graph_store()
+            self.extractor = load_extractor()
 
     def process_file(self, file_path: str) -> Dict[str, Any]:
         """Process a single file"""
@@ -52,6 +65,12 @@ class IngestionProcessor:
             for chunk in chunks:
                 self.metadata_store.store_chunk(doc_id, chunk)
 
+            # Extract entities and relationships into the graph
+            self._extract_graph(chunks, doc_id)
+
+            # Invalidate cached search results for the previous corpus
+            self.cache.bump_generation()
+
             logger.info(f"✅ Processed {len(chunks)} chunks from {file_path}")
 
             return {
@@ -104,6 +123,12 @@ class IngestionProcessor:
             for chunk in chunks:
                 self.metadata_store.store_chunk(doc_id, chunk)
 
+            # Extract entities and relationships into the graph
+            self._extract_graph(chunks, doc_id)
+
+            # Invalidate cached search results for the previous corpus
+            self.cache.bump_generation()
+
             logger.info(f"✅ Processed {len(chunks)} chunks from raw text")
 
             return {"doc_id": doc_id, "chunks": len(chunks), "status": "success"}
@@ -112,6 +137,56 @@ class IngestionProcessor:
             logger.error(f"Error processing text: {e}")
             return {"error": str(e), "status": "error"}
 
+    def _extract_graph(self, chunks: List[Dict[str, Any]], doc_id: str):
+        """Write extracted entities, edges and entity->chunk links in bulk"""
+        if not self.extractor:
+            return
+
+        try:
+            extracted = self.extractor.extract(chunks, doc_id)
+
+            # Entity -> chunk inverted index used to hydrate graph hits
+            self.metadata_store.store_entity_chunks(
+                [
+                    {
+                        "entity_id": mention["from"],
+                        "chunk_id": mention["to"],
+                        "score": mention["count"],
+                    }
+                    for mention in extracted["mentions"]
+                ]
+            )
+
+            self.graph_store.merge_entities(extracted["entities"])
+            self.graph_store.merge_relationships(extracted["relationships"])
+            self.graph_store.merge_mentions(extracted["mentions"])
+            logger.info(
+                f"Extracted {len(extracted['entities'])} entities and "
+                f"{len(extracted['relationships'])} relationships from {doc_id}"
+            )
+        except Exception as e:
+            # The document is already searchable; a graph failure should not fail ingestion
+            logger.error(f"Graph extraction error for {doc_id}: {e}")
+
+    def delete_document(self, doc_id: str) -> Dict[str, Any]:
+        """Delete a document from all stores"""
+        logger.info(f"Deleting document: {doc_id}")
+
+        try:
+            chunk_ids = self.metadata_store.delete_document(doc_id)
+            self.vector_store.delete_documents(chunk_ids)
+            if self.graph_store:
+                self.graph_store.delete_document_chunks(doc_id)
+
+            # Invalidate cached search results for the previous corpus
+            self.cache.bump_generation()
+
+            return {"doc_id": doc_id, "chunks": len(chunk_ids), "status": "success"}
+
+        except Exception as e:
+            logger.error(f"Error deleting {doc_id}: {e}")
+            return {"doc_id": doc_id, "error": str(e), "status": "error"}
+
     def process_directory(self, directory: str) -> List[Dict[str, Any]]:
         """Process all files in directory"""
         documents = self.loader.load_directory(directory)
@@ -1,37 +1,76 @@
 # src/knowledge_base/cache.py
 import redis
+import redis.asyncio as aioredis
 import json
-from typing import Any, Optional, List
+import time
+import uuid
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, Optional, List
 from config.settings import get_settings
+from src.knowledge_base.local_cache import LocalCache
+from src.knowledge_base.codecs import CacheCodec
 from loguru import logger
 
+INVALIDATION_CHANNEL = "cache:invalidate"
+PROCESS_ID = uuid.uuid4().hex
+
 
 class CacheStore:
-    """Redis cache operations"""
+    """Redis cache operations with an optional in-process L1 tier"""
 
-    def __init__(self):
+    def __init__(self, use_local_cache: Optional[bool] = None):
         self.settings = get_settings()
-        self.redis_client = redis.Redis(
-            host=self.settings.redis_host,
-            port=self.settings.redis_port,
-            decode_responses=True,
-        )
+        self.redis_client = get_redis_client()
+        self.codec = get_codec()
+
+        if use_local_cache is None:
+            use_local_cache = self.settings.l1_cache_enabled
+        self.local_cache = get_local_cache() if use_local_cache else None
+
         logger.info("Cache store initialized")
 
     def set(self, key: str, value: Any, expire: int = 3600):
         """Set a key-value pair with expiration"""
         try:
-            serialized_value = json.dumps(value)
-            self.redis_client.setex(key, expire, serialized_value)
+            serialized_value = self.codec.encode(value)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, expire, serialized_value)
+            if self.local_cache:
+                self._publish_invalidation(pipe, keys=[key])
+            pipe.execute()
+            if self.local_cache:
+                self.local_cache.set(key, value, len(serialized_value), expire)
         except Exception as e:
             logger.error(f"Cache set error: {e}")
 
     def get(self, key: str) -> Optional[Any]:
-        """Get value by key"""
+        """Get value by key
+
+        Values served from the L1 tier are shared, so callers must not
+        mutate them in place.
+        """
         try:
+            if self.local_cache:
+                value = self.local_cache.get(key)
+                if value is not None:
+                    return value
+
+                # Fetch the remaining TTL in the same round trip
+                value, ttl = (
+                    self.redis_client.pipeline().get(key).ttl(key).execute()
+                )
+                if value:
+                    decoded = self.codec.decode(value)
+                    self.local_cache.set(
+                        key, decoded, len(value), ttl if ttl > 0 else None
+                    )
+                    return decoded
+                return None
+
             value = self.redis_client.get(key)
             if value:
-                return json.loads(value)
+                return self.codec.decode(value)
             return None
         except Exception as e:
             logger.error(f"Cache get error: {e}")
@@ -40,7 +79,13 @@ class CacheStore:
     def delete(self, key: str):
         """Delete a key"""
         try:
-            self.redis_client.delete(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(key)
+            if self.local_cache:
+                self._publish_invalidation(pipe, keys=[key])
+            pipe.execute()
+            if self.local_cache:
+                self.local_cache.delete(key)
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
 
@@ -58,9 +103,13 @@ class CacheStore:
             pipe = self.redis_client.pipeline()
             pipe.delete(key)
             for value in values:
-                pipe.rpush(key, json.dumps(value))
+                pipe.rpush(key, self.codec.encode(value))
             pipe.expire(key, expire)
+            if self.local_cache:
+                self._publish_invalidation(pipe, keys=[key])
             pipe.execute()
+            if self.local_cache:
+                self.local_cache.delete(key)
         except Exception as e:
             logger.error(f"Cache set_list error: {e}")
 
@@ -68,19 +117,167 @@ class CacheStore:
         """Get list by key"""
         try:
             values = self.redis_client.lrange(key, 0, -1)
-            return [json.loads(value) for value in values]
+            return [self.codec.decode(value) for value in values]
         except Exception as e:
             logger.error(f"Cache get_list error: {e}")
             return []
 
-    def clear_pattern(self, pattern: str):
-        """Clear keys matching pattern"""
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip, None for missing keys"""
+        results: List[Optional[Any]] = [None] * len(keys)
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                self.redis_client.delete(*keys)
+            missing = []
+            for i, key in enumerate(keys):
+                value = self.local_cache.get(key) if self.local_cache else None
+                if value is not None:
+                    results[i] = value
+                else:
+                    missing.append(i)
+
+            if not missing:
+                return results
+
+            if self.local_cache:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for i in missing:
+                    pipe.get(keys[i])
+                    pipe.ttl(keys[i])
+                replies = pipe.execute()
+                values, ttls = replies[0::2], replies[1::2]
+            else:
+                values = self.redis_client.mget([keys[i] for i in missing])
+                ttls = [None] * len(missing)
+
+            for i, value, ttl in zip(missing, values, ttls):
+                if not value:
+                    continue
+                results[i] = self.codec.decode(value)
+                if self.local_cache:
+                    self.local_cache.set(
+                        keys[i], results[i], len(value), ttl if ttl > 0 else None
+                    )
+            return results
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+            return results
+
+    def set_many(self, mapping: Dict[str, Any], expire: int = 3600):
+        """Set several key-value pairs with expiration in one round trip"""
+        if not mapping:
+            return
+        try:
+            encoded = {key: self.codec.encode(value) for key, value in mapping.items()}
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in encoded.items():
+                pipe.setex(key, expire, value)
+            if self.local_cache:
+                self._publish_invalidation(pipe, keys=list(mapping))
+            pipe.execute()
+
+            if self.local_cache:
+                for key, value in mapping.items():
+                    self.local_cache.set(key, value, len(encoded[key]), expire)
+        except Exception as e:
+            logger.error(f"Cache set_many error: {e}")
+
+    def delete_many(self, keys: List[str]):
+        """Delete several keys without blocking Redis on large values"""
+        if not keys:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.unlink(*keys)
+            if self.local_cache:
+                self._publish_invalidation(pipe, keys=keys)
+            pipe.execute()
+            if self.local_cache:
+                self.local_cache.delete(*keys)
+        except Exception as e:
+            logger.error(f"Cache delete_many error: {e}")
+
+    def clear_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """Clear keys matching pattern
+
+        Keys are found incrementally with SCAN and removed in UNLINK batches,
+        so large keyspaces are never blocked by a single KEYS or DEL call.
+        """
+        deleted = 0
+        try:
+            batch = []
+            for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis_client.unlink(*batch)
+
+            if self.local_cache:
+                self.local_cache.delete_pattern(pattern)
+                self._publish_invalidation(self.redis_client, pattern=pattern)
+
+            logger.info(f"Cleared {deleted} keys matching {pattern}")
         except Exception as e:
             logger.error(f"Cache clear_pattern error: {e}")
+        return deleted
+
+    def set_vector(self, key: str, vector: List[float], expire: int = 3600):
+        """Set an embedding stored as raw float32 bytes"""
+        try:
+            self.redis_client.setex(key, expire, self.codec.encode_vector(vector))
+        except Exception as e:
+            logger.error(f"Cache set_vector error: {e}")
+
+    def get_vector(self, key: str) -> Optional[np.ndarray]:
+        """Get an embedding stored with set_vector"""
+        try:
+            value = self.redis_client.get(key)
+            if value:
+                return self.codec.decode(value)
+            return None
+        except Exception as e:
+            logger.error(f"Cache get_vector error: {e}")
+            return None
+
+    def get_generation(self, namespace: str = "corpus") -> int:
+        """Get the current generation counter for a namespace"""
+        key = f"generation:{namespace}"
+        try:
+            if self.local_cache:
+                value = self.local_cache.get(key)
+                if value is not None:
+                    return value
+
+            value = self.redis_client.get(key)
+            generation = int(value) if value else 0
+            if self.local_cache:
+                self.local_cache.set(key, generation, len(str(generation)))
+            return generation
+        except Exception as e:
+            logger.error(f"Cache get_generation error: {e}")
+            return 0
+
+    def bump_generation(self, namespace: str = "corpus") -> int:
+        """Increment a namespace generation, invalidating keys built from it"""
+        key = f"generation:{namespace}"
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.incr(key)
+            if self.local_cache:
+                self._publish_invalidation(pipe, keys=[key])
+            generation = pipe.execute()[0]
+            if self.local_cache:
+                self.local_cache.set(key, generation, len(str(generation)))
+            logger.info(f"Bumped {namespace} cache generation to {generation}")
+            return generation
+        except Exception as e:
+            logger.error(f"Cache bump_generation error: {e}")
+            return 0
+
+    def get_local_stats(self) -> Optional[dict]:
+        """Get L1 cache statistics"""
+        return self.local_cache.get_stats() if self.local_cache else None
 
     def ping(self) -> bool:
         """Test connection"""
@@ -89,3 +286,217 @@ class CacheStore:
         except Exception as e:
             logger.error(f"Cache ping error: {e}")
             return False
+
+    @staticmethod
+    def _publish_invalidation(
+        client, keys: Optional[List[str]] = None, pattern: Optional[str] = None
+    ):
+        """Tell other processes to drop their L1 copies
+
+        ``client`` is usually the pipeline carrying the write, so the
+        invalidation costs no extra round trip.
+        """
+        message = {"sender": PROCESS_ID, "keys": keys or [], "pattern": pattern}
+        client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+
+
+@lru_cache()
+def get_redis_client() -> redis.Redis:
+    """Process-wide Redis client backed by a shared connection pool
+
+    Values are binary-encoded by the codec, so responses stay as bytes.
+    """
+    settings = get_settings()
+    pool = redis.ConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        max_connections=settings.redis_max_connections,
+        socket_timeout=settings.redis_socket_timeout,
+        health_check_interval=settings.redis_health_check_interval,
+        decode_responses=False,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+@lru_cache()
+def get_async_redis_client() -> aioredis.Redis:
+    """Process-wide asyncio Redis client backed by a shared connection pool"""
+    settings = get_settings()
+    pool = aioredis.ConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        max_connections=settings.redis_max_connections,
+        socket_timeout=settings.redis_socket_timeout,
+        health_check_interval=settings.redis_health_check_interval,
+        decode_responses=False,
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
+async def close_async_redis_client():
+    """Disconnect the shared asyncio pool, e.g. on application shutdown"""
+    if get_async_redis_client.cache_info().currsize:
+        await get_async_redis_client().connection_pool.disconnect()
+        get_async_redis_client.cache_clear()
+
+
+class AsyncCacheStore:
+    """Non-blocking cache operations for async handlers
+
+    Shares the codec, key layout and L1 tier with CacheStore, so values
+    written by either front end can be read by the other.
+    """
+
+    def __init__(self, use_local_cache: Optional[bool] = None):
+        self.settings = get_settings()
+        self.redis_client = get_async_redis_client()
+        self.codec = get_codec()
+
+        if use_local_cache is None:
+            use_local_cache = self.settings.l1_cache_enabled
+        self.local_cache = get_local_cache() if use_local_cache else None
+
+    async def set(self, key: str, value: Any, expire: int = 3600):
+        """Set a key-value pair with expiration"""
+        try:
+            serialized_value = self.codec.encode(value)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, expire, serialized_value)
+            if self.local_cache:
+                CacheStore._publish_invalidation(pipe, keys=[key])
+            await pipe.execute()
+            if self.local_cache:
+                self.local_cache.set(key, value, len(serialized_value), expire)
+        except Exception as e:
+            logger.error(f"Async cache set error: {e}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value by key (L1 values are shared, do not mutate them)"""
+        results = await self.get_many([key])
+        return results[0]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip, None for missing keys"""
+        results: List[Optional[Any]] = [None] * len(keys)
+        try:
+            missing = []
+            for i, key in enumerate(keys):
+                value = self.local_cache.get(key) if self.local_cache else None
+                if value is not None:
+                    results[i] = value
+                else:
+                    missing.append(i)
+
+            if not missing:
+                return results
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for i in missing:
+                pipe.get(keys[i])
+                pipe.ttl(keys[i])
+            replies = await pipe.execute()
+
+            for i, value, ttl in zip(missing, replies[0::2], replies[1::2]):
+                if not value:
+                    continue
+                results[i] = self.codec.decode(value)
+                if self.local_cache:
+                    self.local_cache.set(
+                        keys[i], results[i], len(value), ttl if ttl > 0 else None
+                    )
+            return results
+        except Exception as e:
+            logger.error(f"Async cache get_many error: {e}")
+            return results
+
+    async def delete(self, key: str):
+        """Delete a key"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.unlink(key)
+            if self.local_cache:
+                CacheStore._publish_invalidation(pipe, keys=[key])
+            await pipe.execute()
+            if self.local_cache:
+                self.local_cache.delete(key)
+        except Exception as e:
+            logger.error(f"Async cache delete error: {e}")
+
+    async def get_generation(self, namespace: str = "corpus") -> int:
+        """Get the current generation counter for a namespace"""
+        key = f"generation:{namespace}"
+        try:
+            if self.local_cache:
+                value = self.local_cache.get(key)
+                if value is not None:
+                    return value
+
+            value = await self.redis_client.get(key)
+            generation = int(value) if value else 0
+            if self.local_cache:
+                self.local_cache.set(key, generation, len(str(generation)))
+            return generation
+        except Exception as e:
+            logger.error(f"Async cache get_generation error: {e}")
+            return 0
+
+    async def ping(self) -> bool:
+        """Test connection"""
+        try:
+            return await self.redis_client.ping()
+        except Exception as e:
+            logger.error(f"Async cache ping error: {e}")
+            return False
+
+
+@lru_cache()
+def get_codec() -> CacheCodec:
+    """Process-wide codec for cache values"""
+    settings = get_settings()
+    return CacheCodec(
+        codec=settings.cache_codec,
+        compression=settings.cache_compression,
+        compression_threshold=settings.cache_compression_threshold,
+    )
+
+
+@lru_cache()
+def get_local_cache() -> LocalCache:
+    """Process-wide L1 cache kept coherent through Redis pub/sub"""
+    settings = get_settings()
+    local_cache = LocalCache(
+        max_entries=settings.l1_cache_max_entries,
+        max_bytes=settings.l1_cache_max_bytes,
+        ttl=settings.l1_cache_ttl,
+    )
+
+    def handle_invalidation(message):
+        try:
+            data = json.loads(message["data"])
+            if data.get("sender") == PROCESS_ID:
+                return
+            if data.get("keys"):
+                local_cache.delete(*data["keys"])
+            if data.get("pattern"):
+                local_cache.delete_pattern(data["pattern"])
+        except Exception as e:
+            logger.error(f"Cache invalidation error: {e}")
+
+    def handle_error(error, pubsub, thread):
+        # Invalidations may have been missed while disconnected, so drop
+        # everything; the next get_message reconnects and resubscribes
+        logger.error(f"Cache invalidation listener error: {error}")
+        local_cache.clear()
+        time.sleep(1.0)
+
+    try:
+        pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: handle_invalidation})
+        pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=handle_error
+        )
+    except Exception as e:
+        # Entries still expire after l1_cache_ttl without cross-process invalidation
+        logger.error(f"Cache invalidation subscribe error: {e}")
+
+    return local_cache
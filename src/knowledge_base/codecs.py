@@ -0,0 +1,160 @@
+# src/knowledge_base/codecs.py
+import json
+import pickle
+from typing import Any, List
+
+import numpy as np
+from loguru import logger
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+
+# Encoded values start with MAGIC + format version + codec id + compression id.
+# Anything without the magic prefix is treated as a legacy JSON value.
+MAGIC = b"KB"
+FORMAT_VERSION = 1
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+CODEC_PICKLE = 2
+CODEC_VECTOR = 3
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+CODEC_IDS = {"json": CODEC_JSON, "msgpack": CODEC_MSGPACK, "pickle": CODEC_PICKLE}
+COMPRESSION_IDS = {
+    "none": COMPRESSION_NONE,
+    "zstd": COMPRESSION_ZSTD,
+    "lz4": COMPRESSION_LZ4,
+}
+
+# msgpack extension type used for float32 NumPy arrays
+_EXT_FLOAT32 = 1
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return msgpack.ExtType(_EXT_FLOAT32, obj.astype(np.float32).tobytes())
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_FLOAT32:
+        return np.frombuffer(data, dtype=np.float32)
+    return msgpack.ExtType(code, data)
+
+
+class CacheCodec:
+    """Versioned, optionally compressed serialisation for cache values"""
+
+    def __init__(
+        self,
+        codec: str = "msgpack",
+        compression: str = "zstd",
+        compression_threshold: int = 1024,
+    ):
+        if codec == "msgpack" and msgpack is None:
+            logger.warning("msgpack not installed, falling back to pickle codec")
+            codec = "pickle"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed, disabling compression")
+            compression = "none"
+        if compression == "lz4" and lz4_frame is None:
+            logger.warning("lz4 not installed, disabling compression")
+            compression = "none"
+
+        if codec not in CODEC_IDS:
+            raise ValueError(f"Unsupported cache codec: {codec}")
+        if compression not in COMPRESSION_IDS:
+            raise ValueError(f"Unsupported cache compression: {compression}")
+
+        self.codec_id = CODEC_IDS[codec]
+        self.compression_id = COMPRESSION_IDS[compression]
+        self.compression_threshold = compression_threshold
+
+        if self.compression_id == COMPRESSION_ZSTD:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=3)
+        if zstandard is not None:
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, value: Any) -> bytes:
+        """Serialise a value with the configured codec"""
+        if self.codec_id == CODEC_MSGPACK:
+            payload = msgpack.packb(
+                value, use_bin_type=True, default=_msgpack_default
+            )
+        elif self.codec_id == CODEC_PICKLE:
+            payload = pickle.dumps(value, protocol=5)
+        else:
+            payload = json.dumps(value).encode()
+        return self._wrap(self.codec_id, payload)
+
+    def encode_vector(self, vector: List[float]) -> bytes:
+        """Serialise an embedding as raw float32 bytes"""
+        payload = np.asarray(vector, dtype=np.float32).tobytes()
+        return self._wrap(CODEC_VECTOR, payload, compress=False)
+
+    def decode(self, data: bytes) -> Any:
+        """Deserialise a value written by any supported format version"""
+        if not data.startswith(MAGIC):
+            return json.loads(data)
+
+        version, codec_id, compression_id = data[2], data[3], data[4]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache format version: {version}")
+
+        payload = self._decompress(compression_id, data[5:])
+
+        if codec_id == CODEC_MSGPACK:
+            return msgpack.unpackb(payload, raw=False, ext_hook=_msgpack_ext_hook)
+        if codec_id == CODEC_PICKLE:
+            return pickle.loads(payload)
+        if codec_id == CODEC_VECTOR:
+            return np.frombuffer(payload, dtype=np.float32)
+        if codec_id == CODEC_JSON:
+            return json.loads(payload)
+        raise ValueError(f"Unsupported cache codec id: {codec_id}")
+
+    def _wrap(self, codec_id: int, payload: bytes, compress: bool = True) -> bytes:
+        compression_id = COMPRESSION_NONE
+        if (
+            compress
+            and self.compression_id != COMPRESSION_NONE
+            and len(payload) >= self.compression_threshold
+        ):
+            compression_id = self.compression_id
+            if compression_id == COMPRESSION_ZSTD:
+                payload = self._zstd_compressor.compress(payload)
+            else:
+                payload = lz4_frame.compress(payload)
+
+        header = MAGIC + bytes((FORMAT_VERSION, codec_id, compression_id))
+        return header + payload
+
+    def _decompress(self, compression_id: int, payload: bytes) -> bytes:
+        if compression_id == COMPRESSION_NONE:
+            return payload
+        if compression_id == COMPRESSION_ZSTD:
+            if zstandard is None:
+                raise ValueError("zstandard is required to decode this value")
+            return self._zstd_decompressor.decompress(payload)
+        if compression_id == COMPRESSION_LZ4:
+            if lz4_frame is None:
+                raise ValueError("lz4 is required to decode this value")
+            return lz4_frame.decompress(payload)
+        raise ValueError(f"Unsupported cache compression id: {compression_id}")
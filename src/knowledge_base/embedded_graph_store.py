@@ -0,0 +1,746 @@
+# src/knowledge_base/embedded_graph_store.py
+import difflib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from config.settings import get_settings
+from src.knowledge_base.graph_backend import GraphBackend
+from src.knowledge_base.graph_store import (
+    ENTITY_LABEL,
+    CHUNK_LABEL,
+    _check_identifier,
+    remove_document_weight,
+    split_relationship_properties,
+)
+from src.knowledge_base.graph_snapshot import GraphSnapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    type TEXT,
+    properties TEXT NOT NULL,
+    updated_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS entities_name ON entities(name);
+CREATE INDEX IF NOT EXISTS entities_type ON entities(type);
+
+CREATE TABLE IF NOT EXISTS relationships (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    type TEXT NOT NULL,
+    properties TEXT NOT NULL,
+    weight REAL NOT NULL DEFAULT 1.0,
+    PRIMARY KEY (source, target, type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS relationships_target ON relationships(target, type);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY,
+    doc_id TEXT
+);
+CREATE INDEX IF NOT EXISTS chunks_doc_id ON chunks(doc_id);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    entity_id TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (entity_id, chunk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mentions_chunk ON mentions(chunk_id);
+"""
+
+# Adjacency of a set of nodes in both directions, heaviest edges first.
+# Frontiers are passed as one JSON array, so a hop is a single query.
+ADJACENCY_QUERY = """
+WITH frontier(node) AS (SELECT DISTINCT value FROM json_each(:nodes)),
+adjacent AS (
+    SELECT f.node, r.target AS other, r.type, r.properties, r.weight
+    FROM frontier f JOIN relationships r ON r.source = f.node
+    UNION ALL
+    SELECT f.node, r.source AS other, r.type, r.properties, r.weight
+    FROM frontier f JOIN relationships r ON r.target = f.node
+)
+SELECT node, other, type, properties FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY node ORDER BY weight DESC) AS rank
+    FROM adjacent {type_filter}
+) {limit}
+ORDER BY node, rank
+"""
+
+DEGREE_QUERY = """
+SELECT value,
+       (SELECT COUNT(*) FROM relationships WHERE source = value)
+     + (SELECT COUNT(*) FROM relationships WHERE target = value)
+FROM json_each(:nodes)
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class EmbeddedGraphStore(GraphBackend):
+    """SQLite-backed graph store for tests, benchmarks and small deployments
+
+    Entities, relationships and chunk mentions live in edge tables of one
+    database file, so no Neo4j server is needed. Writes are serialised on a
+    single connection; traversals run hop by hop over indexed adjacency.
+    """
+
+    embedded = True
+
+    def __init__(self, path: str = "./data/graph.db"):
+        self.settings = get_settings()
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.ensure_schema()
+        logger.info(f"Embedded graph store initialized at {path}")
+
+    def ensure_schema(self):
+        """Create tables and indexes if they do not exist"""
+        with self._lock:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def create_entity(self, entity_type: str, properties: Dict[str, Any]):
+        """Create an entity node"""
+        properties = {"id": properties.get("id") or str(uuid.uuid4()), **properties}
+        self.merge_entities(
+            [{"id": properties["id"], "type": entity_type, "properties": properties}]
+        )
+        return properties
+
+    def create_relationship(
+        self,
+        from_entity: str,
+        to_entity: str,
+        relationship_type: str,
+        properties: Optional[Dict[str, Any]] = None,
+    ):
+        """Create relationship between entities"""
+        self.merge_relationships(
+            [
+                {
+                    "from": from_entity,
+                    "to": to_entity,
+                    "type": relationship_type,
+                    "properties": properties or {},
+                }
+            ]
+        )
+        return properties or {}
+
+    def merge_entities(self, entities: List[Dict[str, Any]], **kwargs) -> int:
+        """Upsert entities in bulk, merging properties into existing rows"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for entity in entities:
+            row = merged.setdefault(
+                entity["id"], {"id": entity["id"], "type": None, "properties": {}}
+            )
+            row["type"] = entity.get("type") or row["type"]
+            row["properties"].update(entity.get("properties", {}))
+
+        now = _now_ms()
+        with self._lock, self.conn:
+            existing = self._load_properties(list(merged))
+            rows = []
+            for entity_id, row in merged.items():
+                properties = {**existing.get(entity_id, {}), **row["properties"]}
+                properties["id"] = entity_id
+                rows.append(
+                    (
+                        entity_id,
+                        properties.get("name"),
+                        row["type"],
+                        json.dumps(properties),
+                        now,
+                    )
+                )
+            self.conn.executemany(
+                """
+                INSERT INTO entities (id, name, type, properties, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    type = coalesce(excluded.type, entities.type),
+                    properties = excluded.properties,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+
+        logger.info(f"Merged {len(merged)} entities")
+        return len(merged)
+
+    def merge_relationships(self, relationships: List[Dict[str, Any]], **kwargs) -> int:
+        """Upsert relationships between existing entities in bulk
+
+        Weights accumulate once per ``doc_id`` as in ``GraphStore``;
+        self-loops are dropped. Returns the number of edges written, which
+        excludes edges whose endpoints do not exist.
+        """
+        relationships = [row for row in relationships if row["from"] != row["to"]]
+        with self._lock, self.conn:
+            edges = self._load_relationships(
+                [(row["from"], row["to"], row["type"]) for row in relationships]
+            )
+            for row in relationships:
+                properties, weight, doc_id = split_relationship_properties(row)
+                edge = edges[(row["from"], row["to"], _check_identifier(row["type"]))]
+                edge.update(properties)
+                doc_ids = edge.setdefault("doc_ids", [])
+                doc_weights = edge.setdefault("doc_weights", [])
+                if doc_id is None or doc_id not in doc_ids:
+                    edge["weight"] = edge.get("weight", 0.0) + weight
+                    if doc_id is not None:
+                        doc_ids.append(doc_id)
+                        doc_weights.append(weight)
+
+            cursor = self.conn.executemany(
+                """
+                INSERT INTO relationships (source, target, type, properties, weight)
+                SELECT ?1, ?2, ?3, ?4, ?5
+                WHERE EXISTS (SELECT 1 FROM entities WHERE id = ?1)
+                  AND EXISTS (SELECT 1 FROM entities WHERE id = ?2)
+                ON CONFLICT(source, target, type) DO UPDATE SET
+                    properties = excluded.properties,
+                    weight = excluded.weight
+                """,
+                [
+                    (source, target, rel_type, json.dumps(edge), edge["weight"])
+                    for (source, target, rel_type), edge in edges.items()
+                ],
+            )
+            written = max(cursor.rowcount, 0)
+
+        skipped = len(edges) - written
+        if skipped:
+            logger.warning(f"Skipped {skipped} relationships with unknown endpoints")
+        logger.info(f"Merged {written} relationships")
+        return written
+
+    def merge_mentions(self, mentions: List[Dict[str, Any]], **kwargs) -> int:
+        """Link entities to the chunks that mention them in bulk"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO chunks (id, doc_id) VALUES (?, ?)",
+                [(row["to"], row.get("doc_id")) for row in mentions],
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO mentions (entity_id, chunk_id, count) VALUES (?, ?, ?)
+                ON CONFLICT(entity_id, chunk_id) DO UPDATE SET count = excluded.count
+                """,
+                [(row["from"], row["to"], row.get("count", 1)) for row in mentions],
+            )
+
+        logger.info(f"Merged {len(mentions)} entity mentions")
+        return len(mentions)
+
+    def set_entity_properties(self, rows: List[Dict[str, Any]]):
+        """Merge properties into existing entities by ``id``, marking them updated"""
+        now = _now_ms()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "UPDATE entities SET properties = json_patch(properties, ?), "
+                "updated_at = ? WHERE id = ?",
+                [
+                    (
+                        json.dumps({k: v for k, v in row.items() if k != "id"}),
+                        now,
+                        row["id"],
+                    )
+                    for row in rows
+                ],
+            )
+
+    def delete_document_chunks(self, doc_id: str):
+        """Remove a document's chunks and everything the graph learnt from it
+
+        As in ``GraphStore``, the document's weight is taken out of its
+        relationships, and relationships and entities that no remaining
+        document supports are deleted.
+        """
+        with self._lock, self.conn:
+            entity_ids = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT DISTINCT entity_id FROM mentions WHERE chunk_id IN "
+                    "(SELECT id FROM chunks WHERE doc_id = ?)",
+                    (doc_id,),
+                )
+            ]
+            nodes = json.dumps(entity_ids)
+            edges = self.conn.execute(
+                """
+                SELECT source, target, type, properties, weight FROM relationships
+                WHERE source IN (SELECT value FROM json_each(?1))
+                   OR target IN (SELECT value FROM json_each(?1))
+                """,
+                (nodes,),
+            ).fetchall()
+
+            updated, deleted, touched = [], [], set()
+            for edge in edges:
+                properties = {**json.loads(edge["properties"]), "weight": edge["weight"]}
+                remaining = remove_document_weight(properties, doc_id)
+                if remaining is properties:
+                    continue
+                key = (edge["source"], edge["target"], edge["type"])
+                touched.update(key[:2])
+                if remaining is None:
+                    deleted.append(key)
+                else:
+                    updated.append((json.dumps(remaining), remaining["weight"], *key))
+
+            self.conn.executemany(
+                "UPDATE relationships SET properties = ?, weight = ? "
+                "WHERE source = ? AND target = ? AND type = ?",
+                updated,
+            )
+            self.conn.executemany(
+                "DELETE FROM relationships WHERE source = ? AND target = ? AND type = ?",
+                deleted,
+            )
+            self.conn.execute(
+                "DELETE FROM mentions WHERE chunk_id IN "
+                "(SELECT id FROM chunks WHERE doc_id = ?)",
+                (doc_id,),
+            )
+            self.conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self.conn.execute(
+                """
+                DELETE FROM entities
+                WHERE id IN (SELECT value FROM json_each(?))
+                  AND NOT EXISTS (SELECT 1 FROM mentions WHERE entity_id = entities.id)
+                  AND NOT EXISTS (SELECT 1 FROM relationships WHERE source = entities.id)
+                  AND NOT EXISTS (SELECT 1 FROM relationships WHERE target = entities.id)
+                """,
+                (nodes,),
+            )
+            self.conn.execute(
+                "UPDATE entities SET updated_at = ? "
+                "WHERE id IN (SELECT value FROM json_each(?))",
+                (_now_ms(), json.dumps(sorted(touched))),
+            )
+
+    def clear_graph(self):
+        """Clear all nodes and relationships"""
+        with self._lock, self.conn:
+            for table in ("mentions", "chunks", "relationships", "entities"):
+                self.conn.execute(f"DELETE FROM {table}")
+        logger.info("Graph cleared")
+
+    def get_graph_stats(self) -> Dict[str, Any]:
+        """Get graph statistics"""
+        with self._lock:
+            count = lambda table: self.conn.execute(  # noqa: E731
+                f"SELECT COUNT(*) FROM {table}"
+            ).fetchone()[0]
+            return {
+                "nodes": count("entities") + count("chunks"),
+                "relationships": count("relationships") + count("mentions"),
+            }
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def expand_bfs(
+        self,
+        seeds: List[str],
+        max_depth: int = 2,
+        relationship_types: Optional[List[str]] = None,
+        seed_key: str = "id",
+        fanout: Optional[int] = None,
+        max_frontier: Optional[int] = None,
+        max_degree: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Breadth-first expansion with the same caps as ``GraphStore``"""
+        fanout = fanout or self.settings.graph_bfs_fanout
+        max_frontier = max_frontier or self.settings.graph_bfs_max_frontier
+        max_degree = max_degree or self.settings.graph_bfs_max_degree
+
+        with self._lock:
+            seed_ids = self._resolve(seeds, seed_key)
+            reached: Dict[str, Dict[str, Any]] = {
+                node_id: {"seed": seed, "relationships": []}
+                for seed, node_id in seed_ids.items()
+            }
+            frontier = {seed: [node_id] for seed, node_id in seed_ids.items()}
+
+            for distance in range(1, max_depth + 1):
+                adjacency = self._adjacent(
+                    [node for nodes in frontier.values() for node in nodes],
+                    relationship_types,
+                    fanout,
+                )
+                found: Dict[str, List[str]] = {}
+                for seed, nodes in frontier.items():
+                    for node in nodes:
+                        for other, rel in adjacency.get(node, []):
+                            if other in reached:
+                                continue
+                            reached[other] = {
+                                "seed": seed,
+                                "distance": distance,
+                                "relationships": reached[node]["relationships"] + [rel],
+                            }
+                            found.setdefault(seed, []).append(other)
+                if not found:
+                    break
+
+                new_nodes = [node for nodes in found.values() for node in nodes]
+                summaries = self._entity_summaries(new_nodes)
+                for node in new_nodes:
+                    reached[node].update(
+                        summaries.get(node, {"name": None, "centrality": 0.0})
+                    )
+
+                # Super-nodes are returned but not expanded through
+                degrees = self._degrees(new_nodes)
+                frontier = {
+                    seed: [node for node in nodes if degrees[node] <= max_degree][
+                        :max_frontier
+                    ]
+                    for seed, nodes in found.items()
+                }
+
+        seed_set = set(seed_ids.values())
+        return {
+            node_id: hit for node_id, hit in reached.items() if node_id not in seed_set
+        }
+
+    def get_entities(
+        self, entity_ids: List[str], chunks_per_entity: int = 0
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch entity properties, and optionally top chunk IDs, by id"""
+        if not entity_ids:
+            return {}
+        with self._lock:
+            properties = self._load_properties(entity_ids)
+            chunk_ids: Dict[str, List[str]] = {}
+            if chunks_per_entity and properties:
+                for row in self.conn.execute(
+                    """
+                    SELECT entity_id, chunk_id FROM (
+                        SELECT entity_id, chunk_id, ROW_NUMBER() OVER (
+                            PARTITION BY entity_id ORDER BY count DESC
+                        ) AS rank
+                        FROM mentions
+                        WHERE entity_id IN (SELECT value FROM json_each(?))
+                    )
+                    WHERE rank <= ?
+                    ORDER BY entity_id, rank
+                    """,
+                    (json.dumps(list(properties)), chunks_per_entity),
+                ):
+                    chunk_ids.setdefault(row[0], []).append(row[1])
+            return {
+                entity_id: {"entity": entity, "chunk_ids": chunk_ids.get(entity_id, [])}
+                for entity_id, entity in properties.items()
+            }
+
+    def neighbors(
+        self, entity_name: str, limit: int = 10, chunks_per_entity: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Direct neighbours of an entity, in the retriever's result format"""
+        with self._lock:
+            node = self._resolve([entity_name], "name").get(entity_name)
+            if node is None:
+                return []
+            adjacent = self._adjacent([node], None, limit).get(node, [])
+            nodes = self.get_entities([other for other, _ in adjacent], chunks_per_entity)
+
+        return [
+            {
+                "entity": nodes[other]["entity"],
+                "relationship": rel,
+                "relationship_type": rel["type"],
+                "distance": 1,
+                "chunk_ids": nodes[other]["chunk_ids"],
+                "retrieval_method": "graph_neighbors",
+            }
+            for other, rel in adjacent
+            if other in nodes
+        ]
+
+    def shortest_path(
+        self, entity1: str, entity2: str, max_depth: int = 4
+    ) -> Optional[Dict[str, Any]]:
+        """Bidirectional BFS shortest path between two entities"""
+        with self._lock:
+            ids = self._resolve([entity1, entity2], "name")
+            start, goal = ids.get(entity1), ids.get(entity2)
+            if start is None or goal is None:
+                return None
+
+            # node -> (previous node, relationship) on each side
+            forward: Dict[str, Any] = {start: None}
+            backward: Dict[str, Any] = {goal: None}
+            forward_frontier, backward_frontier = [start], [goal]
+            meeting = start if start == goal else None
+
+            for _ in range(max_depth):
+                if meeting is not None:
+                    break
+                expand_forward = len(forward_frontier) <= len(backward_frontier)
+                frontier = forward_frontier if expand_forward else backward_frontier
+                seen, other = (forward, backward) if expand_forward else (backward, forward)
+
+                adjacency = self._adjacent(frontier, None, None)
+                next_frontier = []
+                for node in frontier:
+                    for nbr, rel in adjacency.get(node, []):
+                        if nbr in seen:
+                            continue
+                        seen[nbr] = (node, rel)
+                        next_frontier.append(nbr)
+                        if nbr in other:
+                            meeting = nbr
+                            break
+                    if meeting is not None:
+                        break
+
+                if not next_frontier:
+                    break
+                if expand_forward:
+                    forward_frontier = next_frontier
+                else:
+                    backward_frontier = next_frontier
+
+            if meeting is None:
+                return None
+
+            nodes, relationships = [meeting], []
+            node = meeting
+            while forward[node] is not None:
+                node, rel = forward[node]
+                nodes.insert(0, node)
+                relationships.insert(0, rel)
+            node = meeting
+            while backward[node] is not None:
+                node, rel = backward[node]
+                nodes.append(node)
+                relationships.append(rel)
+
+            entities = self._load_properties(nodes)
+
+        return {
+            "path_nodes": [entities.get(node, {"id": node}) for node in nodes],
+            "path_relationships": relationships,
+            "distance": len(relationships),
+            "retrieval_method": "graph_path",
+        }
+
+    def search_by_properties(
+        self,
+        node_labels: Optional[List[str]] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Search entities by type labels and exact property values"""
+        where, params = [], []
+
+        labels = [label for label in node_labels or [] if label != ENTITY_LABEL]
+        if CHUNK_LABEL in labels:
+            return []
+        if labels:
+            where.append(f"type IN ({', '.join('?' * len(labels))})")
+            params.extend(labels)
+
+        for key, value in (properties or {}).items():
+            where.append(f"json_extract(properties, '$.{_check_identifier(key)}') = ?")
+            params.append(value)
+
+        query = "SELECT properties FROM entities"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " LIMIT ?"
+
+        with self._lock:
+            rows = self.conn.execute(query, (*params, limit)).fetchall()
+
+        nodes = [
+            {"entity": json.loads(row[0]), "retrieval_method": "graph_property_search"}
+            for row in rows
+        ]
+        logger.info(f"Found {len(nodes)} nodes matching criteria")
+        return nodes
+
+    def search_entities_fuzzy(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Approximate name match: substring candidates ranked by similarity"""
+        terms = [term.lower() for term in text.split() if term.isalnum()]
+        if not terms:
+            return []
+
+        # Short prefixes tolerate typos later in each term
+        patterns = [f"%{term[:4]}%" for term in terms]
+        query = (
+            "SELECT properties FROM entities WHERE "
+            + " OR ".join("lower(name) LIKE ?" for _ in patterns)
+            + " LIMIT ?"
+        )
+        with self._lock:
+            rows = self.conn.execute(query, (*patterns, limit * 20)).fetchall()
+
+        target = " ".join(terms)
+        scored = []
+        for row in rows:
+            entity = json.loads(row[0])
+            score = difflib.SequenceMatcher(
+                None, target, (entity.get("name") or "").lower()
+            ).ratio()
+            scored.append(
+                {
+                    "entity": entity,
+                    "match_score": score,
+                    "retrieval_method": "graph_fulltext_search",
+                }
+            )
+
+        scored.sort(key=lambda hit: -hit["match_score"])
+        return scored[:limit]
+
+    def export_adjacency(self) -> tuple:
+        """Entity ids, names and undirected CSR (indptr, indices, weights)"""
+        with self._lock:
+            nodes = self.conn.execute("SELECT id, name FROM entities").fetchall()
+            edges = self.conn.execute(
+                "SELECT source, target, weight FROM relationships"
+            ).fetchall()
+
+        ids = [row[0] for row in nodes]
+        names = [row[1] for row in nodes]
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        edges = [
+            (index[source], index[target], weight)
+            for source, target, weight in edges
+            if source in index and target in index
+        ]
+        src, dst, weights = zip(*edges) if edges else ((), (), ())
+        indptr, indices, _, values = GraphSnapshot._build_csr(
+            len(ids),
+            np.asarray(src, dtype=np.int64),
+            np.asarray(dst, dtype=np.int64),
+            np.zeros(len(edges), dtype=np.int16),
+            np.asarray(weights, dtype=np.float32),
+        )
+        return ids, names, indptr, indices, values
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _resolve(self, seeds: List[str], seed_key: str) -> Dict[str, str]:
+        """Map seed keys to entity ids, dropping unknown seeds"""
+        if seed_key not in ("id", "name"):
+            raise ValueError(f"Unsupported seed key: {seed_key}")
+        matches: Dict[str, str] = {}
+        for key, node_id in self.conn.execute(
+            f"SELECT {seed_key}, id FROM entities "
+            f"WHERE {seed_key} IN (SELECT value FROM json_each(?)) ORDER BY rowid",
+            (json.dumps(list(dict.fromkeys(seeds))),),
+        ):
+            matches.setdefault(key, node_id)
+        return {seed: matches[seed] for seed in dict.fromkeys(seeds) if seed in matches}
+
+    def _adjacent(
+        self,
+        nodes: List[str],
+        relationship_types: Optional[List[str]],
+        limit: Optional[int],
+    ) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        """Up to ``limit`` heaviest edges of each node, in one query"""
+        params: Dict[str, Any] = {"nodes": json.dumps(nodes)}
+        type_filter = ""
+        if relationship_types:
+            names = [f":type{i}" for i in range(len(relationship_types))]
+            type_filter = f"WHERE type IN ({', '.join(names)})"
+            params.update(
+                {f"type{i}": t for i, t in enumerate(relationship_types)}
+            )
+        query = ADJACENCY_QUERY.format(
+            type_filter=type_filter, limit="WHERE rank <= :limit" if limit else ""
+        )
+        if limit:
+            params["limit"] = limit
+
+        adjacency: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for row in self.conn.execute(query, params):
+            adjacency.setdefault(row["node"], []).append(
+                (row["other"], {"type": row["type"], **json.loads(row["properties"])})
+            )
+        return adjacency
+
+    def _degrees(self, nodes: List[str]) -> Dict[str, int]:
+        return dict(self.conn.execute(DEGREE_QUERY, {"nodes": json.dumps(nodes)}))
+
+    def _entity_summaries(self, nodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT id, name, coalesce(json_extract(properties, '$.centrality'), 0.0) "
+            "FROM entities WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(nodes),),
+        )
+        return {row[0]: {"name": row[1], "centrality": row[2]} for row in rows}
+
+    def _load_relationships(
+        self, keys: List[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """Stored properties of each (source, target, type), {} if new"""
+        edges: Dict[Tuple[str, str, str], Dict[str, Any]] = {
+            key: {} for key in dict.fromkeys(keys)
+        }
+        unique = list(edges)
+        for i in range(0, len(unique), 300):
+            batch = unique[i : i + 300]
+            rows = self.conn.execute(
+                f"SELECT source, target, type, properties, weight FROM relationships "
+                f"WHERE (source, target, type) IN "
+                f"(VALUES {', '.join('(?, ?, ?)' for _ in batch)})",
+                [value for key in batch for value in key],
+            )
+            for row in rows:
+                properties = json.loads(row["properties"])
+                # Edges written before doc_ids were tracked kept one doc_id
+                legacy = properties.pop("doc_id", None)
+                properties.setdefault("doc_ids", [legacy] if legacy else [])
+                properties["weight"] = row["weight"]
+                edges[(row["source"], row["target"], row["type"])] = properties
+        return edges
+
+    def _load_properties(self, entity_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(entity_ids), 500):
+            batch = entity_ids[i : i + 500]
+            rows = self.conn.execute(
+                f"SELECT id, properties FROM entities "
+                f"WHERE id IN ({', '.join('?' * len(batch))})",
+                batch,
+            )
+            results.update({row[0]: json.loads(row[1]) for row in rows})
+        return results
@@ -0,0 +1,115 @@
+# src/knowledge_base/graph_backend.py
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+from config.settings import get_settings
+
+
+class GraphBackend(ABC):
+    """Operations shared by the Neo4j and embedded graph stores
+
+    Writers use the bulk ``merge_*`` methods; ``GraphRetriever`` uses
+    ``expand_bfs`` and ``get_entities`` on every backend. Embedded backends
+    also answer neighbour, path, property and fuzzy lookups directly, which
+    the Neo4j store leaves to Cypher in the retriever.
+    """
+
+    # True for in-process backends that serve retrieval without Cypher
+    embedded = False
+
+    @abstractmethod
+    def create_entity(self, entity_type: str, properties: Dict[str, Any]):
+        """Create one entity node"""
+
+    @abstractmethod
+    def create_relationship(
+        self,
+        from_entity: str,
+        to_entity: str,
+        relationship_type: str,
+        properties: Optional[Dict[str, Any]] = None,
+    ):
+        """Create one relationship between existing entities"""
+
+    @abstractmethod
+    def merge_entities(self, entities: List[Dict[str, Any]], **kwargs) -> int:
+        """Upsert entities in bulk"""
+
+    @abstractmethod
+    def merge_relationships(self, relationships: List[Dict[str, Any]], **kwargs) -> int:
+        """Upsert relationships between existing entities in bulk"""
+
+    @abstractmethod
+    def merge_mentions(self, mentions: List[Dict[str, Any]], **kwargs) -> int:
+        """Link entities to the chunks that mention them in bulk"""
+
+    @abstractmethod
+    def expand_bfs(
+        self, seeds: List[str], max_depth: int = 2, **kwargs
+    ) -> Dict[str, Dict[str, Any]]:
+        """Breadth-first expansion from seeds"""
+
+    @abstractmethod
+    def get_entities(
+        self, entity_ids: List[str], chunks_per_entity: int = 0
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch entity properties, and optionally top chunk IDs, by id"""
+
+    @abstractmethod
+    def delete_document_chunks(self, doc_id: str):
+        """Remove a document's chunks and its contribution to the graph"""
+
+    @abstractmethod
+    def clear_graph(self):
+        """Clear all nodes and relationships"""
+
+    @abstractmethod
+    def get_graph_stats(self) -> Dict[str, Any]:
+        """Get graph statistics"""
+
+    def ensure_schema(self):
+        """Create constraints and indexes if the backend needs them"""
+
+    def migrate_entity_labels(
+        self, batch_size: int = 10000, labels: Optional[List[str]] = None
+    ) -> int:
+        """Bring entities written by older versions up to the current schema"""
+        return 0
+
+    def close(self):
+        """Release connections held by the backend"""
+
+    def find_related_entities(
+        self, entity_id: str, max_depth: int = 2, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Find entities related to given entity"""
+        hits = self.expand_bfs([entity_id], max_depth=max_depth)
+        ranked = sorted(
+            hits.items(),
+            key=lambda item: (
+                item[1]["distance"],
+                -item[1]["centrality"],
+                item[1]["name"] or "",
+            ),
+        )[:limit]
+        nodes = self.get_entities([node_id for node_id, _ in ranked])
+        return [
+            {"entity": nodes[node_id]["entity"], "distance": hit["distance"]}
+            for node_id, hit in ranked
+            if node_id in nodes
+        ]
+
+
+def create_graph_store(backend: Optional[str] = None) -> GraphBackend:
+    """Build the configured graph store, ``neo4j`` or ``embedded``"""
+    settings = get_settings()
+    backend = backend or settings.graph_backend
+
+    if backend == "embedded":
+        from src.knowledge_base.embedded_graph_store import EmbeddedGraphStore
+
+        return EmbeddedGraphStore(settings.graph_embedded_path)
+    if backend == "neo4j":
+        from src.knowledge_base.graph_store import GraphStore
+
+        return GraphStore()
+    raise ValueError(f"Unsupported graph backend: {backend}")
@@ -0,0 +1,287 @@
+# src/knowledge_base/graph_centrality.py
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+from scipy import sparse
+
+from config.settings import get_settings
+from src.knowledge_base.graph_backend import GraphBackend, create_graph_store
+from src.knowledge_base.graph_store import ENTITY_LABEL, _chunks
+from src.knowledge_base.graph_snapshot import GraphSnapshot
+
+
+def centrality_score(distance: int, centrality: float, weight: float) -> float:
+    """Graph hit score: 1/distance, boosted by normalised centrality
+
+    Stays within (0, 1] so it remains comparable with similarity scores.
+    """
+    base = 1.0 / distance if distance and distance > 0 else 1.0
+    return base * (1.0 + weight * (centrality or 0.0)) / (1.0 + weight)
+
+
+class GraphCentrality:
+    """PageRank and degree centrality over the exported entity graph
+
+    The adjacency comes from a ``GraphSnapshot`` export and is kept as a
+    row-normalised sparse transition matrix, which an offline job uses to
+    write global scores onto nodes and queries can reuse for personalised
+    PageRank. The matrix can be cached on disk between processes.
+
+    Works with either graph backend: Neo4j is exported through a snapshot,
+    the embedded store straight from its edge table.
+    """
+
+    def __init__(
+        self,
+        graph_store: Optional[GraphBackend] = None,
+        damping: float = 0.85,
+        tolerance: float = 1e-6,
+        max_iterations: int = 100,
+    ):
+        self.graph_store = graph_store or create_graph_store()
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._adjacency: Optional[sparse.csr_matrix] = None
+        self._transition: Optional[sparse.csr_matrix] = None
+        self._transition_t: Optional[sparse.csr_matrix] = None
+        self._dangling: Optional[np.ndarray] = None
+        self._degrees: Optional[np.ndarray] = None
+        self.load_error: Optional[str] = None
+        # Set once a background load has succeeded
+        self.load_complete = threading.Event()
+
+    @property
+    def loaded(self) -> bool:
+        return self._transition is not None
+
+    def load_from_graph(self):
+        """Export the entity graph and build the transition matrix"""
+        if self.graph_store.embedded:
+            self._build(*self.graph_store.export_adjacency())
+            return
+        snapshot = GraphSnapshot(self.graph_store)
+        snapshot.load()
+        self._build(
+            snapshot._ids.tolist(),
+            snapshot._names.tolist(),
+            snapshot._indptr,
+            snapshot._indices,
+            snapshot._weights,
+        )
+
+    def load_cache(self, path: str) -> bool:
+        """Load a matrix previously written by ``save_cache``"""
+        if not os.path.exists(path):
+            return False
+        with np.load(path, allow_pickle=False) as data:
+            self._build(
+                data["ids"].tolist(),
+                data["names"].tolist(),
+                data["indptr"],
+                data["indices"],
+                data["weights"],
+            )
+        logger.info(f"Loaded graph centrality matrix from {path}")
+        return True
+
+    def start_background_load(
+        self, cache_path: str, retry_delay: float = 30.0, max_retry_delay: float = 1800.0
+    ):
+        """Load the cache or export the graph off the request path
+
+        Queries see an unloaded matrix (no personalised scores) until this
+        succeeds; failures are retried with exponential backoff rather than
+        on every request.
+        """
+
+        def run():
+            delay = retry_delay
+            while True:
+                try:
+                    if not self.load_cache(cache_path):
+                        self.load_from_graph()
+                    self.load_complete.set()
+                    return
+                except Exception as e:
+                    self.load_error = str(e)
+                    logger.error(
+                        f"Graph centrality load error: {e}, retrying in {delay:.0f}s"
+                    )
+                    time.sleep(delay)
+                    delay = min(delay * 2, max_retry_delay)
+
+        threading.Thread(target=run, daemon=True, name="graph-centrality").start()
+
+    def save_cache(self, path: str):
+        """Persist the adjacency so query processes can skip the export"""
+        adjacency = self._adjacency
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            ids=np.asarray(self.ids),
+            names=np.asarray([name or "" for name in self.names]),
+            indptr=adjacency.indptr,
+            indices=adjacency.indices,
+            weights=adjacency.data,
+        )
+
+    def pagerank(
+        self,
+        personalization: Optional[np.ndarray] = None,
+        max_iterations: Optional[int] = None,
+        tolerance: Optional[float] = None,
+    ) -> np.ndarray:
+        """Power iteration PageRank, optionally personalised"""
+        max_iterations = max_iterations or self.max_iterations
+        tolerance = tolerance or self.tolerance
+        n = len(self.ids)
+        if n == 0:
+            return np.empty(0, dtype=np.float64)
+
+        teleport = (
+            personalization / personalization.sum()
+            if personalization is not None
+            else np.full(n, 1.0 / n)
+        )
+        rank = teleport.copy()
+
+        for iteration in range(max_iterations):
+            # Mass on nodes without edges is redistributed like a teleport
+            dangling_mass = rank[self._dangling].sum()
+            updated = (
+                self.damping * (self._transition_t @ rank + dangling_mass * teleport)
+                + (1.0 - self.damping) * teleport
+            )
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < tolerance:
+                break
+
+        logger.debug(f"PageRank finished after {iteration + 1} iterations")
+        return rank
+
+    def degree_centrality(self) -> np.ndarray:
+        """Number of distinct neighbours over the maximum possible"""
+        n = len(self.ids)
+        return self._degrees / max(n - 1, 1)
+
+    def personalized_pagerank(
+        self, seed_names: List[str], max_iterations: int = 20
+    ) -> Dict[str, float]:
+        """Scores relative to the seeds, normalised so the best node is 1.0
+
+        Empty until the matrix is loaded.
+        """
+        seeds = [
+            self._name_index[name] for name in seed_names if name in self._name_index
+        ]
+        if not seeds:
+            return {}
+
+        personalization = np.zeros(len(self.ids))
+        personalization[seeds] = 1.0
+        rank = self.pagerank(personalization, max_iterations, tolerance=1e-4)
+
+        rank[seeds] = 0.0
+        top = rank.max()
+        if top <= 0:
+            return {}
+        nonzero = np.flatnonzero(rank)
+        return {self.ids[i]: float(rank[i] / top) for i in nonzero}
+
+    def compute_and_store(self, batch_size: int = 10000) -> Dict[str, float]:
+        """Compute global scores and write them onto entity nodes
+
+        ``centrality`` is PageRank scaled to [0, 1] and is what ranking
+        reads; raw ``pagerank`` and ``degree_centrality`` are kept too.
+        Entities are marked updated so graph snapshots pick up the scores.
+        """
+        start = time.time()
+        rank = self.pagerank()
+        degree = self.degree_centrality()
+        centrality = rank / rank.max() if len(rank) else rank
+
+        rows = [
+            {
+                "id": node_id,
+                "pagerank": float(rank[i]),
+                "centrality": float(centrality[i]),
+                "degree_centrality": float(degree[i]),
+            }
+            for i, node_id in enumerate(self.ids)
+        ]
+
+        if self.graph_store.embedded:
+            self.graph_store.set_entity_properties(rows)
+        else:
+            self._write_neo4j(rows, batch_size)
+
+        elapsed = time.time() - start
+        logger.info(f"Stored centrality for {len(rows)} entities in {elapsed:.1f}s")
+        return {"entities": len(rows), "seconds": elapsed}
+
+    def _write_neo4j(self, rows: List[Dict[str, float]], batch_size: int):
+        def write(tx, batch):
+            tx.run(
+                f"""
+                UNWIND $rows AS row
+                MATCH (e:{ENTITY_LABEL} {{id: row.id}})
+                SET e.pagerank = row.pagerank,
+                    e.centrality = row.centrality,
+                    e.degree_centrality = row.degree_centrality,
+                    e.updated_at = timestamp()
+                """,
+                rows=batch,
+            ).consume()
+
+        with self.graph_store.session() as session:
+            for batch in _chunks(rows, batch_size):
+                session.execute_write(write, batch)
+
+    def _build(self, ids, names, indptr, indices, weights):
+        n = len(ids)
+        adjacency = sparse.csr_matrix(
+            (np.asarray(weights, dtype=np.float64), indices, indptr), shape=(n, n)
+        )
+        adjacency.sum_duplicates()
+
+        out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+        inverse = np.divide(
+            1.0, out_weight, out=np.zeros_like(out_weight), where=out_weight > 0
+        )
+
+        transition = sparse.diags(inverse) @ adjacency
+        self.ids, self.names = list(ids), list(names)
+        self._adjacency = adjacency
+        self._transition_t = transition.T.tocsr()
+        self._dangling = out_weight == 0
+        self._degrees = np.diff(adjacency.indptr).astype(np.float64)
+        # Cleared before ``loaded`` turns True, so readers never see a loaded
+        # matrix next to a stale error
+        self.load_error = None
+        self._transition = transition
+        # Set last: queries resolve seeds here first, so they never see a
+        # half-built matrix
+        self._name_index = {name: i for i, name in enumerate(self.names) if name}
+
+
+@lru_cache()
+def get_graph_centrality() -> GraphCentrality:
+    """Process-wide centrality matrix for query-time personalised PageRank
+
+    Loads in the background; see ``GraphCentrality.start_background_load``.
+    """
+    settings = get_settings()
+    centrality = GraphCentrality()
+    centrality.start_background_load(settings.graph_centrality_cache_path)
+    return centrality
@@ -0,0 +1,697 @@
+# src/knowledge_base/graph_snapshot.py
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from config.settings import get_settings
+from src.knowledge_base.graph_store import GraphStore, ENTITY_LABEL, MENTION_TYPE
+
+# Re-read this much history on every refresh to absorb clock skew between writers
+REFRESH_OVERLAP_MS = 5000
+
+_EMPTY = (
+    np.empty(0, dtype=np.int32),
+    np.empty(0, dtype=np.int16),
+    np.empty(0, dtype=np.float32),
+)
+
+# Node overlay entry: (id, name, type, centrality)
+NodeRecord = Tuple[str, Optional[str], Optional[str], float]
+
+
+class StringTable:
+    """Immutable strings packed into one UTF-8 buffer with a hashed index
+
+    Costs a few bytes per string over its encoded length, instead of a
+    Python object, list slot and dict entry each. ``find`` binary-searches
+    the sorted string hashes and compares the few candidates.
+    """
+
+    def __init__(self, values: List[Optional[str]]):
+        encoded = [value.encode() if value is not None else b"" for value in values]
+        self._data = b"".join(encoded)
+        self._offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=self._offsets[1:])
+        self._missing = np.asarray([value is None for value in values], dtype=bool)
+
+        hashes = np.asarray([hash(value) for value in values], dtype=np.int64)
+        # Stable, so equal hashes keep index order and find returns the first
+        self._order = np.argsort(hashes, kind="stable").astype(np.int32)
+        self._hashes = hashes[self._order]
+
+    def __len__(self) -> int:
+        return len(self._missing)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if self._missing[index]:
+            return None
+        return self._data[self._offsets[index] : self._offsets[index + 1]].decode()
+
+    def find(self, value: str) -> Optional[int]:
+        """Lowest index holding ``value``, or None"""
+        key = hash(value)
+        start = np.searchsorted(self._hashes, key, side="left")
+        end = np.searchsorted(self._hashes, key, side="right")
+        for position in range(start, end):
+            index = int(self._order[position])
+            if self[index] == value:
+                return index
+        return None
+
+    def tolist(self) -> List[Optional[str]]:
+        return [self[i] for i in range(len(self))]
+
+
+class GraphSnapshot:
+    """In-process CSR adjacency snapshot of the entity graph
+
+    Nodes are addressed by dense integer indices. Ids and names live in
+    packed ``StringTable``s, types and centrality in NumPy arrays. Edges are
+    stored undirected in CSR arrays (``indptr``/``indices``) with parallel
+    arrays of relationship type codes and weights.
+
+    Incremental refreshes pull entities whose ``updated_at`` moved since
+    the last refresh and replace their node data and adjacency through
+    overlays; once the overlays grow past ``rebuild_fraction`` of the graph
+    everything is rebuilt. Deletions leave no ``updated_at`` to find, so a
+    refresh reloads fully when the store's entity or relationship count
+    drops, and at least every ``full_reload_interval`` seconds to catch
+    deletions hidden by additions in between.
+    """
+
+    def __init__(
+        self,
+        graph_store: Optional[GraphStore] = None,
+        rebuild_fraction: float = 0.1,
+        full_reload_interval: Optional[int] = None,
+        fanout: Optional[int] = None,
+        max_frontier: Optional[int] = None,
+        max_degree: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.graph_store = graph_store or GraphStore()
+        self.rebuild_fraction = rebuild_fraction
+        self.full_reload_interval = (
+            full_reload_interval
+            if full_reload_interval is not None
+            else settings.graph_snapshot_full_reload_interval
+        )
+        # Same expansion caps as the hop-by-hop Cypher BFS
+        self.fanout = fanout or settings.graph_bfs_fanout
+        self.max_frontier = max_frontier or settings.graph_bfs_max_frontier
+        self.max_degree = max_degree or settings.graph_bfs_max_degree
+
+        self.loaded = False
+        self._lock = threading.Lock()
+
+        self._num_nodes = 0
+        self._ids = StringTable([])
+        self._names = StringTable([])
+        self._type_codes = np.empty(0, dtype=np.int16)
+        self._type_names: List[str] = []
+        self._centrality = np.empty(0, dtype=np.float32)
+        # Nodes added or changed since the last full load
+        self._node_overlay: Dict[int, NodeRecord] = {}
+        self._overlay_ids: Dict[str, int] = {}
+        self._overlay_names: Dict[str, int] = {}
+        self._rel_types: List[str] = []
+        self._rel_type_index: Dict[str, int] = {}
+
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = _EMPTY[0]
+        self._etypes = _EMPTY[1]
+        self._weights = _EMPTY[2]
+        self._overlay: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._watermark = 0
+        self._store_counts = (0, 0)
+        self._loaded_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Export the full entity graph from Neo4j and build the CSR arrays"""
+        start = time.time()
+        ids, names, type_codes, centrality = [], [], [], []
+        type_names: List[str] = []
+        type_index: Dict[Optional[str], int] = {None: -1}
+        watermark = 0
+
+        with self.graph_store.session() as session:
+            store_counts = self._count_store(session)
+
+            for record in session.run(self._node_query()):
+                ids.append(record["id"])
+                names.append(record["name"])
+                code = type_index.get(record["type"])
+                if code is None:
+                    code = type_index[record["type"]] = len(type_names)
+                    type_names.append(record["type"])
+                type_codes.append(code)
+                centrality.append(record["centrality"])
+                watermark = max(watermark, record["updated_at"] or 0)
+
+            # Only needed while resolving edge endpoints
+            id_index = {node_id: i for i, node_id in enumerate(ids)}
+            rel_types: List[str] = []
+            rel_type_index: Dict[str, int] = {}
+            src, dst, etypes, weights = [], [], [], []
+            for record in session.run(self._edge_query()):
+                a, b = id_index.get(record["source"]), id_index.get(record["target"])
+                if a is None or b is None:
+                    continue
+                code = rel_type_index.setdefault(record["type"], len(rel_types))
+                if code == len(rel_types):
+                    rel_types.append(record["type"])
+                src.append(a)
+                dst.append(b)
+                etypes.append(code)
+                weights.append(record["weight"])
+            del id_index
+
+        indptr, indices, edge_types, edge_weights = self._build_csr(
+            len(ids),
+            np.asarray(src, dtype=np.int64),
+            np.asarray(dst, dtype=np.int64),
+            np.asarray(etypes, dtype=np.int16),
+            np.asarray(weights, dtype=np.float32),
+        )
+        id_table, name_table = StringTable(ids), StringTable(names)
+
+        with self._lock:
+            self._num_nodes = len(ids)
+            self._ids, self._names = id_table, name_table
+            self._type_codes = np.asarray(type_codes, dtype=np.int16)
+            self._type_names = type_names
+            self._centrality = np.asarray(centrality, dtype=np.float32)
+            self._node_overlay, self._overlay_ids, self._overlay_names = {}, {}, {}
+            self._rel_types, self._rel_type_index = rel_types, rel_type_index
+            self._indptr, self._indices = indptr, indices
+            self._etypes, self._weights = edge_types, edge_weights
+            self._overlay = {}
+            self._watermark = watermark
+            self._store_counts = store_counts
+            self._loaded_at = time.time()
+            self.loaded = True
+
+        logger.info(
+            f"Graph snapshot loaded: {len(ids)} nodes, {len(src)} edges "
+            f"in {time.time() - start:.1f}s"
+        )
+
+    def refresh(self):
+        """Apply entities and edges changed since the last refresh"""
+        if not self.loaded or time.time() - self._loaded_at >= self.full_reload_interval:
+            self.load()
+            return
+
+        since = self._watermark - REFRESH_OVERLAP_MS
+        changed: Dict[int, List[Tuple[int, int, float]]] = {}
+        watermark = self._watermark
+        num_nodes = self._num_nodes
+        node_overlay = dict(self._node_overlay)
+        overlay_ids = dict(self._overlay_ids)
+        overlay_names = dict(self._overlay_names)
+
+        def index_of(node_id: str) -> Optional[int]:
+            index = overlay_ids.get(node_id)
+            return index if index is not None else self._ids.find(node_id)
+
+        with self.graph_store.session() as session:
+            store_counts = self._count_store(session)
+            if any(now < before for now, before in zip(store_counts, self._store_counts)):
+                # Something was deleted; the overlays cannot express that
+                logger.info("Graph store shrank, reloading snapshot")
+                self.load()
+                return
+
+            for record in session.run(self._node_query(incremental=True), since=since):
+                index = index_of(record["id"])
+                if index is None:
+                    index = overlay_ids[record["id"]] = num_nodes
+                    num_nodes += 1
+                node_overlay[index] = (
+                    record["id"],
+                    record["name"],
+                    record["type"],
+                    record["centrality"],
+                )
+                if record["name"] is not None:
+                    overlay_names.setdefault(record["name"], index)
+                changed[index] = []
+                watermark = max(watermark, record["updated_at"] or 0)
+
+            if changed:
+                for record in session.run(
+                    self._edge_query(incremental=True), since=since
+                ):
+                    a, b = index_of(record["source"]), index_of(record["target"])
+                    if a is None or b is None:
+                        continue
+                    code = self._rel_type_code(record["type"])
+                    # Entities touched between the two queries arrive here only
+                    changed.setdefault(a, []).append((b, code, record["weight"]))
+
+        self._store_counts = store_counts
+        if not changed:
+            return
+
+        overlay = dict(self._overlay)
+        for index, edges in changed.items():
+            if edges:
+                nbrs, codes, weights = zip(*edges)
+                overlay[index] = (
+                    np.asarray(nbrs, dtype=np.int32),
+                    np.asarray(codes, dtype=np.int16),
+                    np.asarray(weights, dtype=np.float32),
+                )
+            else:
+                overlay[index] = _EMPTY
+
+        with self._lock:
+            self._num_nodes = num_nodes
+            self._node_overlay = node_overlay
+            self._overlay_ids, self._overlay_names = overlay_ids, overlay_names
+            self._overlay = overlay
+            self._watermark = watermark
+
+        logger.info(f"Graph snapshot refreshed {len(changed)} nodes")
+
+        if max(len(overlay), len(node_overlay)) > self.rebuild_fraction * max(
+            num_nodes, 1
+        ):
+            self.load()
+
+    def start_auto_refresh(self, interval: int):
+        """Load in the background, then refresh every ``interval`` seconds"""
+
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Graph snapshot refresh error: {e}")
+                time.sleep(interval)
+
+        threading.Thread(target=run, daemon=True, name="graph-snapshot").start()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def related_entities(
+        self,
+        entity_name: str,
+        relationship_types: Optional[List[str]] = None,
+        max_depth: int = 2,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Bounded-depth expansion, each node once at its minimum distance"""
+        grouped = self.related_entities_batch(
+            [entity_name], relationship_types, max_depth, limit
+        )
+        return [
+            {key: value for key, value in result.items() if key != "seed_entity"}
+            for result in grouped.get(entity_name, [])
+        ]
+
+    def related_entities_batch(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        max_depth: int = 2,
+        limit_per_entity: int = 10,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Expand several seeds at once, keeping each node under its closest seed
+
+        Mirrors ``GraphStore.expand_bfs``: one shared visited set, at most
+        ``fanout`` heaviest edges per node, ``max_frontier`` nodes per seed
+        per hop, and nodes above ``max_degree`` reported but not expanded.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {
+            name: [] for name in entity_names
+        }
+        seeds: Dict[int, str] = {}
+        for name in entity_names:
+            node = self._find_name(name)
+            if node is not None:
+                seeds.setdefault(node, name)
+
+        allowed = self._allowed_codes(relationship_types)
+        if not seeds or (allowed is not None and len(allowed) == 0):
+            return grouped
+
+        parents, seed_of = self._bfs(list(seeds), max_depth, allowed)
+        found: Dict[int, List[Tuple[int, float, str, int]]] = {}
+        for node, (_, _, _, distance) in parents.items():
+            _, name, _, centrality = self._node(node)
+            found.setdefault(seed_of[node], []).append(
+                (distance, -centrality, name or "", node)
+            )
+
+        for seed, hits in found.items():
+            hits.sort()
+            grouped[seeds[seed]] = [
+                {
+                    **self._format(node, distance, self._path_edges(node, parents)),
+                    "seed_entity": seeds[seed],
+                }
+                for distance, _, _, node in hits[:limit_per_entity]
+            ]
+        return grouped
+
+    def neighbors(self, entity_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Direct neighbours of an entity"""
+        node = self._find_name(entity_name)
+        if node is None:
+            return []
+
+        nbrs, codes, weights = self._neighbors(node)
+        results = []
+        for nbr, code, weight in zip(nbrs[:limit], codes[:limit], weights[:limit]):
+            relationship = {"type": self._rel_types[code], "weight": float(weight)}
+            results.append(
+                {
+                    "entity": self._entity(int(nbr)),
+                    "relationship": relationship,
+                    "relationship_type": relationship["type"],
+                    "distance": 1,
+                    "retrieval_method": "graph_neighbors",
+                    "source": "snapshot",
+                }
+            )
+        return results
+
+    def shortest_path(
+        self, entity1: str, entity2: str, max_depth: int = 4
+    ) -> Optional[Dict[str, Any]]:
+        """Bidirectional BFS shortest path between two entities"""
+        start, goal = self._find_name(entity1), self._find_name(entity2)
+        if start is None or goal is None:
+            return None
+        if start == goal:
+            return self._format_path([start], [])
+
+        # node -> (previous node, type code, weight) on each side
+        forward = {start: None}
+        backward = {goal: None}
+        forward_frontier, backward_frontier = [start], [goal]
+
+        for _ in range(max_depth):
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            frontier = forward_frontier if expand_forward else backward_frontier
+            seen, other = (forward, backward) if expand_forward else (backward, forward)
+
+            next_frontier = []
+            meeting = None
+            for node in frontier:
+                nbrs, codes, weights = self._neighbors(node)
+                for nbr, code, weight in zip(nbrs.tolist(), codes.tolist(), weights.tolist()):
+                    if nbr in seen:
+                        continue
+                    seen[nbr] = (node, code, weight)
+                    next_frontier.append(nbr)
+                    if nbr in other:
+                        meeting = nbr
+                        break
+                if meeting is not None:
+                    break
+
+            if meeting is not None:
+                return self._join_paths(meeting, forward, backward)
+            if not next_frontier:
+                return None
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot size and freshness"""
+        return {
+            "loaded": self.loaded,
+            "nodes": self._num_nodes,
+            "edges": int(len(self._indices) // 2),
+            "overlay_nodes": len(self._node_overlay),
+            "watermark": self._watermark,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _bfs(
+        self, seeds: List[int], max_depth: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[Dict[int, Tuple[int, int, float, int]], Dict[int, int]]:
+        """Capped multi-seed BFS
+
+        Returns node -> (parent, type code, weight, distance) with seeds
+        excluded, and node -> the seed that reached it first.
+        """
+        visited = set(seeds)
+        seed_of = {seed: seed for seed in seeds}
+        parents: Dict[int, Tuple[int, int, float, int]] = {}
+        frontier = list(seeds)
+
+        for distance in range(1, max_depth + 1):
+            next_frontier: Dict[int, List[int]] = {}
+            for node in frontier:
+                seed = seed_of[node]
+                seed_frontier = next_frontier.setdefault(seed, [])
+                nbrs, codes, weights = self._capped_neighbors(node, allowed)
+                for nbr, code, weight in zip(nbrs.tolist(), codes.tolist(), weights.tolist()):
+                    if nbr in visited:
+                        continue
+                    visited.add(nbr)
+                    seed_of[nbr] = seed
+                    parents[nbr] = (node, code, weight, distance)
+                    if (
+                        len(seed_frontier) < self.max_frontier
+                        and len(self._neighbors(nbr)[0]) <= self.max_degree
+                    ):
+                        seed_frontier.append(nbr)
+            frontier = [node for nodes in next_frontier.values() for node in nodes]
+            if not frontier:
+                break
+
+        return parents, seed_of
+
+    def _capped_neighbors(
+        self, node: int, allowed: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Heaviest ``fanout`` allowed edges, ties broken by neighbour centrality"""
+        nbrs, codes, weights = self._neighbors(node)
+        if allowed is not None:
+            mask = np.isin(codes, allowed)
+            nbrs, codes, weights = nbrs[mask], codes[mask], weights[mask]
+        if len(nbrs) > 1:
+            order = np.lexsort((-self._centralities(nbrs), -weights))[: self.fanout]
+            nbrs, codes, weights = nbrs[order], codes[order], weights[order]
+        return nbrs, codes, weights
+
+    def _centralities(self, nodes: np.ndarray) -> np.ndarray:
+        loaded = len(self._centrality)
+        values = np.zeros(len(nodes), dtype=np.float32)
+        in_base = nodes < loaded
+        values[in_base] = self._centrality[nodes[in_base]]
+        if self._node_overlay:
+            for i, node in enumerate(nodes.tolist()):
+                record = self._node_overlay.get(node)
+                if record is not None:
+                    values[i] = record[3]
+        return values
+
+    def _neighbors(self, node: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        overlay = self._overlay.get(node)
+        if overlay is not None:
+            return overlay
+        if node + 1 >= len(self._indptr):
+            return _EMPTY
+        start, end = self._indptr[node], self._indptr[node + 1]
+        return (
+            self._indices[start:end],
+            self._etypes[start:end],
+            self._weights[start:end],
+        )
+
+    def _allowed_codes(
+        self, relationship_types: Optional[List[str]]
+    ) -> Optional[np.ndarray]:
+        if not relationship_types:
+            return None
+        return np.asarray(
+            [
+                self._rel_type_index[t]
+                for t in relationship_types
+                if t in self._rel_type_index
+            ],
+            dtype=np.int16,
+        )
+
+    def _path_edges(
+        self, node: int, parents: Dict[int, Tuple[int, int, float, int]]
+    ) -> List[Dict[str, Any]]:
+        edges = []
+        while node in parents:
+            parent, code, weight, _ = parents[node]
+            edges.append({"type": self._rel_types[code], "weight": weight})
+            node = parent
+        return edges[::-1]
+
+    def _join_paths(
+        self, meeting: int, forward: Dict[int, Any], backward: Dict[int, Any]
+    ) -> Dict[str, Any]:
+        nodes, edges = [meeting], []
+        node = meeting
+        while forward[node] is not None:
+            previous, code, weight = forward[node]
+            nodes.insert(0, previous)
+            edges.insert(0, {"type": self._rel_types[code], "weight": weight})
+            node = previous
+        node = meeting
+        while backward[node] is not None:
+            following, code, weight = backward[node]
+            nodes.append(following)
+            edges.append({"type": self._rel_types[code], "weight": weight})
+            node = following
+        return self._format_path(nodes, edges)
+
+    def _format(
+        self, node: int, distance: int, edges: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "entity": self._entity(node),
+            "relationships": edges,
+            "distance": distance,
+            "retrieval_method": "graph_traversal",
+            "source": "snapshot",
+        }
+
+    def _format_path(self, nodes: List[int], edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "path_nodes": [self._entity(node) for node in nodes],
+            "path_relationships": edges,
+            "distance": len(edges),
+            "retrieval_method": "graph_path",
+            "source": "snapshot",
+        }
+
+    def _node(self, node: int) -> NodeRecord:
+        record = self._node_overlay.get(node)
+        if record is not None:
+            return record
+        code = self._type_codes[node]
+        return (
+            self._ids[node],
+            self._names[node],
+            self._type_names[code] if code >= 0 else None,
+            float(self._centrality[node]),
+        )
+
+    def _find_name(self, name: str) -> Optional[int]:
+        index = self._overlay_names.get(name)
+        if index is not None:
+            return index
+        index = self._names.find(name)
+        # A renamed node no longer answers to its loaded name
+        record = self._node_overlay.get(index) if index is not None else None
+        if record is not None and record[1] != name:
+            return None
+        return index
+
+    def _entity(self, node: int) -> Dict[str, Any]:
+        node_id, name, node_type, centrality = self._node(node)
+        entity = {"id": node_id, "name": name, "centrality": centrality}
+        if node_type:
+            entity["type"] = node_type
+        return entity
+
+    def _rel_type_code(self, rel_type: str) -> int:
+        with self._lock:
+            code = self._rel_type_index.get(rel_type)
+            if code is None:
+                code = self._rel_type_index[rel_type] = len(self._rel_types)
+                self._rel_types.append(rel_type)
+            return code
+
+    @staticmethod
+    def _count_store(session) -> Tuple[int, int]:
+        """Entity and entity-relationship counts, read from the count store"""
+        record = session.run(
+            f"""
+            CALL {{ MATCH (e:{ENTITY_LABEL}) RETURN count(e) AS entities }}
+            CALL {{ MATCH ()-[r]->() RETURN count(r) AS relationships }}
+            CALL {{ MATCH ()-[m:{MENTION_TYPE}]->() RETURN count(m) AS mentions }}
+            RETURN entities, relationships - mentions AS relationships
+            """
+        ).single()
+        return record["entities"], record["relationships"]
+
+    @staticmethod
+    def _build_csr(
+        num_nodes: int,
+        src: np.ndarray,
+        dst: np.ndarray,
+        etypes: np.ndarray,
+        weights: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Build undirected CSR arrays from a directed edge list"""
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        codes = np.concatenate([etypes, etypes])
+        values = np.concatenate([weights, weights])
+
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+
+        return (
+            indptr,
+            cols[order].astype(np.int32),
+            codes[order],
+            values[order],
+        )
+
+    @staticmethod
+    def _node_query(incremental: bool = False) -> str:
+        where = "WHERE e.updated_at > $since" if incremental else ""
+        return f"""
+        MATCH (e:{ENTITY_LABEL}) {where}
+        RETURN e.id AS id, e.name AS name, e.updated_at AS updated_at,
+               [l IN labels(e) WHERE l <> '{ENTITY_LABEL}'][0] AS type,
+               coalesce(e.centrality, 0.0) AS centrality
+        """
+
+    @staticmethod
+    def _edge_query(incremental: bool = False) -> str:
+        if incremental:
+            # Full adjacency of every changed entity, in both directions
+            return f"""
+            MATCH (a:{ENTITY_LABEL})-[r]-(b:{ENTITY_LABEL})
+            WHERE a.updated_at > $since AND type(r) <> '{MENTION_TYPE}'
+            RETURN a.id AS source, b.id AS target, type(r) AS type,
+                   coalesce(r.weight, 1.0) AS weight
+            """
+        return f"""
+        MATCH (a:{ENTITY_LABEL})-[r]->(b:{ENTITY_LABEL})
+        WHERE type(r) <> '{MENTION_TYPE}'
+        RETURN a.id AS source, b.id AS target, type(r) AS type,
+               coalesce(r.weight, 1.0) AS weight
+        """
+
+
+@lru_cache()
+def get_graph_snapshot() -> GraphSnapshot:
+    """Process-wide snapshot, loaded and refreshed in the background"""
+    settings = get_settings()
+    snapshot = GraphSnapshot()
+    snapshot.start_auto_refresh(settings.graph_snapshot_refresh_interval)
+    return snapshot
@@ -1,27 +1,294 @@
 # src/knowledge_base/graph_store.py
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, AsyncGraphDatabase
 from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
+import re
+import zlib
 from config.settings import get_settings
+from src.knowledge_base.graph_backend import GraphBackend
 
+# Every entity node carries this label in addition to its type, so lookups
+# by id or name can use the schema indexes regardless of entity type
+ENTITY_LABEL = "Entity"
+FULLTEXT_INDEX = "entity_name_fulltext"
 
-class GraphStore:
+# Chunks mentioned by entities, linked (Entity)-[:MENTIONED_IN]->(Chunk)
+CHUNK_LABEL = "Chunk"
+MENTION_TYPE = "MENTIONED_IN"
+
+SCHEMA_STATEMENTS = [
+    f"CREATE CONSTRAINT entity_id_unique IF NOT EXISTS "
+    f"FOR (e:{ENTITY_LABEL}) REQUIRE e.id IS UNIQUE",
+    f"CREATE INDEX entity_name IF NOT EXISTS FOR (e:{ENTITY_LABEL}) ON (e.name)",
+    # Writes touch updated_at on entities and relationship endpoints, so
+    # snapshots can refresh incrementally from this index
+    f"CREATE INDEX entity_updated_at IF NOT EXISTS "
+    f"FOR (e:{ENTITY_LABEL}) ON (e.updated_at)",
+    f"CREATE TEXT INDEX entity_name_text IF NOT EXISTS "
+    f"FOR (e:{ENTITY_LABEL}) ON (e.name)",
+    f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} IF NOT EXISTS "
+    f"FOR (e:{ENTITY_LABEL}) ON EACH [e.name, e.aliases]",
+    f"CREATE CONSTRAINT chunk_id_unique IF NOT EXISTS "
+    f"FOR (c:{CHUNK_LABEL}) REQUIRE c.id IS UNIQUE",
+    f"CREATE INDEX chunk_doc_id IF NOT EXISTS FOR (c:{CHUNK_LABEL}) ON (c.doc_id)",
+]
+
+# Database URIs whose schema was already applied by this process
+_schema_applied = set()
+
+# Labels and relationship types are interpolated into Cypher, so restrict them
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _check_identifier(name: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid graph label or relationship type: {name}")
+    return name
+
+
+def _chunks(rows: List[Any], size: int) -> List[List[Any]]:
+    return [rows[i : i + size] for i in range(0, len(rows), size)]
+
+
+def split_relationship_properties(row: Dict[str, Any]) -> tuple:
+    """Split a relationship row into (other properties, weight, doc_id)
+
+    Merging an edge adds its weight once per source document and records
+    the document in the edge's ``doc_ids`` list, with that document's share
+    of the weight at the same position in ``doc_weights``.
+    """
+    properties = dict(row.get("properties") or {})
+    weight = float(properties.pop("weight", 1.0))
+    doc_id = properties.pop("doc_id", None)
+    properties.pop("doc_ids", None)
+    properties.pop("doc_weights", None)
+    return properties, weight, doc_id
+
+
+def remove_document_weight(
+    properties: Dict[str, Any], doc_id: str
+) -> Optional[Dict[str, Any]]:
+    """Take one document's share out of an edge's stored properties
+
+    Edges written before ``doc_weights`` was kept are split evenly between
+    their documents. Returns None once no document supports the edge.
+    """
+    doc_ids = list(properties.get("doc_ids") or [])
+    if doc_id not in doc_ids:
+        return properties
+    i = doc_ids.index(doc_id)
+    weight = float(properties.get("weight", 0.0))
+    shares = list(properties.get("doc_weights") or [])
+    if len(shares) != len(doc_ids):
+        shares = [weight / len(doc_ids)] * len(doc_ids)
+
+    del doc_ids[i]
+    share = shares.pop(i)
+    if not doc_ids:
+        return None
+    return {
+        **properties,
+        "doc_ids": doc_ids,
+        "doc_weights": shares,
+        "weight": max(weight - share, 0.0),
+    }
+
+
+def bfs_hop_query(key: str, relationship_types: Optional[List[str]] = None) -> str:
+    """One BFS hop: capped, heaviest-first adjacency of every frontier node"""
+    if key not in ("id", "name"):
+        raise ValueError(f"Unsupported seed key: {key}")
+    rel_filter = ""
+    if relationship_types:
+        rel_filter = ":" + "|".join(_check_identifier(t) for t in relationship_types)
+    return f"""
+    UNWIND $frontier AS key
+    MATCH (f:{ENTITY_LABEL} {{{key}: key}})
+    CALL {{
+        WITH f
+        MATCH (f)-[r{rel_filter}]-(n:{ENTITY_LABEL})
+        WHERE type(r) <> '{MENTION_TYPE}'
+        RETURN r, n
+        ORDER BY coalesce(r.weight, 1.0) DESC, coalesce(n.centrality, 0.0) DESC
+        LIMIT $fanout
+    }}
+    RETURN key, f.id AS source, n.id AS id, n.name AS name,
+           coalesce(n.centrality, 0.0) AS centrality,
+           type(r) AS type, properties(r) AS properties,
+           COUNT {{ (n)--() }} AS degree
+    """
+
+
+GET_ENTITIES_QUERY = f"""
+UNWIND $ids AS id
+MATCH (e:{ENTITY_LABEL} {{id: id}})
+RETURN e, COLLECT {{
+    MATCH (e)-[m:{MENTION_TYPE}]->(c:{CHUNK_LABEL})
+    RETURN c.id ORDER BY m.count DESC LIMIT $chunks_per_entity
+}} AS chunk_ids
+"""
+
+
+def entities_by_id(records) -> Dict[str, Dict[str, Any]]:
+    return {
+        record["e"]["id"]: {
+            "entity": dict(record["e"]),
+            "chunk_ids": record["chunk_ids"],
+        }
+        for record in records
+    }
+
+
+class BfsExpansion:
+    """Visited map and per-seed frontiers for hop-by-hop expansion
+
+    Shared by the sync store and the async retriever, which only differ in
+    how they run ``bfs_hop_query`` for each hop.
+    """
+
+    def __init__(
+        self, seeds: List[str], seed_key: str, max_frontier: int, max_degree: int
+    ):
+        self.max_frontier = max_frontier
+        self.max_degree = max_degree
+        self.frontier = list(dict.fromkeys(seeds))
+        self.key = seed_key
+        # node id -> {seed, distance, relationships}; seeds map to themselves
+        self.reached: Dict[str, Dict[str, Any]] = {}
+        self.seed_ids = set()
+
+    def apply(self, records: List[Any], distance: int):
+        """Record one hop's results and compute the next frontier"""
+        if distance == 1:
+            # Resolve seed keys so seeds are never reported as related
+            seed_of = {record["source"]: record["key"] for record in records}
+            self.seed_ids.update(seed_of)
+            for source, seed in seed_of.items():
+                self.reached[source] = {"seed": seed, "relationships": []}
+
+        next_frontier: Dict[str, List[str]] = defaultdict(list)
+        for record in records:
+            node_id = record["id"]
+            if node_id in self.reached:
+                continue
+            parent = self.reached[record["source"]]
+            self.reached[node_id] = {
+                "seed": parent["seed"],
+                "distance": distance,
+                "name": record["name"],
+                "centrality": record["centrality"],
+                "relationships": parent["relationships"]
+                + [{"type": record["type"], **record["properties"]}],
+            }
+            seed_frontier = next_frontier[parent["seed"]]
+            if (
+                record["degree"] <= self.max_degree
+                and len(seed_frontier) < self.max_frontier
+            ):
+                seed_frontier.append(node_id)
+
+        self.frontier = [node_id for ids in next_frontier.values() for node_id in ids]
+        self.key = "id"
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            node_id: hit
+            for node_id, hit in self.reached.items()
+            if node_id not in self.seed_ids
+        }
+
+
+@lru_cache()
+def get_async_graph_driver():
+    """Process-wide async Neo4j driver with a tuned connection pool
+
+    With a ``neo4j://`` URI the driver routes read transactions to cluster
+    followers; ``bolt://`` talks to a single server.
+    """
+    settings = get_settings()
+    return AsyncGraphDatabase.driver(
+        settings.neo4j_uri,
+        auth=(settings.neo4j_user, settings.neo4j_password),
+        max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+        connection_acquisition_timeout=settings.neo4j_connection_acquisition_timeout,
+        max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+    )
+
+
+async def close_async_graph_driver():
+    """Close the shared async driver, e.g. on application shutdown"""
+    if get_async_graph_driver.cache_info().currsize:
+        await get_async_graph_driver().close()
+        get_async_graph_driver.cache_clear()
+
+
+class GraphStore(GraphBackend):
     def __init__(self):
         self.settings = get_settings()
         self.driver = GraphDatabase.driver(
             self.settings.neo4j_uri,
             auth=(self.settings.neo4j_user, self.settings.neo4j_password),
         )
+        if (
+            self.settings.graph_schema_auto_apply
+            and self.settings.neo4j_uri not in _schema_applied
+        ):
+            self.ensure_schema()
         logger.info("Graph store initialized")
 
+    def session(self, **kwargs):
+        """Session on the configured database, the one async reads use too"""
+        return self.driver.session(database=self.settings.neo4j_database, **kwargs)
+
+    def ensure_schema(self):
+        """Create entity constraints and indexes if they do not exist"""
+        try:
+            with self.session() as session:
+                for statement in SCHEMA_STATEMENTS:
+                    session.run(statement).consume()
+            _schema_applied.add(self.settings.neo4j_uri)
+            logger.info("Graph schema applied")
+        except Exception as e:
+            logger.error(f"Graph schema error: {e}")
+
+    def migrate_entity_labels(
+        self, batch_size: int = 10000, labels: Optional[List[str]] = None
+    ) -> int:
+        """Add the common entity label to existing entity nodes
+
+        With ``labels``, only nodes carrying one of those legacy entity types
+        are migrated; otherwise any non-chunk node with an id is.
+        """
+        if labels:
+            match = " OR ".join(f"n:{_check_identifier(label)}" for label in labels)
+        else:
+            match = f"NOT n:{CHUNK_LABEL}"
+        with self.session() as session:
+            result = session.run(
+                f"""
+                MATCH (n) WHERE ({match}) AND n.id IS NOT NULL
+                    AND NOT n:{ENTITY_LABEL} AND NOT n:{CHUNK_LABEL}
+                CALL {{ WITH n SET n:{ENTITY_LABEL} }} IN TRANSACTIONS OF $batch_size ROWS
+                RETURN count(n) AS labelled
+                """,
+                batch_size=batch_size,
+            )
+            labelled = result.single()["labelled"]
+            logger.info(f"Labelled {labelled} existing nodes as {ENTITY_LABEL}")
+            return labelled
+
     def close(self):
         self.driver.close()
 
     def create_entity(self, entity_type: str, properties: Dict[str, Any]):
         """Create an entity node"""
-        with self.driver.session() as session:
+        with self.session() as session:
             query = f"""
-            CREATE (e:{entity_type} $properties)
+            CREATE (e:{entity_type}:{ENTITY_LABEL} $properties)
+            SET e.updated_at = timestamp()
             RETURN e
             """
             result = session.run(query, properties=properties)
@@ -35,14 +302,15 @@ class GraphStore:
         properties: Optional[Dict[str, Any]] = None,
     ):
         """Create relationship between entities"""
-        with self.driver.session() as session:
+        with self.session() as session:
             query = (
                 """
-            MATCH (a {id: $from_entity}), (b {id: $to_entity})
+            MATCH (a:%s {id: $from_entity}), (b:%s {id: $to_entity})
             CREATE (a)-[r:%s $properties]->(b)
+            SET a.updated_at = timestamp(), b.updated_at = timestamp()
             RETURN r
             """
-                % relationship_type
+                % (ENTITY_LABEL, ENTITY_LABEL, relationship_type)
             )
             result = session.run(
                 query,
@@ -52,34 +320,328 @@ class GraphStore:
             )
             return result.single()
 
-    def find_related_entities(
-        self, entity_id: str, max_depth: int = 2
-    ) -> List[Dict[str, Any]]:
-        """Find entities related to given entity"""
-        with self.driver.session() as session:
-            query = (
-                """
-            MATCH path = (e {id: $entity_id})-[*1..%d]-(related)
-            RETURN related, length(path) as distance
-            ORDER BY distance
-            """
-                % max_depth
+    def merge_entities(
+        self,
+        entities: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ) -> int:
+        """Upsert entities in bulk
+
+        Each row is ``{"id": ..., "type": ..., "properties": {...}}``. Rows are
+        deduplicated by id and written with UNWIND ... MERGE in managed write
+        transactions. Batches never share an id, so they run in parallel.
+        """
+        batch_size = batch_size or self.settings.graph_write_batch_size
+        parallelism = parallelism or self.settings.graph_write_parallelism
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for entity in entities:
+            row = merged.setdefault(
+                entity["id"], {"id": entity["id"], "type": None, "properties": {}}
             )
-            result = session.run(query, entity_id=entity_id)
-            return [
-                {"entity": record["related"], "distance": record["distance"]}
-                for record in result
-            ]
+            row["type"] = entity.get("type") or row["type"]
+            row["properties"].update(entity.get("properties", {}))
+
+        batches = _chunks(list(merged.values()), batch_size)
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            list(executor.map(self._write_entity_batch, batches))
+
+        logger.info(f"Merged {len(merged)} entities in {len(batches)} batches")
+        return len(merged)
+
+    def merge_relationships(
+        self,
+        relationships: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ) -> int:
+        """Upsert relationships between existing entities in bulk
+
+        Each row is ``{"from": id, "to": id, "type": ..., "properties": {...}}``.
+        A ``weight`` property is added to an existing edge's weight once per
+        ``doc_id``, which is kept in the edge's ``doc_ids`` list; self-loops
+        are dropped. Endpoints are hashed into partitions and batches are
+        scheduled in waves that touch disjoint partitions, so concurrent
+        transactions never contend for the same node locks.
+        """
+        relationships = [row for row in relationships if row["from"] != row["to"]]
+        waves = self._write_in_waves(
+            relationships, self._write_relationship_batch, batch_size, parallelism
+        )
+        logger.info(f"Merged {len(relationships)} relationships in {waves} waves")
+        return len(relationships)
+
+    def merge_mentions(
+        self,
+        mentions: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ) -> int:
+        """Link entities to the chunks that mention them in bulk
+
+        Each row is ``{"from": entity_id, "to": chunk_id, "doc_id": ..., "count": n}``.
+        Chunk nodes are created on first use.
+        """
+        waves = self._write_in_waves(
+            mentions, self._write_mention_batch, batch_size, parallelism
+        )
+        logger.info(f"Merged {len(mentions)} entity mentions in {waves} waves")
+        return len(mentions)
+
+    def _write_in_waves(
+        self,
+        rows: List[Dict[str, Any]],
+        write_batch,
+        batch_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ) -> int:
+        """Write edge rows in parallel waves of non-conflicting batches"""
+        batch_size = batch_size or self.settings.graph_write_batch_size
+        parallelism = parallelism or self.settings.graph_write_parallelism
+        partitions = parallelism * 2
+
+        def partition(node_id: Any) -> int:
+            return zlib.crc32(str(node_id).encode()) % partitions
+
+        cells: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            cells[(partition(row["from"]), partition(row["to"]))].append(row)
+
+        pending = [
+            (frozenset(cell), batch)
+            for cell, cell_rows in cells.items()
+            for batch in _chunks(cell_rows, batch_size)
+        ]
+
+        waves = 0
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            while pending:
+                used, wave, deferred = set(), [], []
+                for parts, batch in pending:
+                    if used.isdisjoint(parts):
+                        wave.append(batch)
+                        used |= parts
+                    else:
+                        deferred.append((parts, batch))
+                list(executor.map(write_batch, wave))
+                pending = deferred
+                waves += 1
+
+        return waves
+
+    def _write_entity_batch(self, rows: List[Dict[str, Any]]):
+        by_type: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            by_type[row["type"]].append(row)
+
+        def write(tx):
+            for entity_type, typed_rows in by_type.items():
+                set_label = (
+                    f"SET e:{_check_identifier(entity_type)}" if entity_type else ""
+                )
+                tx.run(
+                    f"""
+                    UNWIND $rows AS row
+                    MERGE (e:{ENTITY_LABEL} {{id: row.id}})
+                    SET e += row.properties, e.updated_at = timestamp()
+                    {set_label}
+                    """,
+                    rows=typed_rows,
+                ).consume()
+
+        with self.session() as session:
+            session.execute_write(write)
+
+    def _write_relationship_batch(self, rows: List[Dict[str, Any]]):
+        by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            properties, weight, doc_id = split_relationship_properties(row)
+            by_type[_check_identifier(row["type"])].append(
+                {
+                    "from": row["from"],
+                    "to": row["to"],
+                    "properties": properties,
+                    "weight": weight,
+                    "doc_id": doc_id,
+                }
+            )
+
+        def write(tx):
+            for rel_type, typed_rows in by_type.items():
+                tx.run(
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (a:{ENTITY_LABEL} {{id: row.from}})
+                    MATCH (b:{ENTITY_LABEL} {{id: row.to}})
+                    MERGE (a)-[r:{rel_type}]->(b)
+                    ON CREATE SET r += row.properties, r.weight = row.weight,
+                        r.doc_ids = CASE WHEN row.doc_id IS NULL
+                                         THEN [] ELSE [row.doc_id] END,
+                        r.doc_weights = CASE WHEN row.doc_id IS NULL
+                                             THEN [] ELSE [row.weight] END
+                    ON MATCH SET r += row.properties,
+                        r.weight = CASE WHEN row.doc_id IN coalesce(r.doc_ids, [])
+                                        THEN r.weight
+                                        ELSE coalesce(r.weight, 0) + row.weight END,
+                        r.doc_weights = CASE WHEN row.doc_id IS NULL
+                                               OR row.doc_id IN coalesce(r.doc_ids, [])
+                                             THEN coalesce(r.doc_weights, [])
+                                             ELSE coalesce(r.doc_weights, [])
+                                                  + row.weight END,
+                        r.doc_ids = CASE WHEN row.doc_id IS NULL
+                                           OR row.doc_id IN coalesce(r.doc_ids, [])
+                                         THEN coalesce(r.doc_ids, [])
+                                         ELSE coalesce(r.doc_ids, []) + row.doc_id END
+                    REMOVE r.doc_id
+                    SET a.updated_at = timestamp(), b.updated_at = timestamp()
+                    """,
+                    rows=typed_rows,
+                ).consume()
+
+        with self.session() as session:
+            session.execute_write(write)
+
+    def _write_mention_batch(self, rows: List[Dict[str, Any]]):
+        def write(tx):
+            tx.run(
+                f"""
+                UNWIND $rows AS row
+                MATCH (e:{ENTITY_LABEL} {{id: row.from}})
+                MERGE (c:{CHUNK_LABEL} {{id: row.to}})
+                ON CREATE SET c.doc_id = row.doc_id
+                MERGE (e)-[m:{MENTION_TYPE}]->(c)
+                SET m.count = row.count
+                """,
+                rows=rows,
+            ).consume()
+
+        with self.session() as session:
+            session.execute_write(write)
+
+    def expand_bfs(
+        self,
+        seeds: List[str],
+        max_depth: int = 2,
+        relationship_types: Optional[List[str]] = None,
+        seed_key: str = "id",
+        fanout: Optional[int] = None,
+        max_frontier: Optional[int] = None,
+        max_degree: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Breadth-first expansion from seeds, one query per hop
+
+        Returns related entity id -> {seed, distance, relationships}, with
+        each node reached once at its minimum distance from the closest
+        seed. Every frontier node expands at most ``fanout`` of its
+        heaviest edges, each seed keeps at most ``max_frontier`` nodes per
+        hop, and nodes with more than ``max_degree`` edges are returned but
+        never expanded through.
+        """
+        fanout = fanout or self.settings.graph_bfs_fanout
+        expansion = BfsExpansion(
+            seeds,
+            seed_key,
+            max_frontier or self.settings.graph_bfs_max_frontier,
+            max_degree or self.settings.graph_bfs_max_degree,
+        )
+
+        with self.session() as session:
+            for distance in range(1, max_depth + 1):
+                if not expansion.frontier:
+                    break
+                records = session.run(
+                    bfs_hop_query(expansion.key, relationship_types),
+                    frontier=expansion.frontier,
+                    fanout=fanout,
+                )
+                expansion.apply(list(records), distance)
+
+        return expansion.results()
+
+    def get_entities(
+        self, entity_ids: List[str], chunks_per_entity: int = 0
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch entity properties, and optionally top chunk IDs, by id"""
+        if not entity_ids:
+            return {}
+        with self.session() as session:
+            result = session.run(
+                GET_ENTITIES_QUERY, ids=entity_ids, chunks_per_entity=chunks_per_entity
+            )
+            return entities_by_id(result)
+
+    def delete_document_chunks(self, doc_id: str):
+        """Remove a document's chunks and everything the graph learnt from it
+
+        Its weight is taken out of the relationships it contributed to, and
+        relationships and entities no remaining document supports are
+        deleted, so traversal, snapshots and centrality stop ranking it.
+        """
+        with self.session() as session:
+            entity_ids = session.run(
+                f"""
+                MATCH (c:{CHUNK_LABEL} {{doc_id: $doc_id}})<-[:{MENTION_TYPE}]-(e)
+                RETURN collect(DISTINCT e.id) AS ids
+                """,
+                doc_id=doc_id,
+            ).single()["ids"]
+            session.execute_write(self._remove_document_weight, doc_id, entity_ids)
+            session.run(
+                f"""
+                MATCH (c:{CHUNK_LABEL} {{doc_id: $doc_id}})
+                CALL {{ WITH c DETACH DELETE c }} IN TRANSACTIONS OF 10000 ROWS
+                """,
+                doc_id=doc_id,
+            ).consume()
+            session.run(
+                f"""
+                UNWIND $ids AS id
+                MATCH (e:{ENTITY_LABEL} {{id: id}})
+                WHERE NOT (e)--()
+                DELETE e
+                """,
+                ids=entity_ids,
+            ).consume()
+
+    @staticmethod
+    def _remove_document_weight(tx, doc_id: str, entity_ids: List[str]):
+        # Same arithmetic as remove_document_weight, for the edges between
+        # entities the document mentioned
+        tx.run(
+            f"""
+            UNWIND $ids AS id
+            MATCH (e:{ENTITY_LABEL} {{id: id}})-[r]-(:{ENTITY_LABEL})
+            WHERE type(r) <> '{MENTION_TYPE}' AND $doc_id IN coalesce(r.doc_ids, [])
+            WITH DISTINCT r
+            WITH r, [i IN range(0, size(r.doc_ids) - 1)
+                     WHERE r.doc_ids[i] = $doc_id][0] AS i,
+                 CASE WHEN size(coalesce(r.doc_weights, [])) = size(r.doc_ids)
+                      THEN r.doc_weights
+                      ELSE [d IN r.doc_ids | coalesce(r.weight, 0.0) / size(r.doc_ids)]
+                 END AS shares
+            SET r.weight = CASE WHEN coalesce(r.weight, 0.0) > shares[i]
+                                THEN r.weight - shares[i] ELSE 0.0 END,
+                r.doc_ids = r.doc_ids[..i] + r.doc_ids[i + 1..],
+                r.doc_weights = shares[..i] + shares[i + 1..]
+            WITH r, startNode(r) AS a, endNode(r) AS b
+            SET a.updated_at = timestamp(), b.updated_at = timestamp()
+            WITH r WHERE size(r.doc_ids) = 0
+            DELETE r
+            """,
+            ids=entity_ids,
+            doc_id=doc_id,
+        ).consume()
 
     def clear_graph(self):
         """Clear all nodes and relationships"""
-        with self.driver.session() as session:
+        with self.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
             logger.info("Graph cleared")
 
     def get_graph_stats(self) -> Dict[str, Any]:
         """Get graph statistics"""
-        with self.driver.session() as session:
+        with self.session() as session:
             node_count = session.run("MATCH (n) RETURN count(n) as count").single()[
                 "count"
             ]
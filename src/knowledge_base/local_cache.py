@@ -0,0 +1,106 @@
+# src/knowledge_base/local_cache.py
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class LocalCache:
+    """In-process LRU cache bounded by entry count, bytes and TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: int = 60,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # key -> (value, size, expires_at), ordered from least to most recently used
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, _, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[int] = None):
+        """Store a value; size is its serialized length in bytes"""
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def delete(self, *keys: str):
+        """Remove keys"""
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+
+    def delete_pattern(self, pattern: str):
+        """Remove keys matching a glob-style pattern"""
+        with self._lock:
+            for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+                self._remove(key)
+
+    def clear(self):
+        """Remove all keys"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def _remove(self, key: str):
+        """Remove a key (caller holds the lock)"""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -1,6 +1,6 @@
 # src/knowledge_base/metadata_store.py
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from config.settings import get_settings
@@ -65,8 +65,27 @@ class MetadataStore:
             )
         """)
 
+        # Entity -> chunk inverted index used to hydrate graph results
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS entity_chunks (
+                entity_id VARCHAR(255) NOT NULL,
+                chunk_id VARCHAR(255) NOT NULL,
+                score REAL DEFAULT 1.0,
+                PRIMARY KEY (entity_id, chunk_id),
+                FOREIGN KEY (chunk_id) REFERENCES chunks(chunk_id) ON DELETE CASCADE
+            )
+        """)
+
         # Create indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entity_chunks_score "
+            "ON entity_chunks(entity_id, score DESC)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entity_chunks_chunk_id "
+            "ON entity_chunks(chunk_id)"
+        )
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_documents_source ON documents(source)"
         )
@@ -175,6 +194,103 @@ class MetadataStore:
             for row in results
         ]
 
+    def delete_document(self, doc_id: str) -> List[str]:
+        """Delete a document and its chunks, returning the deleted chunk IDs"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT chunk_id FROM chunks WHERE doc_id = %s", (doc_id,))
+        chunk_ids = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("DELETE FROM documents WHERE doc_id = %s", (doc_id,))
+        self.conn.commit()
+        cursor.close()
+
+        return chunk_ids
+
+    def store_entity_chunks(self, rows: List[Dict[str, Any]], page_size: int = 1000):
+        """Store entity -> chunk links (``entity_id``, ``chunk_id``, ``score``)
+
+        Rows for the same link are summed first, since one statement cannot
+        upsert a row twice.
+        """
+        if not rows:
+            return
+
+        scores: Dict[tuple, float] = {}
+        for row in rows:
+            key = (row["entity_id"], row["chunk_id"])
+            scores[key] = scores.get(key, 0) + row["score"]
+
+        cursor = self.conn.cursor()
+        execute_values(
+            cursor,
+            """
+            INSERT INTO entity_chunks (entity_id, chunk_id, score)
+            VALUES %s
+            ON CONFLICT (entity_id, chunk_id) DO UPDATE SET score = EXCLUDED.score
+        """,
+            [(entity_id, chunk_id, score) for (entity_id, chunk_id), score in scores.items()],
+            page_size=page_size,
+        )
+        self.conn.commit()
+        cursor.close()
+
+    def get_chunks_for_entities(
+        self,
+        chunk_pairs: List[tuple],
+        entity_ids: List[str],
+        per_entity: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """Fetch chunk passages for graph entities in a single query
+
+        ``chunk_pairs`` are known (entity_id, chunk_id) links; entities in
+        ``entity_ids`` are resolved through the inverted index, keeping their
+        top ``per_entity`` chunks by score.
+        """
+        if not chunk_pairs and not entity_ids:
+            return []
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            WITH wanted AS (
+                SELECT entity_id, chunk_id
+                FROM unnest(%(pair_entities)s::text[], %(pair_chunks)s::text[])
+                    AS p(entity_id, chunk_id)
+                UNION
+                SELECT q.entity_id, ec.chunk_id
+                FROM unnest(%(entity_ids)s::text[]) AS q(entity_id)
+                CROSS JOIN LATERAL (
+                    SELECT chunk_id FROM entity_chunks
+                    WHERE entity_chunks.entity_id = q.entity_id
+                    ORDER BY score DESC
+                    LIMIT %(per_entity)s
+                ) ec
+            )
+            SELECT w.entity_id, c.chunk_id, c.doc_id, c.content, c.metadata
+            FROM wanted w
+            JOIN chunks c ON c.chunk_id = w.chunk_id
+        """,
+            {
+                "pair_entities": [pair[0] for pair in chunk_pairs],
+                "pair_chunks": [pair[1] for pair in chunk_pairs],
+                "entity_ids": list(entity_ids),
+                "per_entity": per_entity,
+            },
+        )
+        results = cursor.fetchall()
+        cursor.close()
+
+        return [
+            {
+                "entity_id": row[0],
+                "chunk_id": row[1],
+                "doc_id": row[2],
+                "content": row[3],
+                "metadata": row[4],
+            }
+            for row in results
+        ]
+
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         cursor = self.conn.cursor()
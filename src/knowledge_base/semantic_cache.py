@@ -0,0 +1,241 @@
+# src/knowledge_base/semantic_cache.py
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+
+class SemanticCache:
+    """In-memory cache of search results keyed by query-embedding similarity"""
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 1000,
+        ttl: int = 3600,
+        sample_rate: float = 0.01,
+        max_samples: int = 100,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sample_rate = sample_rate
+
+        # Embedding matrix is allocated lazily once the dimension is known
+        self._vectors: Optional[np.ndarray] = None
+        self._groups = np.full(max_entries, -1, dtype=np.int64)
+        self._group_ids: Dict[str, int] = {}
+        # Live entries per group id, so emptied groups can be dropped
+        self._group_sizes: Dict[int, int] = {}
+        self._group_names: Dict[int, str] = {}
+        self._next_group = itertools.count()
+
+        # (expires_at, seq, slot); entries removed otherwise are skipped lazily
+        self._expiry: List[tuple] = []
+        self._seq = itertools.count()
+
+        # slot -> entry, ordered from least to most recently used
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._sampled = 0
+        self._false_hits = 0
+        self._samples = deque(maxlen=max_samples)
+
+    def lookup(
+        self, embedding: List[float], group: str
+    ) -> Optional[Dict[str, Any]]:
+        """Find the closest cached entry for the same group above the threshold"""
+        query = self._normalize(embedding)
+
+        with self._lock:
+            if self._vectors is None or not self._entries:
+                self._misses += 1
+                return None
+
+            self._expire(time.time())
+
+            gid = self._group_ids.get(group)
+            if gid is None:
+                self._misses += 1
+                return None
+
+            scores = self._vectors @ query
+            scores[self._groups != gid] = -np.inf
+            slot = int(np.argmax(scores))
+            similarity = float(scores[slot])
+
+            if similarity < self.threshold:
+                self._misses += 1
+                return None
+
+            entry = self._entries[slot]
+            self._entries.move_to_end(slot)
+            self._hits += 1
+
+            return {
+                "results": entry["results"],
+                "query": entry["query"],
+                "similarity": similarity,
+                "sampled": random.random() < self.sample_rate,
+            }
+
+    def store(
+        self,
+        embedding: List[float],
+        group: str,
+        query: str,
+        results: List[Dict[str, Any]],
+        ttl: Optional[int] = None,
+    ):
+        """Cache results for a query embedding"""
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+
+            self._expire(time.time())
+
+            if not self._free_slots:
+                evicted, _ = self._entries.popitem(last=False)
+                self._release(evicted)
+
+            slot = self._free_slots.pop()
+            gid = self._group_ids.get(group)
+            if gid is None:
+                gid = self._group_ids[group] = next(self._next_group)
+                self._group_names[gid] = group
+            self._group_sizes[gid] = self._group_sizes.get(gid, 0) + 1
+            seq = next(self._seq)
+            expires_at = time.time() + (ttl or self.ttl)
+
+            self._vectors[slot] = vector
+            self._groups[slot] = gid
+            self._entries[slot] = {
+                "query": query,
+                "results": results,
+                "expires_at": expires_at,
+                "seq": seq,
+            }
+            heapq.heappush(self._expiry, (expires_at, seq, slot))
+
+    def record_sample(
+        self,
+        query: str,
+        cached_query: str,
+        similarity: float,
+        cached_ids: List[str],
+        fresh_ids: List[str],
+        min_overlap: float = 0.5,
+    ) -> bool:
+        """Record a sampled hit verified against a fresh search, returns True if false hit"""
+        cached, fresh = set(cached_ids), set(fresh_ids)
+        union = cached | fresh
+        overlap = len(cached & fresh) / len(union) if union else 1.0
+        false_hit = overlap < min_overlap
+
+        with self._lock:
+            self._sampled += 1
+            if false_hit:
+                self._false_hits += 1
+            self._samples.append(
+                {
+                    "query": query,
+                    "cached_query": cached_query,
+                    "similarity": similarity,
+                    "overlap": overlap,
+                    "false_hit": false_hit,
+                }
+            )
+
+        if false_hit:
+            logger.warning(
+                f"Semantic cache false hit ({similarity:.3f}): '{query[:50]}' ~ '{cached_query[:50]}'"
+            )
+        return false_hit
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            for slot in list(self._entries):
+                self._release(slot)
+            self._entries.clear()
+            self._group_ids.clear()
+            self._group_sizes.clear()
+            self._group_names.clear()
+            self._expiry.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, false-hit sampling and threshold"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "threshold": self.threshold,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "sample_rate": self.sample_rate,
+                "sampled_hits": self._sampled,
+                "false_hits": self._false_hits,
+                "false_hit_rate": self._false_hits / self._sampled
+                if self._sampled
+                else 0.0,
+                "recent_samples": list(self._samples),
+            }
+
+    @staticmethod
+    def make_group(
+        top_k: int, filters: Optional[Dict[str, Any]], generation: int = 0
+    ) -> str:
+        """Entries only match queries with identical top_k, filters and generation"""
+        return f"{generation}:{top_k}:{json.dumps(filters, sort_keys=True, default=str)}"
+
+    def _expire(self, now: float):
+        """Remove expired entries in expiry order (caller holds the lock)"""
+        while self._expiry and self._expiry[0][0] <= now:
+            _, seq, slot = heapq.heappop(self._expiry)
+            entry = self._entries.get(slot)
+            # The slot may have been evicted and reused since
+            if entry is not None and entry["seq"] == seq:
+                del self._entries[slot]
+                self._release(slot)
+
+        # Evicted entries leave stale heap items behind; rebuild when they pile up
+        if len(self._expiry) > 2 * self.max_entries:
+            self._expiry = [
+                (entry["expires_at"], entry["seq"], slot)
+                for slot, entry in self._entries.items()
+            ]
+            heapq.heapify(self._expiry)
+
+    def _release(self, slot: int):
+        """Return a slot to the free list (caller holds the lock)"""
+        gid = int(self._groups[slot])
+        self._groups[slot] = -1
+        self._free_slots.append(slot)
+
+        self._group_sizes[gid] -= 1
+        if self._group_sizes[gid] == 0:
+            del self._group_sizes[gid]
+            del self._group_ids[self._group_names.pop(gid)]
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -54,6 +54,16 @@ class VectorStore:
             logger.error(f"Error searching vector store: {e}")
             raise
 
+    def delete_documents(self, ids: List[str]):
+        """Delete documents from vector store by ID"""
+        try:
+            if ids:
+                self.collection.delete(ids=ids)
+            logger.info(f"Deleted {len(ids)} documents from vector store")
+        except Exception as e:
+            logger.error(f"Error deleting documents: {e}")
+            raise
+
     def delete_collection(self):
         """Delete collection"""
         self.client.delete_collection("knowledge_base")
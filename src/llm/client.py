@@ -1,8 +1,52 @@
 # src/llm/client.py
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple
 from loguru import logger
 from config.settings import get_settings
 
+GEMINI_ROLES = {"user": "user", "assistant": "model", "model": "model"}
+
+
+@lru_cache(maxsize=32)
+def _gemini_model(model_name: str, system_prompt: Optional[str]):
+    """Model objects are reused per (model, system prompt)"""
+    import google.generativeai as genai
+
+    return genai.GenerativeModel(
+        model_name=f"models/{model_name}", system_instruction=system_prompt
+    )
+
+
+def to_gemini_contents(
+    messages: List[Dict[str, str]], system_prompt: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Convert chat messages into one Gemini ``contents`` payload
+
+    Assistant turns become ``model`` turns, consecutive turns of the same
+    role are merged, and ``system`` messages are folded into the system
+    prompt, which Gemini takes separately. Raises ``ValueError`` unless the
+    conversation has a turn and ends with a user turn.
+    """
+    system_parts = [system_prompt] if system_prompt else []
+    contents = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_parts.append(msg["content"])
+            continue
+        role = GEMINI_ROLES.get(msg["role"], "user")
+        if contents and contents[-1]["role"] == role:
+            contents[-1]["parts"].append(msg["content"])
+        else:
+            contents.append({"role": role, "parts": [msg["content"]]})
+
+    if not contents:
+        raise ValueError("Gemini request needs at least one user or assistant message")
+    if contents[-1]["role"] != "user":
+        raise ValueError(
+            f"Gemini request must end with a user turn, not {contents[-1]['role']!r}"
+        )
+    return contents, "\n\n".join(system_parts) or None
+
 
 class LLMClient:
     def __init__(self):
@@ -92,23 +136,13 @@ class LLMClient:
                 return response.choices[0].message.content
 
             elif self.provider == "gemini":
-                # Gemini implementation
-                model = self.client.GenerativeModel(
-                    model_name=f"models/{self.settings.llm_model}",
-                    system_instruction=system_prompt,
+                # The whole conversation goes out as one request
+                contents, system_instruction = to_gemini_contents(
+                    messages, system_prompt
                 )
-
-                # Convert messages to Gemini format
-                chat = model.start_chat(history=[])
-
-                # Build conversation history
-                for msg in messages[:-1]:  # All but last message
-                    if msg["role"] == "user":
-                        chat.send_message(msg["content"])
-
-                # Send final message and get response
-                response = chat.send_message(
-                    messages[-1]["content"],
+                model = _gemini_model(self.settings.llm_model, system_instruction)
+                response = model.generate_content(
+                    contents,
                     generation_config={
                         "temperature": temperature or self.settings.llm_temperature,
                         "max_output_tokens": max_tokens or self.settings.llm_max_tokens,
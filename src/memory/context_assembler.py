@@ -0,0 +1,224 @@
+# src/memory/context_assembler.py
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+
+from loguru import logger
+from config.settings import get_settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Rough characters per token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+SECTION_HEADERS = {
+    "retrieval": "Relevant context:",
+    "session": "Conversation history:",
+    "working": "Recent messages:",
+}
+
+
+@lru_cache()
+def _get_encoding(name: str):
+    if tiktoken is None:
+        logger.warning("tiktoken not installed, estimating token counts")
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"Token encoding {name} unavailable, estimating: {e}")
+        return None
+
+
+def count_tokens_uncached(text: str, encoding: str = "cl100k_base") -> int:
+    """Token count for text that is counted once and kept by the caller"""
+    enc = _get_encoding(encoding)
+    if enc is None:
+        return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+    return len(enc.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=20000)
+def count_tokens(text: str, encoding: str = "cl100k_base") -> int:
+    """Token count for text, cached so repeated history items are free"""
+    return count_tokens_uncached(text, encoding)
+
+
+def truncate_tokens(text: str, max_tokens: int, encoding: str = "cl100k_base") -> str:
+    """Cut text down to at most max_tokens tokens"""
+    enc = _get_encoding(encoding)
+    if enc is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    tokens = enc.encode(text, disallowed_special=())
+    return enc.decode(tokens[:max_tokens]) if len(tokens) > max_tokens else text
+
+
+class ContextAssembler:
+    """Pack working memory, session history and retrieval results into a budget
+
+    Every candidate gets a value: retrieval results by their score, memory
+    by recency. Candidates are taken greedily by value while they fit the
+    token budget, then emitted per section in their original order. Items
+    that did not fit are reported as dropped.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        encoding: Optional[str] = None,
+        max_item_tokens: Optional[int] = None,
+        section_weights: Optional[Dict[str, float]] = None,
+        recency_decay: float = 0.85,
+    ):
+        settings = get_settings()
+        self.budget = budget or settings.context_token_budget
+        self.encoding = encoding or settings.context_token_encoding
+        self.max_item_tokens = max_item_tokens or settings.context_max_item_tokens
+        self.section_weights = section_weights or {
+            "working": 1.0,
+            "retrieval": 0.8,
+            "session": 0.6,
+        }
+        self.recency_decay = recency_decay
+
+    def assemble(
+        self,
+        retrieved: Optional[List[Dict[str, Any]]] = None,
+        session_history: Optional[List[Dict[str, Any]]] = None,
+        working_messages: Optional[List[Dict[str, Any]]] = None,
+        budget: Optional[int] = None,
+        session_summary: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a context string of at most ``budget`` tokens
+
+        Returns the context, its token count, per-section counts of
+        included items and the list of dropped items.
+        """
+        budget = budget or self.budget
+        candidates = (
+            self._retrieval_items(retrieved or [])
+            + self._session_items(session_history or [], session_summary)
+            + self._working_items(working_messages or [])
+        )
+
+        remaining = budget
+        opened = set()
+        selected = []
+        dropped = []
+
+        for item in sorted(candidates, key=lambda c: -c["value"]):
+            # A section's header is paid for by its first included item
+            cost = item["tokens"]
+            if item["section"] not in opened:
+                cost += self._count(SECTION_HEADERS[item["section"]]) + 1
+
+            if cost <= remaining:
+                remaining -= cost
+                opened.add(item["section"])
+                selected.append(item)
+            else:
+                dropped.append(
+                    {
+                        "section": item["section"],
+                        "index": item["index"],
+                        "tokens": item["tokens"],
+                        "value": item["value"],
+                    }
+                )
+
+        parts = []
+        included = {}
+        for section in ("retrieval", "session", "working"):
+            items = sorted(
+                (item for item in selected if item["section"] == section),
+                key=lambda item: item["index"],
+            )
+            included[section] = len(items)
+            if items:
+                parts.append(SECTION_HEADERS[section])
+                parts.extend(item["text"] for item in items)
+
+        used = budget - remaining
+        if dropped:
+            logger.info(
+                f"Context packed {used}/{budget} tokens, dropped {len(dropped)} items"
+            )
+
+        return {
+            "context": "\n".join(parts),
+            "tokens": used,
+            "budget": budget,
+            "included": included,
+            "dropped": dropped,
+        }
+
+    def _count(self, text: str) -> int:
+        return count_tokens(text, self.encoding)
+
+    def _item(self, section: str, index: int, text: str, value: float) -> Dict[str, Any]:
+        if self._count(text) > self.max_item_tokens:
+            text = truncate_tokens(text, self.max_item_tokens, self.encoding)
+        return {
+            "section": section,
+            "index": index,
+            "text": text,
+            # One extra token for the newline joining items
+            "tokens": self._count(text) + 1,
+            "value": value,
+        }
+
+    def _retrieval_items(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        weight = self.section_weights["retrieval"]
+        items = []
+        for rank, result in enumerate(results):
+            content = result.get("content") or result.get("entity", {}).get("name")
+            if not content:
+                continue
+            score = result.get(
+                "combined_score",
+                result.get("similarity_score", result.get("graph_score")),
+            )
+            # Unscored results fall back to their rank
+            value = min(float(score), 1.0) if score is not None else 1.0 / (rank + 1)
+            items.append(
+                self._item("retrieval", rank, f"[{rank + 1}] {content}", weight * value)
+            )
+        return items
+
+    def _session_items(
+        self, interactions: List[Dict[str, Any]], summary: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        weight = self.section_weights["session"]
+        count = len(interactions)
+        # The rolling summary stands in for every folded turn, so it ranks
+        # with the newest turn and is emitted first
+        items = (
+            [self._item("session", -1, f"Summary: {summary}", weight)]
+            if summary
+            else []
+        )
+        return items + [
+            self._item(
+                "session",
+                i,
+                f"User: {interaction['user_message']}\n"
+                f"Assistant: {interaction['assistant_response']}",
+                weight * self.recency_decay ** (count - 1 - i),
+            )
+            for i, interaction in enumerate(interactions)
+        ]
+
+    def _working_items(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        weight = self.section_weights["working"]
+        count = len(messages)
+        return [
+            self._item(
+                "working",
+                i,
+                f"{message['role']}: {message['content']}",
+                weight * self.recency_decay ** (count - 1 - i),
+            )
+            for i, message in enumerate(messages)
+        ]
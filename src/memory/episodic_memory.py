@@ -0,0 +1,290 @@
+# src/memory/episodic_memory.py
+import hashlib
+import queue
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import chromadb
+from chromadb.config import Settings as ChromaSettings
+from loguru import logger
+
+from config.settings import get_settings
+from src.ingestion.embedder import Embedder
+
+SECONDS_PER_DAY = 86400
+
+
+def episode_text(user_message: str, assistant_response: str) -> str:
+    return f"User: {user_message}\nAssistant: {assistant_response}"
+
+
+def decay_weight(age_seconds: float, half_life_days: float, floor: float) -> float:
+    """Exponential time decay that never drops below ``floor``"""
+    decay = 0.5 ** (max(age_seconds, 0.0) / (half_life_days * SECONDS_PER_DAY))
+    return floor + (1.0 - floor) * decay
+
+
+class EpisodicMemory:
+    """Long-term per-user store of completed interactions, recalled by similarity
+
+    ``record`` only queues an episode. A background writer embeds queued
+    episodes in batches and adds them to the user's own Chroma collection,
+    so no embedding call sits on the request path. Each user has a separate
+    HNSW index, so recall cost depends on that user's episodes only and grows
+    roughly logarithmically with them. Recall fetches a few times ``top_k``
+    nearest episodes and reranks them by similarity weighted with time decay.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        half_life_days: Optional[float] = None,
+        decay_floor: Optional[float] = None,
+        candidate_multiplier: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.settings = get_settings()
+        self.batch_size = batch_size or self.settings.episodic_batch_size
+        self.flush_interval = flush_interval or self.settings.episodic_flush_interval
+        self.half_life_days = half_life_days or self.settings.episodic_half_life_days
+        self.decay_floor = (
+            decay_floor if decay_floor is not None else self.settings.episodic_decay_floor
+        )
+        self.candidate_multiplier = (
+            candidate_multiplier or self.settings.episodic_candidate_multiplier
+        )
+
+        self.client = chromadb.PersistentClient(
+            path=self.settings.chroma_persist_dir,
+            settings=ChromaSettings(anonymized_telemetry=False),
+        )
+        self.embedder = Embedder()
+
+        self._collections: Dict[str, Any] = {}
+        self._collections_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue or self.settings.episodic_max_queue)
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer = threading.Thread(
+            target=self._run, daemon=True, name="episodic-writer"
+        )
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        user_id: str,
+        user_message: str,
+        assistant_response: str,
+        session_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Queue a completed interaction; returns False if the queue is full"""
+        episode = {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "text": episode_text(user_message, assistant_response),
+            "metadata": {
+                # Chroma metadata only holds scalars
+                **{
+                    key: value
+                    for key, value in (metadata or {}).items()
+                    if isinstance(value, (str, int, float, bool))
+                },
+                "user_id": user_id,
+                "session_id": session_id or "",
+                "timestamp": time.time(),
+            },
+        }
+        try:
+            self._queue.put_nowait(episode)
+            return True
+        except queue.Full:
+            logger.warning(f"Episodic queue full, dropping episode for user {user_id}")
+            return False
+
+    def flush(self):
+        """Write every queued episode now"""
+        while True:
+            batch = self._take(self.batch_size, timeout=None)
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self):
+        """Stop the writer after writing what is queued"""
+        self._stop.set()
+        self._writer.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take(self.batch_size, timeout=self.flush_interval)
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.error(f"Episodic write error: {e}")
+
+    def _take(self, size: int, timeout: Optional[float]) -> List[Dict[str, Any]]:
+        """Up to ``size`` episodes, waiting at most ``timeout`` for a full batch"""
+        batch = []
+        deadline = time.monotonic() + timeout if timeout else None
+        while len(batch) < size:
+            try:
+                if deadline is None:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, episodes: List[Dict[str, Any]]):
+        with self._write_lock:
+            embeddings = self.embedder.embed_batch(
+                [episode["text"] for episode in episodes], batch_size=self.batch_size
+            )
+
+            by_user: Dict[str, List[int]] = {}
+            for i, episode in enumerate(episodes):
+                by_user.setdefault(episode["user_id"], []).append(i)
+
+            for user_id, indexes in by_user.items():
+                self._collection(user_id, create=True).add(
+                    ids=[episodes[i]["id"] for i in indexes],
+                    embeddings=[embeddings[i] for i in indexes],
+                    documents=[episodes[i]["text"] for i in indexes],
+                    metadatas=[episodes[i]["metadata"] for i in indexes],
+                )
+
+        logger.info(f"Stored {len(episodes)} episodes for {len(by_user)} users")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def recall(
+        self,
+        user_id: str,
+        query: str,
+        top_k: int = 5,
+        query_embedding: Optional[List[float]] = None,
+        min_score: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """Most relevant past episodes of a user, weighted towards recent ones"""
+        try:
+            collection = self._collection(user_id)
+            if collection is None:
+                return []
+
+            count = collection.count()
+            if count == 0:
+                return []
+
+            if query_embedding is None:
+                query_embedding = self.embedder.embed_text(query)
+
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=min(top_k * self.candidate_multiplier, count),
+                include=["documents", "metadatas", "distances"],
+            )
+        except Exception as e:
+            logger.error(f"Episodic recall error: {e}")
+            return []
+
+        now = time.time()
+        episodes = []
+        for episode_id, document, metadata, distance in zip(
+            results["ids"][0],
+            results["documents"][0],
+            results["metadatas"][0],
+            results["distances"][0],
+        ):
+            similarity = 1 - distance
+            score = similarity * decay_weight(
+                now - metadata.get("timestamp", now),
+                self.half_life_days,
+                self.decay_floor,
+            )
+            if score < min_score:
+                continue
+            episodes.append(
+                {
+                    "id": episode_id,
+                    "content": document,
+                    "metadata": metadata,
+                    "similarity_score": similarity,
+                    "combined_score": score,
+                    "retrieval_method": "episodic_memory",
+                }
+            )
+
+        episodes.sort(key=lambda episode: -episode["combined_score"])
+        return episodes[:top_k]
+
+    def count(self, user_id: str) -> int:
+        """Number of stored episodes for a user"""
+        collection = self._collection(user_id)
+        return collection.count() if collection is not None else 0
+
+    def forget(self, user_id: str):
+        """Delete every episode of a user"""
+        name = self._collection_name(user_id)
+        with self._collections_lock:
+            self._collections.pop(name, None)
+        try:
+            self.client.delete_collection(name)
+            logger.info(f"Deleted episodic memory for user {user_id}")
+        except Exception as e:
+            logger.error(f"Episodic forget error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "open_collections": len(self._collections),
+        }
+
+    @staticmethod
+    def _collection_name(user_id: str) -> str:
+        # Chroma restricts collection names, so users are keyed by hash
+        return f"episodes_{hashlib.sha1(user_id.encode()).hexdigest()[:24]}"
+
+    def _collection(self, user_id: str, create: bool = False):
+        name = self._collection_name(user_id)
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
+
+        with self._collections_lock:
+            if name in self._collections:
+                return self._collections[name]
+            try:
+                if create:
+                    collection = self.client.get_or_create_collection(
+                        name=name, metadata={"hnsw:space": "cosine"}
+                    )
+                else:
+                    collection = self.client.get_collection(name=name)
+            except Exception:
+                # Reading a user with no episodes yet
+                return None
+            self._collections[name] = collection
+            return collection
+
+
+@lru_cache()
+def get_episodic_memory() -> EpisodicMemory:
+    """Process-wide episodic memory with a single background writer"""
+    return EpisodicMemory()
@@ -0,0 +1,578 @@
+# src/memory/semantic_memory.py
+import hashlib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+
+import chromadb
+import numpy as np
+import psycopg2
+from chromadb.config import Settings as ChromaSettings
+from psycopg2.errors import UniqueViolation
+from psycopg2.extras import Json, execute_values
+from loguru import logger
+
+from config.settings import get_settings
+from src.ingestion.embedder import Embedder
+from src.knowledge_base.local_cache import LocalCache
+
+FACT_COLUMNS = (
+    "fact_id, fact_key, content, version, mention_count, confidence, source, "
+    "metadata, created_at, updated_at"
+)
+
+
+def normalize_fact(text: str) -> str:
+    return " ".join(text.lower().split()).rstrip(".")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(normalize_fact(text).encode()).hexdigest()
+
+
+class SemanticMemory:
+    """Long-term per-user facts, deduplicated and versioned
+
+    Facts live in Postgres (``semantic_facts``) with their embeddings in a
+    Chroma collection. A new fact that is a near duplicate of an active fact
+    (cosine similarity >= ``merge_threshold``) is merged into it, bumping its
+    mention count. A fact with the same ``key`` but different content
+    supersedes the active one as a new version. Each batch is embedded with
+    one call and written in one transaction.
+
+    A user's active facts and their vectors are cached in-process, so
+    ``get_profile`` and ``search`` are a cache lookup after the first call.
+    """
+
+    def __init__(
+        self,
+        merge_threshold: Optional[float] = None,
+        cache_ttl: Optional[int] = None,
+        cache_max_users: Optional[int] = None,
+    ):
+        self.settings = get_settings()
+        self.merge_threshold = (
+            merge_threshold or self.settings.semantic_fact_merge_threshold
+        )
+
+        self.embedder = Embedder()
+        self.chroma = chromadb.PersistentClient(
+            path=self.settings.chroma_persist_dir,
+            settings=ChromaSettings(anonymized_telemetry=False),
+        )
+        self.collection = self.chroma.get_or_create_collection(
+            name="semantic_facts", metadata={"hnsw:space": "cosine"}
+        )
+
+        self.cache = LocalCache(
+            max_entries=cache_max_users or self.settings.semantic_fact_cache_max_users,
+            ttl=cache_ttl or self.settings.semantic_fact_cache_ttl,
+        )
+
+        self.conn = psycopg2.connect(self.settings.postgres_url)
+        self._create_tables()
+
+        # One connection and one writer: every read and write holds the
+        # lock, so a second worker thread would only wait on it.
+        # Reentrant, since writes reload the profile while holding it.
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="semantic-memory"
+        )
+
+    def _create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS semantic_facts (
+                id SERIAL PRIMARY KEY,
+                fact_id VARCHAR(64) UNIQUE NOT NULL,
+                user_id VARCHAR(255) NOT NULL,
+                fact_key VARCHAR(255),
+                content TEXT NOT NULL,
+                content_hash VARCHAR(40) NOT NULL,
+                version INTEGER DEFAULT 1,
+                status VARCHAR(16) DEFAULT 'active',
+                superseded_by VARCHAR(64),
+                mention_count INTEGER DEFAULT 1,
+                confidence REAL DEFAULT 1.0,
+                source VARCHAR(255),
+                metadata JSONB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_semantic_facts_user "
+            "ON semantic_facts(user_id, status)"
+        )
+        # At most one active fact per content and per key
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_semantic_facts_active_hash "
+            "ON semantic_facts(user_id, content_hash) WHERE status = 'active'"
+        )
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_semantic_facts_active_key "
+            "ON semantic_facts(user_id, fact_key) "
+            "WHERE status = 'active' AND fact_key IS NOT NULL"
+        )
+        self.conn.commit()
+        cursor.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def schedule(self, user_id: str, facts: List[Union[str, Dict[str, Any]]]):
+        """Store facts on the background writer"""
+        self._executor.submit(self._run, user_id, facts)
+
+    def _run(self, user_id: str, facts: List[Union[str, Dict[str, Any]]]):
+        try:
+            self.add_facts(user_id, facts)
+        except Exception as e:
+            logger.error(f"Semantic memory write error: {e}")
+
+    def add_facts(
+        self, user_id: str, facts: List[Union[str, Dict[str, Any]]]
+    ) -> Dict[str, int]:
+        """Merge a batch of facts into a user's memory
+
+        Each fact is a string or a dict with ``content`` and optional
+        ``key``, ``confidence``, ``source`` and ``metadata``.
+        """
+        # Drop empty facts and exact duplicates within the batch
+        batch = {}
+        for fact in facts:
+            if isinstance(fact, str):
+                fact = {"content": fact}
+            content = (fact.get("content") or "").strip()
+            if content:
+                batch.setdefault(content_hash(content), {**fact, "content": content})
+        batch = list(batch.values())
+        if not batch:
+            return {"added": 0, "merged": 0, "superseded": 0}
+
+        with self._lock:
+            embeddings = self._normalize(
+                self.embedder.embed_batch([fact["content"] for fact in batch])
+            )
+            try:
+                result = self._merge(user_id, batch, embeddings)
+            except UniqueViolation as e:
+                # Another process stored an active fact under one of these
+                # keys. The rollback dropped the cached profile, so the retry
+                # plans against the stored fact and supersedes it.
+                logger.warning(
+                    f"Semantic memory key conflict for {user_id}, retrying: {e}"
+                )
+                result = self._merge(user_id, batch, embeddings)
+
+        logger.info(f"Semantic memory for {user_id}: {result}")
+        return result
+
+    def _merge(
+        self, user_id: str, batch: List[Dict[str, Any]], embeddings: np.ndarray
+    ) -> Dict[str, int]:
+        """Plan a batch against the user's active facts and write it"""
+        profile = self._load(user_id)
+        active = list(profile["facts"])
+        by_key = {
+            fact["fact_key"]: i for i, fact in enumerate(active) if fact["fact_key"]
+        }
+        # Copied, since readers may hold the cached profile
+        vectors = (
+            profile["vectors"].copy()
+            if active
+            else np.zeros((0, embeddings.shape[1]), dtype=np.float32)
+        )
+
+        # fact_id -> new row, for facts first seen in this batch
+        inserts: Dict[str, Dict[str, Any]] = {}
+        # fact_id -> (extra mentions, key) for stored facts
+        merges: Dict[str, tuple] = {}
+        superseded: Dict[str, str] = {}
+
+        for fact, vector in zip(batch, embeddings):
+            key = fact.get("key")
+            keyed = by_key.get(key) if key else None
+
+            match = None
+            if active:
+                scores = vectors @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.merge_threshold:
+                    match = best
+
+            if match is not None and keyed in (None, match):
+                # Near duplicate of an active fact, which adopts the key
+                fact_id = active[match]["fact_id"]
+                active[match] = {
+                    **active[match],
+                    "fact_key": active[match]["fact_key"] or key,
+                    "mention_count": active[match]["mention_count"] + 1,
+                }
+                if key:
+                    by_key.setdefault(key, match)
+                if fact_id in inserts:
+                    inserts[fact_id] = active[match]
+                else:
+                    count, _ = merges.get(fact_id, (0, None))
+                    merges[fact_id] = (count + 1, active[match]["fact_key"])
+                continue
+
+            new = {
+                "fact_id": uuid.uuid4().hex,
+                "fact_key": key,
+                "content": fact["content"],
+                "version": 1,
+                "mention_count": 1,
+                "confidence": fact.get("confidence", 1.0),
+                "source": fact.get("source"),
+                "metadata": fact.get("metadata") or {},
+                "created_at": None,
+                "updated_at": None,
+            }
+            inserts[new["fact_id"]] = new
+
+            if keyed is None:
+                active.append(new)
+                vectors = np.vstack([vectors, vector[None, :]])
+                if key:
+                    by_key[key] = len(active) - 1
+                continue
+
+            # Same key, new content: the old fact becomes history
+            old = active[keyed]
+            if inserts.pop(old["fact_id"], None) is not None:
+                new["version"] = old["version"]
+            else:
+                new["version"] = old["version"] + 1
+                superseded[old["fact_id"]] = new["fact_id"]
+                merges.pop(old["fact_id"], None)
+            active[keyed] = new
+            vectors[keyed] = vector
+
+        new_vectors = {
+            fact["fact_id"]: vectors[i]
+            for i, fact in enumerate(active)
+            if fact["fact_id"] in inserts
+        }
+        existing = self._write(
+            user_id, list(inserts.values()), new_vectors, merges, superseded
+        )
+        if existing:
+            # Merged into rows stored by another writer; reread next time
+            self.cache.delete(self._cache_key(user_id))
+        else:
+            self._store_profile(user_id, active, vectors)
+
+        return {
+            "added": len(inserts) - len(existing),
+            "merged": sum(count for count, _ in merges.values()) + len(existing),
+            "superseded": len(superseded),
+        }
+
+    def _write(
+        self,
+        user_id: str,
+        inserts: List[Dict[str, Any]],
+        vectors: Dict[str, np.ndarray],
+        merges: Dict[str, tuple],
+        superseded: Dict[str, str],
+    ) -> Dict[str, str]:
+        """Apply a batch in one transaction, then mirror it to the vector index
+
+        Returns new fact ids that were merged into an already stored active
+        fact with the same content, mapped to that fact's id.
+        """
+        existing: Dict[str, str] = {}
+        cursor = self.conn.cursor()
+        try:
+            if superseded:
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE semantic_facts f
+                    SET status = 'superseded', superseded_by = v.new_id,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(old_id, new_id)
+                    WHERE f.fact_id = v.old_id
+                """,
+                    list(superseded.items()),
+                )
+            if merges:
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE semantic_facts f
+                    SET mention_count = f.mention_count + v.n,
+                        fact_key = COALESCE(f.fact_key, v.fact_key),
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(fact_id, n, fact_key)
+                    WHERE f.fact_id = v.fact_id
+                """,
+                    [
+                        (fact_id, count, key)
+                        for fact_id, (count, key) in merges.items()
+                    ],
+                )
+            if inserts:
+                # Another process may have stored the same content meanwhile;
+                # RETURNING then yields that row's id instead of ours
+                hashes = [content_hash(fact["content"]) for fact in inserts]
+                stored = execute_values(
+                    cursor,
+                    """
+                    INSERT INTO semantic_facts (
+                        fact_id, user_id, fact_key, content, content_hash, version,
+                        mention_count, confidence, source, metadata
+                    )
+                    VALUES %s
+                    ON CONFLICT (user_id, content_hash) WHERE status = 'active'
+                    DO UPDATE SET
+                        mention_count = semantic_facts.mention_count
+                            + EXCLUDED.mention_count,
+                        fact_key = COALESCE(semantic_facts.fact_key, EXCLUDED.fact_key),
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING fact_id, content_hash
+                """,
+                    [
+                        (
+                            fact["fact_id"],
+                            user_id,
+                            fact["fact_key"],
+                            fact["content"],
+                            fact_hash,
+                            fact["version"],
+                            fact["mention_count"],
+                            fact["confidence"],
+                            fact["source"],
+                            Json(fact["metadata"]),
+                        )
+                        for fact, fact_hash in zip(inserts, hashes)
+                    ],
+                    fetch=True,
+                )
+                stored_ids = {fact_hash: fact_id for fact_id, fact_hash in stored}
+                for fact, fact_hash in zip(inserts, hashes):
+                    fact_id = stored_ids.get(fact_hash, fact["fact_id"])
+                    if fact_id != fact["fact_id"]:
+                        existing[fact["fact_id"]] = fact_id
+
+                repointed = [
+                    (old_id, existing[new_id])
+                    for old_id, new_id in superseded.items()
+                    if new_id in existing
+                ]
+                if repointed:
+                    execute_values(
+                        cursor,
+                        """
+                        UPDATE semantic_facts f SET superseded_by = v.new_id
+                        FROM (VALUES %s) AS v(old_id, new_id)
+                        WHERE f.fact_id = v.old_id
+                    """,
+                        repointed,
+                    )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            # The cached profile may no longer match the store
+            self.cache.delete(self._cache_key(user_id))
+            raise
+        finally:
+            cursor.close()
+
+        if superseded:
+            self.collection.delete(ids=list(superseded))
+        # Facts merged into a stored row keep that row's vector
+        inserts = [fact for fact in inserts if fact["fact_id"] not in existing]
+        if inserts:
+            self.collection.upsert(
+                ids=[fact["fact_id"] for fact in inserts],
+                embeddings=[vectors[fact["fact_id"]].tolist() for fact in inserts],
+                documents=[fact["content"] for fact in inserts],
+                metadatas=[{"user_id": user_id} for _ in inserts],
+            )
+        return existing
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_profile(self, user_id: str) -> List[Dict[str, Any]]:
+        """Active facts of a user, most mentioned first"""
+        try:
+            facts = self._load(user_id)["facts"]
+        except Exception as e:
+            logger.error(f"Semantic memory read error: {e}")
+            return []
+        return sorted(facts, key=lambda fact: -fact["mention_count"])
+
+    def search(
+        self,
+        user_id: str,
+        query: str,
+        top_k: int = 5,
+        query_embedding: Optional[List[float]] = None,
+        min_similarity: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """Active facts of a user most similar to the query"""
+        try:
+            profile = self._load(user_id)
+            if not profile["facts"]:
+                return []
+            if query_embedding is None:
+                query_embedding = self.embedder.embed_text(query)
+        except Exception as e:
+            logger.error(f"Semantic memory search error: {e}")
+            return []
+
+        scores = profile["vectors"] @ self._normalize([query_embedding])[0]
+        order = np.argsort(-scores)[:top_k]
+        return [
+            {
+                "id": profile["facts"][i]["fact_id"],
+                "content": profile["facts"][i]["content"],
+                "metadata": profile["facts"][i],
+                "similarity_score": float(scores[i]),
+                "retrieval_method": "semantic_memory",
+            }
+            for i in order
+            if scores[i] >= min_similarity
+        ]
+
+    def get_history(self, user_id: str, fact_key: str) -> List[Dict[str, Any]]:
+        """Every version of a keyed fact, newest first"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {FACT_COLUMNS}, status FROM semantic_facts
+                WHERE user_id = %s AND fact_key = %s
+                ORDER BY version DESC, created_at DESC
+            """,
+                (user_id, fact_key),
+            )
+            rows = cursor.fetchall()
+            self.conn.commit()
+            cursor.close()
+        return [{**self._row_to_fact(row), "status": row[-1]} for row in rows]
+
+    def delete_fact(self, user_id: str, fact_id: str):
+        """Retract a fact; it is kept in the store as deleted"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                UPDATE semantic_facts
+                SET status = 'deleted', updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = %s AND fact_id = %s
+            """,
+                (user_id, fact_id),
+            )
+            self.conn.commit()
+            cursor.close()
+            self.collection.delete(ids=[fact_id])
+            self.cache.delete(self._cache_key(user_id))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        if self.conn:
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Profile cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_key(user_id: str) -> str:
+        return f"facts:{user_id}"
+
+    def _load(self, user_id: str) -> Dict[str, Any]:
+        """Active facts and their unit vectors, from cache or the stores"""
+        profile = self.cache.get(self._cache_key(user_id))
+        if profile is not None:
+            return profile
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            profile = self.cache.get(self._cache_key(user_id))
+            if profile is not None:
+                return profile
+            return self._load_from_store(user_id)
+
+    def _load_from_store(self, user_id: str) -> Dict[str, Any]:
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                f"""
+                SELECT {FACT_COLUMNS} FROM semantic_facts
+                WHERE user_id = %s AND status = 'active'
+                ORDER BY id
+            """,
+                (user_id,),
+            )
+            facts = [self._row_to_fact(row) for row in cursor.fetchall()]
+            # End the read transaction so the connection is not left idle in it
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        vectors = np.zeros((0, self.settings.embedding_dimension), dtype=np.float32)
+        if facts:
+            stored = self.collection.get(
+                ids=[fact["fact_id"] for fact in facts], include=["embeddings"]
+            )
+            by_id = dict(zip(stored["ids"], stored["embeddings"]))
+            # Facts without a vector (e.g. a failed index write) are re-embedded
+            missing = [fact for fact in facts if fact["fact_id"] not in by_id]
+            if missing:
+                embeddings = self.embedder.embed_batch(
+                    [fact["content"] for fact in missing]
+                )
+                for fact, vector in zip(missing, embeddings):
+                    by_id[fact["fact_id"]] = vector
+            vectors = self._normalize([by_id[fact["fact_id"]] for fact in facts])
+
+        return self._store_profile(user_id, facts, vectors)
+
+    def _store_profile(
+        self, user_id: str, facts: List[Dict[str, Any]], vectors: np.ndarray
+    ) -> Dict[str, Any]:
+        profile = {"facts": facts, "vectors": vectors}
+        size = vectors.nbytes + sum(len(fact["content"]) for fact in facts)
+        self.cache.set(self._cache_key(user_id), profile, size)
+        return profile
+
+    @staticmethod
+    def _row_to_fact(row: tuple) -> Dict[str, Any]:
+        return {
+            "fact_id": row[0],
+            "fact_key": row[1],
+            "content": row[2],
+            "version": row[3],
+            "mention_count": row[4],
+            "confidence": row[5],
+            "source": row[6],
+            "metadata": row[7] or {},
+            "created_at": row[8],
+            "updated_at": row[9],
+        }
+
+    @staticmethod
+    def _normalize(vectors: List[List[float]]) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+
+@lru_cache()
+def get_semantic_memory() -> SemanticMemory:
+    """Process-wide semantic memory sharing one profile cache"""
+    return SemanticMemory()
@@ -0,0 +1,320 @@
+# src/memory/session_archive.py
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+import psycopg2
+from psycopg2.extras import execute_values
+from loguru import logger
+
+from config.settings import get_settings
+from src.knowledge_base.cache import CacheStore
+from src.knowledge_base.codecs import CacheCodec
+
+# Sorted set of hot sessions scored by their last write time
+ACTIVE_SESSIONS_KEY = "sessions:active"
+
+# Drop a spilled session from Redis only if it saw no write since it was read
+_EVICT_SCRIPT = """
+local score = redis.call("ZSCORE", KEYS[1], ARGV[1])
+if not score or tonumber(score) ~= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call("DEL", KEYS[2], KEYS[3])
+redis.call("ZREM", KEYS[1], ARGV[1])
+return 1
+"""
+
+# Restore an archived session unless another request already did.
+# ARGV: session_id, ttl, score, meta field count, fields/values..., messages...
+_RESTORE_SCRIPT = """
+if redis.call("EXISTS", KEYS[3]) == 1 then
+    return 0
+end
+local fields = tonumber(ARGV[4])
+local first = 5 + 2 * fields
+if fields > 0 then
+    redis.call("HSET", KEYS[3], unpack(ARGV, 5, first - 1))
+end
+for i = first, #ARGV, 1000 do
+    redis.call("RPUSH", KEYS[2], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call("EXPIRE", KEYS[2], ARGV[2])
+redis.call("EXPIRE", KEYS[3], ARGV[2])
+redis.call("ZADD", KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+
+def session_keys(session_id: str) -> tuple:
+    return f"session:{session_id}:messages", f"session:{session_id}:meta"
+
+
+def merge_payloads(archived: dict, current: dict) -> dict:
+    """Combine an archived session with what Redis holds for it now
+
+    A session restored from the archive keeps its ``created_at`` and already
+    contains the archived messages, so it replaces the row. Anything else is
+    a fragment written while the session was spilled (e.g. after a failed
+    restore) and is appended, so the archived history is never overwritten.
+    """
+    archived_meta, meta = archived["meta"], current["meta"]
+    if archived_meta.get("created_at") == meta.get("created_at"):
+        return current
+
+    merged_meta = {**archived_meta}
+    merged_meta["total_interactions"] = str(
+        int(archived_meta.get("total_interactions", len(archived["messages"])))
+        + int(meta.get("total_interactions", len(current["messages"])))
+    )
+    if meta.get("last_interaction"):
+        merged_meta["last_interaction"] = meta["last_interaction"]
+    if meta.get("summary"):
+        merged_meta["summary"] = "\n\n".join(
+            part for part in (archived_meta.get("summary"), meta["summary"]) if part
+        )
+    return {
+        "messages": archived["messages"] + current["messages"],
+        "meta": merged_meta,
+    }
+
+
+class SessionArchive:
+    """Cold tier for sessions: idle sessions move from Redis to Postgres
+
+    Every session write scores the session in ``sessions:active``. The
+    spiller reads sessions idle for longer than ``idle_seconds`` in batches,
+    stores each as one compressed row in ``session_archive`` and then evicts
+    it from Redis, unless it was written to in the meantime. A session that
+    already has a row is merged into it rather than replacing it. ``restore``
+    puts an archived session back into Redis on its next access, so Redis
+    memory follows active sessions while history is retained in Postgres.
+    """
+
+    def __init__(
+        self,
+        idle_seconds: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.settings = get_settings()
+        self.idle_seconds = (
+            idle_seconds
+            if idle_seconds is not None
+            else self.settings.session_spill_idle_seconds
+        )
+        self.batch_size = batch_size or self.settings.session_spill_batch_size
+
+        self.cache = CacheStore(use_local_cache=False)
+        self.redis_client = self.cache.redis_client
+        # Archived rows are always compressed, whatever the cache threshold
+        self.codec = CacheCodec(
+            codec=self.settings.cache_codec,
+            compression="zstd",
+            compression_threshold=0,
+        )
+        self._evict = self.redis_client.register_script(_EVICT_SCRIPT)
+        self._restore = self.redis_client.register_script(_RESTORE_SCRIPT)
+
+        self.conn = psycopg2.connect(self.settings.postgres_url)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS session_archive (
+                session_id VARCHAR(255) PRIMARY KEY,
+                payload BYTEA NOT NULL,
+                message_count INTEGER,
+                last_active TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.commit()
+        cursor.close()
+
+    # ------------------------------------------------------------------
+    # Spilling
+    # ------------------------------------------------------------------
+
+    def spill_idle(self) -> int:
+        """Move every session idle for longer than ``idle_seconds`` to Postgres"""
+        cutoff = time.time() - self.idle_seconds
+        spilled = 0
+        while True:
+            batch = self.redis_client.zrangebyscore(
+                ACTIVE_SESSIONS_KEY,
+                "-inf",
+                cutoff,
+                start=0,
+                num=self.batch_size,
+                withscores=True,
+            )
+            if not batch:
+                break
+            moved = self._spill_batch(
+                [(session_id.decode(), score) for session_id, score in batch]
+            )
+            spilled += moved
+            # Sessions written to meanwhile stay; don't spin on them
+            if moved == 0 or len(batch) < self.batch_size:
+                break
+
+        if spilled:
+            logger.info(f"Spilled {spilled} idle sessions to the archive")
+        return spilled
+
+    def _spill_batch(self, batch: list) -> int:
+        pipe = self.redis_client.pipeline(transaction=False)
+        for session_id, _ in batch:
+            messages_key, meta_key = session_keys(session_id)
+            pipe.lrange(messages_key, 0, -1)
+            pipe.hgetall(meta_key)
+        values = pipe.execute()
+
+        payloads, expired = {}, []
+        for i, (session_id, score) in enumerate(batch):
+            messages, meta = values[2 * i], values[2 * i + 1]
+            if not meta:
+                # Expired in Redis before it could be spilled
+                expired.append(session_id)
+                continue
+            payloads[session_id] = {
+                "messages": [self.cache.codec.decode(value) for value in messages],
+                "meta": {key.decode(): value.decode() for key, value in meta.items()},
+            }
+
+        if expired:
+            self.redis_client.zrem(ACTIVE_SESSIONS_KEY, *expired)
+        if not payloads:
+            return 0
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT session_id, payload FROM session_archive "
+                    "WHERE session_id = ANY(%s) FOR UPDATE",
+                    (list(payloads),),
+                )
+                for session_id, archived in cursor.fetchall():
+                    payloads[session_id] = merge_payloads(
+                        self.codec.decode(bytes(archived)), payloads[session_id]
+                    )
+
+                rows = []
+                for session_id, score in batch:
+                    payload = payloads.get(session_id)
+                    if payload is None:
+                        continue
+                    rows.append(
+                        (
+                            session_id,
+                            psycopg2.Binary(self.codec.encode(payload)),
+                            len(payload["messages"]),
+                            time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(score)),
+                        )
+                    )
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO session_archive
+                        (session_id, payload, message_count, last_active)
+                    VALUES %s
+                    ON CONFLICT (session_id) DO UPDATE SET
+                        payload = EXCLUDED.payload,
+                        message_count = EXCLUDED.message_count,
+                        last_active = EXCLUDED.last_active,
+                        archived_at = CURRENT_TIMESTAMP
+                """,
+                    rows,
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        # Only evict once the rows are durable
+        pipe = self.redis_client.pipeline(transaction=False)
+        for session_id, score in batch:
+            if session_id in expired:
+                continue
+            self._evict(
+                keys=[ACTIVE_SESSIONS_KEY, *session_keys(session_id)],
+                args=[session_id, repr(score)],
+                client=pipe,
+            )
+        return sum(pipe.execute())
+
+    def start_background(self, interval: int):
+        """Spill idle sessions every ``interval`` seconds"""
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.spill_idle()
+                except Exception as e:
+                    logger.error(f"Session spill error: {e}")
+
+        threading.Thread(target=run, daemon=True, name="session-spiller").start()
+
+    # ------------------------------------------------------------------
+    # Restoring
+    # ------------------------------------------------------------------
+
+    def restore(self, session_id: str, ttl: int) -> bool:
+        """Load an archived session back into Redis
+
+        Returns False if none is archived or another request restored it first.
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT payload FROM session_archive WHERE session_id = %s",
+                (session_id,),
+            )
+            row = cursor.fetchone()
+            self.conn.commit()
+            cursor.close()
+
+        if not row:
+            return False
+
+        payload = self.codec.decode(bytes(row[0]))
+        meta = [item for pair in payload["meta"].items() for item in pair]
+        messages = [self.cache.codec.encode(message) for message in payload["messages"]]
+
+        restored = self._restore(
+            keys=[ACTIVE_SESSIONS_KEY, *session_keys(session_id)],
+            args=[session_id, ttl, time.time(), len(payload["meta"]), *meta, *messages],
+        )
+        if restored:
+            logger.info(f"Restored session {session_id} from the archive")
+        return bool(restored)
+
+    def delete(self, session_id: str):
+        """Remove a session from the archive"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "DELETE FROM session_archive WHERE session_id = %s", (session_id,)
+            )
+            self.conn.commit()
+            cursor.close()
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+
+
+@lru_cache()
+def get_session_archive() -> SessionArchive:
+    """Process-wide archive, spilling idle sessions in the background"""
+    settings = get_settings()
+    archive = SessionArchive()
+    archive.start_background(settings.session_spill_interval)
+    return archive
@@ -0,0 +1,168 @@
+# src/memory/session_compactor.py
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from config.settings import get_settings
+from src.knowledge_base.cache import CacheStore
+
+# Apply a summary only if nobody compacted since we read the session, then
+# drop the folded turns from the head of the list. Positions are 1-based
+# interaction numbers; the list holds positions total-len+1 .. total.
+_COMMIT_SCRIPT = """
+local upto = tonumber(redis.call("HGET", KEYS[2], "summarized_upto") or "0")
+if upto ~= tonumber(ARGV[1]) then
+    return 0
+end
+local total = tonumber(redis.call("HGET", KEYS[2], "total_interactions") or "0")
+local first = total - redis.call("LLEN", KEYS[1]) + 1
+local drop = tonumber(ARGV[2]) - first + 1
+if drop > 0 then
+    redis.call("LTRIM", KEYS[1], drop, -1)
+end
+redis.call("HSET", KEYS[2], "summary", ARGV[3], "summarized_upto", ARGV[2])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an "
+    "assistant. Keep facts, decisions, open questions and user preferences. "
+    "Be concise and write in the third person."
+)
+
+
+def _default_summarizer(previous: str, turns: List[Dict[str, Any]]) -> str:
+    transcript = "\n".join(
+        f"User: {turn['user_message']}\nAssistant: {turn['assistant_response']}"
+        for turn in turns
+    )
+    prompt = (
+        f"Current summary:\n{previous or '(none)'}\n\n"
+        f"New turns:\n{transcript}\n\n"
+        "Rewrite the summary to include the new turns."
+    )
+    return _get_llm_client().generate_response(
+        [{"role": "user", "content": prompt}],
+        system_prompt=SUMMARY_SYSTEM_PROMPT,
+        max_tokens=get_settings().session_summary_max_tokens,
+    )
+
+
+@lru_cache()
+def _get_llm_client():
+    # Imported lazily so sessions work without LLM credentials until needed
+    from src.llm.client import LLMClient
+
+    return LLMClient()
+
+
+class SessionCompactor:
+    """Fold older session turns into a rolling summary in the background
+
+    ``schedule`` is called after a turn has been stored and returns
+    immediately. A worker reads the session, summarises the turns beyond
+    the most recent ``keep_recent`` and commits the new summary with a
+    compare-and-set on the ``summarized_upto`` watermark, so concurrent or
+    repeated compactions of the same session apply at most once.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[Callable[[str, List[Dict[str, Any]]], str]] = None,
+        keep_recent: Optional[int] = None,
+        workers: int = 1,
+        lock_ttl_ms: int = 120000,
+    ):
+        settings = get_settings()
+        self.summarizer = summarizer or _default_summarizer
+        self.keep_recent = keep_recent or settings.session_compaction_keep_recent
+        self.lock_ttl_ms = lock_ttl_ms
+
+        self.cache = CacheStore(use_local_cache=False)
+        self._commit = self.cache.redis_client.register_script(_COMMIT_SCRIPT)
+        self._release = self.cache.redis_client.register_script(_RELEASE_SCRIPT)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="session-compactor"
+        )
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, session_id: str):
+        """Queue a compaction unless one is already pending for the session"""
+        with self._lock:
+            if session_id in self._pending:
+                return
+            self._pending.add(session_id)
+        self._executor.submit(self._run, session_id)
+
+    def compact(self, session_id: str) -> bool:
+        """Compact one session now; returns True if a summary was committed"""
+        messages_key = f"session:{session_id}:messages"
+        meta_key = f"session:{session_id}:meta"
+        lock_key = f"lock:session:{session_id}:compact"
+        token = uuid.uuid4().hex
+
+        redis_client = self.cache.redis_client
+        if not redis_client.set(lock_key, token, nx=True, px=self.lock_ttl_ms):
+            return False
+
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.lrange(messages_key, 0, -1)
+            pipe.hmget(meta_key, "total_interactions", "summarized_upto", "summary")
+            values, (total, upto, summary) = pipe.execute()
+
+            total = int(total or 0)
+            upto = int(upto or 0)
+            summary = summary.decode() if summary else ""
+            first = total - len(values) + 1
+
+            # Fold everything except the most recent turns
+            fold_until = total - self.keep_recent
+            start = max(upto + 1, first)
+            if fold_until < start:
+                return False
+
+            turns = [
+                self.cache.codec.decode(value)
+                for value in values[start - first : fold_until - first + 1]
+            ]
+            new_summary = self.summarizer(summary, turns)
+            if not new_summary:
+                return False
+
+            committed = self._commit(
+                keys=[messages_key, meta_key], args=[upto, fold_until, new_summary]
+            )
+            if committed:
+                logger.info(
+                    f"Compacted {len(turns)} turns of session {session_id} into summary"
+                )
+            return bool(committed)
+        finally:
+            self._release(keys=[lock_key], args=[token])
+
+    def _run(self, session_id: str):
+        with self._lock:
+            self._pending.discard(session_id)
+        try:
+            self.compact(session_id)
+        except Exception as e:
+            logger.error(f"Session compaction error: {e}")
+
+
+@lru_cache()
+def get_session_compactor() -> SessionCompactor:
+    """Process-wide compactor shared by all sessions"""
+    return SessionCompactor(workers=get_settings().session_compaction_workers)
@@ -1,18 +1,119 @@
 # src/memory/session_memory.py
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from src.knowledge_base.cache import CacheStore
+from config.settings import get_settings
+from src.memory.context_assembler import count_tokens
+from src.memory.session_compactor import get_session_compactor
+from src.memory.session_archive import ACTIVE_SESSIONS_KEY, get_session_archive
 from loguru import logger
 
+# Move a pre-list session (one JSON blob at session:{id}) into the list and
+# hash, unless the new layout already exists. ARGV: ttl, meta field count,
+# fields/values..., messages...
+_MIGRATE_SCRIPT = """
+if redis.call("EXISTS", KEYS[2]) == 0 then
+    local fields = tonumber(ARGV[2])
+    local first = 3 + 2 * fields
+    redis.call("HSET", KEYS[2], unpack(ARGV, 3, first - 1))
+    for i = first, #ARGV, 1000 do
+        redis.call("RPUSH", KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+    end
+    redis.call("EXPIRE", KEYS[1], ARGV[1])
+    redis.call("EXPIRE", KEYS[2], ARGV[1])
+end
+redis.call("DEL", KEYS[3])
+return 1
+"""
+
 
 class SessionMemory:
-    """Session-based memory management"""
+    """Session-based memory management
+
+    Interactions are kept in a Redis list (``session:{id}:messages``) and
+    session metadata in a small hash (``session:{id}:meta``). Appends are a
+    single MULTI/EXEC pipeline of RPUSH + LTRIM + EXPIRE, so they move one
+    message regardless of history size and concurrent turns never overwrite
+    each other.
+
+    Once the list reaches the compaction threshold, older turns are folded
+    into a rolling ``summary`` in the metadata hash by a background worker.
+    Sessions with a ``user_id`` also record each turn in episodic memory.
 
-    def __init__(self, session_id: str, max_messages: int = 50):
+    With the session archive enabled, idle sessions are spilled to Postgres
+    and restored into Redis whenever they are touched while spilled. This is
+    checked on every access, since a long-lived object can outlive the idle
+    window. Sessions still stored as a single ``session:{id}`` blob by older
+    versions are converted the same way.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        max_messages: int = 50,
+        ttl: int = 86400,
+        user_id: Optional[str] = None,
+    ):
         self.session_id = session_id
+        self.user_id = user_id
         self.max_messages = max_messages
-        self.cache = CacheStore()
-        self.session_key = f"session:{session_id}"
+        self.ttl = ttl
+        self.cache = CacheStore(use_local_cache=False)
+        self.settings = get_settings()
+        self.messages_key = f"session:{session_id}:messages"
+        self.meta_key = f"session:{session_id}:meta"
+        self.legacy_key = f"session:{session_id}"
+        self.archive = (
+            get_session_archive() if self.settings.session_archive_enabled else None
+        )
+
+    def _ensure_hot(self) -> bool:
+        """Bring a legacy or spilled session into the list/hash layout
+
+        Returns False if that failed, in which case the session must not be
+        written: a fresh list would later be spilled over the real history.
+        """
+        try:
+            pipe = self.cache.redis_client.pipeline(transaction=False)
+            pipe.exists(self.meta_key)
+            pipe.get(self.legacy_key)
+            exists, legacy = pipe.execute()
+            if not exists:
+                if legacy is not None:
+                    self._migrate_legacy(self.cache.codec.decode(legacy))
+                elif self.archive:
+                    self.archive.restore(self.session_id, self.ttl)
+            return True
+        except Exception as e:
+            logger.error(f"Session restore error: {e}")
+            return False
+
+    def _migrate_legacy(self, session_data: Dict[str, Any]):
+        interactions = session_data.get("interactions", [])[-self.max_messages :]
+        now = datetime.utcnow().isoformat()
+        meta = {
+            "created_at": session_data.get("created_at") or now,
+            "last_interaction": (
+                interactions[-1].get("timestamp", now) if interactions else now
+            ),
+            "total_interactions": len(interactions),
+        }
+        migrate = self.cache.redis_client.register_script(_MIGRATE_SCRIPT)
+        migrate(
+            keys=[self.messages_key, self.meta_key, self.legacy_key],
+            args=[
+                self.ttl,
+                len(meta),
+                *[item for pair in meta.items() for item in pair],
+                *[self.cache.codec.encode(interaction) for interaction in interactions],
+            ],
+        )
+        if self.archive:
+            self.cache.redis_client.zadd(
+                ACTIVE_SESSIONS_KEY, {self.session_id: time.time()}
+            )
+        logger.info(f"Migrated legacy session {self.session_id}")
 
     def add_interaction(
         self,
@@ -21,77 +122,146 @@ class SessionMemory:
         metadata: Dict[str, Any] = None,
     ):
         """Add user-assistant interaction to session"""
+        now = datetime.utcnow().isoformat()
         interaction = {
             "user_message": user_message,
             "assistant_response": assistant_response,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now,
             "metadata": metadata or {},
         }
 
-        # Get existing session data
-        session_data = self.cache.get(self.session_key) or {
-            "interactions": [],
-            "created_at": datetime.utcnow().isoformat(),
-        }
+        if not self._ensure_hot():
+            logger.error(
+                f"Not adding interaction to session {self.session_id}: "
+                "its stored history could not be loaded"
+            )
+            return
+
+        try:
+            pipe = self.cache.redis_client.pipeline(transaction=True)
+            pipe.rpush(self.messages_key, self.cache.codec.encode(interaction))
+            pipe.ltrim(self.messages_key, -self.max_messages, -1)
+            pipe.hsetnx(self.meta_key, "created_at", now)
+            pipe.hset(self.meta_key, "last_interaction", now)
+            pipe.hincrby(self.meta_key, "total_interactions", 1)
+            pipe.expire(self.messages_key, self.ttl)
+            pipe.expire(self.meta_key, self.ttl)
+            if self.archive:
+                pipe.zadd(ACTIVE_SESSIONS_KEY, {self.session_id: time.time()})
+            length = pipe.execute()[0]
+            logger.info(f"Added interaction to session {self.session_id}")
+        except Exception as e:
+            logger.error(f"Session append error: {e}")
+            return
 
-        # Add new interaction
-        session_data["interactions"].append(interaction)
+        # Summarise older turns off the request path
+        if (
+            self.settings.session_compaction_enabled
+            and length >= self.settings.session_compaction_threshold
+        ):
+            get_session_compactor().schedule(self.session_id)
 
-        # Keep only recent interactions
-        if len(session_data["interactions"]) > self.max_messages:
-            session_data["interactions"] = session_data["interactions"][
-                -self.max_messages :
-            ]
+        if self.user_id and self.settings.episodic_memory_enabled:
+            from src.memory.episodic_memory import get_episodic_memory
 
-        # Update cache (expire in 24 hours)
-        self.cache.set(self.session_key, session_data, expire=86400)
+            get_episodic_memory().record(
+                self.user_id,
+                user_message,
+                assistant_response,
+                session_id=self.session_id,
+                metadata=metadata,
+            )
 
-        logger.info(f"Added interaction to session {self.session_id}")
+    def get_summary(self) -> str:
+        """Rolling summary of turns folded out of the history, if any"""
+        self._ensure_hot()
+        try:
+            summary = self.cache.redis_client.hget(self.meta_key, "summary")
+            return summary.decode() if summary else ""
+        except Exception as e:
+            logger.error(f"Session summary error: {e}")
+            return ""
 
     def get_conversation_history(
         self, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get conversation history"""
-        session_data = self.cache.get(self.session_key)
-
-        if not session_data:
+        """Get conversation history, only fetching the last ``limit`` turns"""
+        self._ensure_hot()
+        try:
+            start = -limit if limit else 0
+            values = self.cache.redis_client.lrange(self.messages_key, start, -1)
+            return [self.cache.codec.decode(value) for value in values]
+        except Exception as e:
+            logger.error(f"Session read error: {e}")
             return []
 
-        interactions = session_data.get("interactions", [])
-
-        if limit:
-            interactions = interactions[-limit:]
+    def get_context_string(
+        self, limit: int = 10, max_tokens: Optional[int] = None
+    ) -> str:
+        """Get formatted context for LLM
 
-        return interactions
-
-    def get_context_string(self, limit: int = 10) -> str:
-        """Get formatted context for LLM"""
+        The rolling summary, when present, comes first. With ``max_tokens``,
+        only the summary and the most recent interactions that fit are kept.
+        """
         interactions = self.get_conversation_history(limit)
+        summary = self.get_summary()
 
         context_parts = []
-        for interaction in interactions:
-            context_parts.append(f"User: {interaction['user_message']}")
-            context_parts.append(f"Assistant: {interaction['assistant_response']}")
+        remaining = max_tokens
+        if summary:
+            summary = f"Summary of earlier conversation: {summary}"
+            if remaining is not None:
+                remaining -= count_tokens(summary) + 1
+                if remaining < 0:
+                    summary, remaining = "", max_tokens
+
+        for interaction in reversed(interactions):
+            turn = (
+                f"User: {interaction['user_message']}\n"
+                f"Assistant: {interaction['assistant_response']}"
+            )
+            if remaining is not None:
+                remaining -= count_tokens(turn) + 1
+                if remaining < 0:
+                    break
+            context_parts.append(turn)
 
-        return "\n".join(context_parts)
+        if summary:
+            context_parts.append(summary)
+
+        return "\n".join(reversed(context_parts))
 
     def clear_session(self):
         """Clear session memory"""
-        self.cache.delete(self.session_key)
+        self.cache.delete_many([self.messages_key, self.meta_key, self.legacy_key])
+        if self.archive:
+            self.cache.redis_client.zrem(ACTIVE_SESSIONS_KEY, self.session_id)
+            self.archive.delete(self.session_id)
         logger.info(f"Cleared session {self.session_id}")
 
     def get_session_metadata(self) -> Dict[str, Any]:
         """Get session metadata"""
-        session_data = self.cache.get(self.session_key)
+        self._ensure_hot()
+        try:
+            pipe = self.cache.redis_client.pipeline(transaction=False)
+            pipe.hgetall(self.meta_key)
+            pipe.llen(self.messages_key)
+            meta, count = pipe.execute()
+        except Exception as e:
+            logger.error(f"Session metadata error: {e}")
+            return {}
 
-        if not session_data:
+        if not meta:
             return {}
 
-        interactions = session_data.get("interactions", [])
+        # The Redis client returns raw bytes
+        meta = {key.decode(): value.decode() for key, value in meta.items()}
 
         return {
             "session_id": self.session_id,
-            "created_at": session_data.get("created_at"),
-            "interaction_count": len(interactions),
-            "last_interaction": interactions[-1]["timestamp"] if interactions else None,
+            "created_at": meta.get("created_at"),
+            "interaction_count": count,
+            "total_interactions": int(meta.get("total_interactions", count)),
+            "last_interaction": meta.get("last_interaction"),
+            "summarized_interactions": int(meta.get("summarized_upto", 0)),
         }
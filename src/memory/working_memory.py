@@ -1,42 +1,144 @@
 # src/memory/working_memory.py
+import time
 from collections import deque
-from typing import List, Dict, Any, Optional
 from datetime import datetime
+from itertools import islice
+from typing import List, Dict, Any, Optional
+from src.memory.context_assembler import count_tokens_uncached
+
+
+class Message:
+    """One working-memory message
+
+    Supports ``message["role"]`` style access, so it can be used wherever
+    the old message dicts were read. Tokens are counted on first use.
+    """
+
+    __slots__ = ("role", "content", "timestamp", "metadata", "_tokens")
+
+    def __init__(
+        self,
+        role: str,
+        content: str,
+        timestamp: float,
+        metadata: Optional[Dict[str, Any]],
+    ):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+        self.metadata = metadata
+        self._tokens = None
+
+    @property
+    def line(self) -> str:
+        return f"{self.role}: {self.content}"
+
+    @property
+    def tokens(self) -> int:
+        if self._tokens is None:
+            self._tokens = count_tokens_uncached(self.line)
+        return self._tokens
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "metadata":
+            return self.metadata or {}
+        if key == "timestamp":
+            return datetime.utcfromtimestamp(self.timestamp).isoformat()
+        if key in ("role", "content"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": datetime.utcfromtimestamp(self.timestamp).isoformat(),
+            "metadata": self.metadata or {},
+        }
 
 
 class WorkingMemory:
+    """Last few messages of a live conversation
+
+    Messages are slotted records with epoch timestamps. Nothing is counted
+    on append: a message's tokens are counted the first time a budget is
+    checked and kept on the record, and the window total is summed from
+    those on demand. The full context string is cached until the window
+    changes.
+    """
+
+    __slots__ = ("max_size", "messages", "_tokens", "_context")
+
     def __init__(self, max_size: int = 10):
         self.max_size = max_size
-        self.messages = deque(maxlen=max_size)
+        self.messages = deque(maxlen=max(max_size, 0))
+        self._tokens = None
+        self._context = None
 
     def add_message(
         self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None
     ):
         """Add a message to working memory"""
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
-            "metadata": metadata or {},
-        }
-        self.messages.append(message)
+        if self.max_size <= 0:
+            return
+        # The deque drops the oldest message once full
+        self.messages.append(Message(role, content, time.time(), metadata or None))
+        self._tokens = None
+        self._context = None
 
     def get_recent(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get recent messages"""
-        if n is None:
-            return list(self.messages)
-        return list(self.messages)[-n:]
+        """Get recent messages, oldest first"""
+        if n is not None and 0 < n < len(self.messages):
+            recent = list(islice(reversed(self.messages), n))
+            recent.reverse()
+        elif n is None:
+            recent = self.messages
+        else:
+            recent = list(self.messages)[-n:]
+        return [message.to_dict() for message in recent]
 
     def clear(self):
         """Clear working memory"""
         self.messages.clear()
+        self._tokens = None
+        self._context = None
+
+    def _window_tokens(self) -> int:
+        # Each line is charged one extra token for its newline
+        if self._tokens is None:
+            self._tokens = sum(message.tokens + 1 for message in self.messages)
+        return self._tokens
+
+    @property
+    def token_count(self) -> int:
+        """Tokens in the full context string, newlines included"""
+        return max(self._window_tokens() - 1, 0)
+
+    def get_context_string(self, max_tokens: Optional[int] = None) -> str:
+        """Get formatted context string for LLM
+
+        With ``max_tokens``, only the most recent messages that fit are kept.
+        """
+        if max_tokens is None or self._window_tokens() <= max_tokens:
+            if self._context is None:
+                self._context = "\n".join([message.line for message in self.messages])
+            return self._context
 
-    def get_context_string(self) -> str:
-        """Get formatted context string for LLM"""
-        context_parts = []
-        for msg in self.messages:
-            context_parts.append(f"{msg['role']}: {msg['content']}")
-        return "\n".join(context_parts)
+        lines = []
+        remaining = max_tokens
+        for message in reversed(self.messages):
+            remaining -= message.tokens + 1
+            if remaining < 0:
+                break
+            lines.append(message.line)
+        lines.reverse()
+        return "\n".join(lines)
 
     def __len__(self):
         return len(self.messages)
@@ -0,0 +1,307 @@
+# src/retrieval/async_graph_retriever.py
+import asyncio
+from typing import List, Dict, Any, Optional
+
+from neo4j import READ_ACCESS, unit_of_work
+from loguru import logger
+
+from config.settings import get_settings
+from src.knowledge_base.graph_store import (
+    BfsExpansion,
+    GET_ENTITIES_QUERY,
+    FULLTEXT_INDEX,
+    bfs_hop_query,
+    entities_by_id,
+    get_async_graph_driver,
+)
+from src.knowledge_base.graph_snapshot import get_graph_snapshot
+from src.retrieval.graph_retriever import (
+    GraphRetriever,
+    NEIGHBORS_QUERY,
+    FULLTEXT_QUERY,
+    format_bfs_results,
+    fuzzy_lucene_query,
+    fuzzy_result,
+    group_related_batch,
+    neighbor_result,
+    path_query,
+    path_result,
+    property_query,
+    property_result,
+    rank_bfs_hits,
+    related_batch_query,
+    related_query,
+    related_result,
+    traversal_mode,
+)
+
+
+class AsyncGraphRetriever:
+    """Non-blocking graph retrieval for async handlers
+
+    Runs the same queries as ``GraphRetriever`` on the shared async driver,
+    as managed read transactions with a timeout, so they can be routed to
+    read replicas. Multi-query operations such as BFS reuse one session.
+    Traversals follow ``graph_traversal_mode`` and sessions use
+    ``neo4j_database``, as in the sync retriever. The in-memory snapshot is
+    used when loaded; the embedded backend is run on a worker thread.
+    """
+
+    def __init__(self, chunks_per_entity: int = 3):
+        self.settings = get_settings()
+        self.chunks_per_entity = chunks_per_entity
+        self.read_timeout = self.settings.neo4j_read_timeout
+
+        self.embedded = self.settings.graph_backend == "embedded"
+        self.traversal_mode = traversal_mode(self.settings, self.embedded)
+        self._sync = GraphRetriever(chunks_per_entity) if self.embedded else None
+        self.driver = None if self.embedded else get_async_graph_driver()
+
+        self.snapshot = (
+            get_graph_snapshot()
+            if self.settings.graph_snapshot_enabled and not self.embedded
+            else None
+        )
+
+    def _use_snapshot(self, max_depth: int) -> bool:
+        return (
+            self.snapshot is not None
+            and self.snapshot.loaded
+            and max_depth <= self.settings.graph_snapshot_max_depth
+        )
+
+    def _session(self):
+        return self.driver.session(
+            database=self.settings.neo4j_database,
+            default_access_mode=READ_ACCESS,
+        )
+
+    async def _read(self, session, query: str, **params) -> List[Any]:
+        """Run one query in a managed read transaction with a timeout"""
+
+        @unit_of_work(timeout=self.read_timeout)
+        async def work(tx):
+            result = await tx.run(query, **params)
+            return [record async for record in result]
+
+        return await session.execute_read(work)
+
+    async def find_related_entities(
+        self,
+        entity_name: str,
+        relationship_types: Optional[List[str]] = None,
+        max_depth: int = 2,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Find entities related to given entity"""
+        if self.traversal_mode == "path" and not self._use_snapshot(max_depth):
+            try:
+                async with self._session() as session:
+                    records = await self._read(
+                        session,
+                        related_query(relationship_types, max_depth, limit),
+                        entity_name=entity_name,
+                        chunks_per_entity=self.chunks_per_entity,
+                    )
+                return [related_result(record) for record in records]
+            except Exception as e:
+                logger.error(f"Async graph search error: {e}")
+                return []
+
+        grouped = await self.find_related_entities_batch(
+            [entity_name], relationship_types, max_depth, limit
+        )
+        return grouped.get(entity_name, [])
+
+    async def find_related_entities_batch(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        max_depth: int = 2,
+        limit_per_entity: int = 10,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Related entities of several seeds, grouped by closest seed"""
+
+        entity_names = list(dict.fromkeys(entity_names))
+        if not entity_names:
+            return {}
+
+        if self._use_snapshot(max_depth):
+            return self.snapshot.related_entities_batch(
+                entity_names, relationship_types, max_depth, limit_per_entity
+            )
+
+        if self.embedded:
+            return await asyncio.to_thread(
+                self._sync.find_related_entities_batch,
+                entity_names,
+                relationship_types,
+                max_depth,
+                limit_per_entity,
+            )
+
+        if self.traversal_mode == "path":
+            try:
+                async with self._session() as session:
+                    records = await self._read(
+                        session,
+                        related_batch_query(relationship_types, max_depth),
+                        entity_names=entity_names,
+                        limit=limit_per_entity,
+                        chunks_per_entity=self.chunks_per_entity,
+                    )
+                return group_related_batch(records, entity_names)
+            except Exception as e:
+                logger.error(f"Async graph batch search error: {e}")
+                return {}
+
+        try:
+            expansion = BfsExpansion(
+                entity_names,
+                "name",
+                self.settings.graph_bfs_max_frontier,
+                self.settings.graph_bfs_max_degree,
+            )
+
+            # Every hop and the final entity fetch share one session
+            async with self._session() as session:
+                for distance in range(1, max_depth + 1):
+                    if not expansion.frontier:
+                        break
+                    records = await self._read(
+                        session,
+                        bfs_hop_query(expansion.key, relationship_types),
+                        frontier=expansion.frontier,
+                        fanout=self.settings.graph_bfs_fanout,
+                    )
+                    expansion.apply(records, distance)
+
+                by_seed = rank_bfs_hits(
+                    expansion.results(), entity_names, limit_per_entity
+                )
+                ids = [node_id for hits in by_seed.values() for node_id, _ in hits]
+                nodes = {}
+                if ids:
+                    nodes = entities_by_id(
+                        await self._read(
+                            session,
+                            GET_ENTITIES_QUERY,
+                            ids=ids,
+                            chunks_per_entity=self.chunks_per_entity,
+                        )
+                    )
+
+            grouped = format_bfs_results(by_seed, nodes)
+            logger.info(
+                f"Async BFS found {sum(len(v) for v in grouped.values())} related entities for {len(entity_names)} seeds"
+            )
+            return grouped
+
+        except Exception as e:
+            logger.error(f"Async graph batch search error: {e}")
+            return {}
+
+    async def find_path_between_entities(
+        self, entity1: str, entity2: str, max_depth: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Find shortest path between two entities"""
+
+        if self._use_snapshot((max_depth + 1) // 2):
+            path = self.snapshot.shortest_path(entity1, entity2, max_depth)
+            return [path] if path else []
+
+        if self.embedded:
+            return await asyncio.to_thread(
+                self._sync.find_path_between_entities, entity1, entity2, max_depth
+            )
+
+        try:
+            async with self._session() as session:
+                records = await self._read(
+                    session, path_query(max_depth), entity1=entity1, entity2=entity2
+                )
+            return [path_result(records[0])] if records else []
+
+        except Exception as e:
+            logger.error(f"Async graph path search error: {e}")
+            return []
+
+    async def search_by_properties(
+        self,
+        node_labels: Optional[List[str]] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Search nodes by labels and properties"""
+
+        if self.embedded:
+            return await asyncio.to_thread(
+                self._sync.search_by_properties, node_labels, properties, limit
+            )
+
+        try:
+            query, params = property_query(node_labels, properties, limit)
+            async with self._session() as session:
+                records = await self._read(session, query, **params)
+            return [property_result(record) for record in records]
+
+        except Exception as e:
+            logger.error(f"Async graph property search error: {e}")
+            return []
+
+    async def search_entities_fuzzy(
+        self, text: str, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Find entities whose name or aliases approximately match text"""
+
+        if self.embedded:
+            return await asyncio.to_thread(
+                self._sync.search_entities_fuzzy, text, limit
+            )
+
+        lucene_query = fuzzy_lucene_query(text)
+        if not lucene_query:
+            return []
+
+        try:
+            async with self._session() as session:
+                records = await self._read(
+                    session,
+                    FULLTEXT_QUERY,
+                    index_name=FULLTEXT_INDEX,
+                    query=lucene_query,
+                    limit=limit,
+                )
+            return [fuzzy_result(record) for record in records]
+
+        except Exception as e:
+            logger.error(f"Async graph fuzzy search error: {e}")
+            return []
+
+    async def get_entity_neighbors(
+        self, entity_name: str, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get direct neighbors of an entity"""
+
+        if self._use_snapshot(1):
+            return self.snapshot.neighbors(entity_name, limit)
+
+        if self.embedded:
+            return await asyncio.to_thread(
+                self._sync.get_entity_neighbors, entity_name, limit
+            )
+
+        try:
+            async with self._session() as session:
+                records = await self._read(
+                    session,
+                    NEIGHBORS_QUERY,
+                    entity_name=entity_name,
+                    limit=limit,
+                    chunks_per_entity=self.chunks_per_entity,
+                )
+            return [neighbor_result(record) for record in records]
+
+        except Exception as e:
+            logger.error(f"Async graph neighbors search error: {e}")
+            return []
@@ -0,0 +1,99 @@
+# src/retrieval/graph_hydrator.py
+from typing import List, Dict, Any, Optional
+from src.knowledge_base.metadata_store import MetadataStore
+from src.knowledge_base.graph_centrality import centrality_score
+from config.settings import get_settings
+from loguru import logger
+
+
+class GraphHydrator:
+    """Turn graph entity hits into ranked chunk passages"""
+
+    def __init__(
+        self, metadata_store: Optional[MetadataStore] = None, per_entity: int = 3
+    ):
+        self.metadata_store = metadata_store or MetadataStore()
+        self.per_entity = per_entity
+        self.centrality_weight = get_settings().graph_centrality_weight
+
+    def hydrate(
+        self, graph_results: List[Dict[str, Any]], top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Replace entity hits with the passages that mention them
+
+        Chunks linked from several hits accumulate their graph scores, so
+        passages mentioning many related entities rank first. Hits with no
+        linked chunks are kept after the passages.
+        """
+        chunk_pairs = []
+        lookup_ids = []
+        entity_scores: Dict[str, float] = {}
+        entity_hits: Dict[str, Dict[str, Any]] = {}
+
+        for result in graph_results:
+            entity_id = result.get("entity", {}).get("id")
+            if not entity_id:
+                continue
+
+            score = centrality_score(
+                result.get("distance", 1),
+                result["entity"].get("centrality", 0.0),
+                self.centrality_weight,
+            )
+            entity_scores[entity_id] = max(entity_scores.get(entity_id, 0.0), score)
+            entity_hits[entity_id] = result
+
+            chunk_ids = result.get("chunk_ids")
+            if chunk_ids:
+                chunk_pairs.extend(
+                    (entity_id, chunk_id) for chunk_id in chunk_ids[: self.per_entity]
+                )
+            else:
+                lookup_ids.append(entity_id)
+
+        if not entity_scores:
+            return graph_results[:top_k]
+
+        try:
+            rows = self.metadata_store.get_chunks_for_entities(
+                chunk_pairs, lookup_ids, self.per_entity
+            )
+        except Exception as e:
+            logger.error(f"Graph hydration error: {e}")
+            return graph_results[:top_k]
+
+        passages: Dict[str, Dict[str, Any]] = {}
+        hydrated_entities = set()
+
+        for row in rows:
+            entity_id = row["entity_id"]
+            hit = entity_hits[entity_id]
+            hydrated_entities.add(entity_id)
+
+            passage = passages.get(row["chunk_id"])
+            if passage is None:
+                passage = passages[row["chunk_id"]] = {
+                    "id": row["chunk_id"],
+                    "content": row["content"],
+                    "metadata": row["metadata"] or {},
+                    "graph_score": 0.0,
+                    "distance": hit.get("distance", 1),
+                    "entities": [],
+                    "retrieval_method": "graph_hydrated",
+                }
+
+            passage["graph_score"] += entity_scores[entity_id]
+            passage["distance"] = min(passage["distance"], hit.get("distance", 1))
+            passage["entities"].append(hit["entity"].get("name", entity_id))
+
+        ranked = sorted(passages.values(), key=lambda p: -p["graph_score"])
+        unhydrated = [
+            result
+            for result in graph_results
+            if result.get("entity", {}).get("id") not in hydrated_entities
+        ]
+
+        logger.info(
+            f"Hydrated {len(hydrated_entities)} graph entities into {len(ranked)} passages"
+        )
+        return (ranked + unhydrated)[:top_k]
@@ -1,14 +1,266 @@
 # src/retrieval/graph_retriever.py
 from typing import List, Dict, Any, Optional
-from src.knowledge_base.graph_store import GraphStore
+from src.knowledge_base.graph_backend import create_graph_store
+from src.knowledge_base.graph_store import (
+    ENTITY_LABEL,
+    FULLTEXT_INDEX,
+    CHUNK_LABEL,
+    MENTION_TYPE,
+)
+from src.knowledge_base.graph_snapshot import get_graph_snapshot
+from config.settings import get_settings
 from loguru import logger
 
 
+# Traversals stay on the entity graph; chunks are attached to results instead
+ENTITY_PATH_FILTER = f"""related:{ENTITY_LABEL}
+                AND none(rel IN relationships(path) WHERE type(rel) = '{MENTION_TYPE}')"""
+
+# Chunk IDs most often mentioning the related entity
+CHUNK_IDS_SUBQUERY = f"""COLLECT {{
+                    MATCH (related)-[m:{MENTION_TYPE}]->(c:{CHUNK_LABEL})
+                    RETURN c.id ORDER BY m.count DESC LIMIT $chunks_per_entity
+                }}"""
+
+
+NEIGHBORS_QUERY = f"""
+MATCH (e:{ENTITY_LABEL} {{name: $entity_name}})-[r]-(related:{ENTITY_LABEL})
+WHERE type(r) <> '{MENTION_TYPE}'
+RETURN related AS neighbor, r, type(r) as relationship_type,
+       {CHUNK_IDS_SUBQUERY} AS chunk_ids
+LIMIT $limit
+"""
+
+FULLTEXT_QUERY = """
+CALL db.index.fulltext.queryNodes($index_name, $query, {limit: $limit})
+YIELD node, score
+RETURN node, score
+"""
+
+
+def path_query(max_depth: int) -> str:
+    # Mention edges are excluded during the search, so paths never hop
+    # entity -> chunk -> entity
+    return f"""
+    MATCH (e1:{ENTITY_LABEL} {{name: $entity1}}), (e2:{ENTITY_LABEL} {{name: $entity2}})
+    MATCH path = shortestPath((e1)-[*1..{int(max_depth)}]-(e2))
+    WHERE none(rel IN relationships(path) WHERE type(rel) = '{MENTION_TYPE}')
+    RETURN path, length(path) as distance
+    """
+
+
+def _relationship_filter(relationship_types: Optional[List[str]]) -> str:
+    return f":{'|'.join(relationship_types)}" if relationship_types else ""
+
+
+def related_query(
+    relationship_types: Optional[List[str]], max_depth: int, limit: int
+) -> str:
+    """Variable-length path expansion from one seed (``path`` traversal mode)"""
+    return f"""
+    MATCH path = (e:{ENTITY_LABEL} {{name: $entity_name}})-[r{_relationship_filter(relationship_types)}*1..{int(max_depth)}]-(related)
+    WHERE {ENTITY_PATH_FILTER}
+    RETURN related, r, length(path) as distance,
+           {CHUNK_IDS_SUBQUERY} AS chunk_ids
+    ORDER BY distance, coalesce(related.centrality, 0.0) DESC, related.name
+    LIMIT {int(limit)}
+    """
+
+
+def related_batch_query(
+    relationship_types: Optional[List[str]], max_depth: int
+) -> str:
+    """Variable-length path expansion from several seeds, nearest seed wins"""
+    return f"""
+    UNWIND $entity_names AS entity_name
+    MATCH (e:{ENTITY_LABEL} {{name: entity_name}})
+    CALL {{
+        WITH e
+        MATCH path = (e)-[{_relationship_filter(relationship_types)}*1..{int(max_depth)}]-(related)
+        WHERE related <> e AND {ENTITY_PATH_FILTER}
+        WITH related, path ORDER BY length(path)
+        WITH related, head(collect(path)) AS path
+        RETURN related, relationships(path) AS rels, length(path) AS distance
+        ORDER BY distance, coalesce(related.centrality, 0.0) DESC, related.name
+        LIMIT $limit
+    }}
+    WITH related, entity_name, rels, distance
+    ORDER BY distance
+    WITH related, head(collect({{seed: entity_name, rels: rels, distance: distance}})) AS best
+    RETURN best.seed AS seed, related, best.rels AS rels, best.distance AS distance,
+           {CHUNK_IDS_SUBQUERY} AS chunk_ids
+    ORDER BY seed, distance, coalesce(related.centrality, 0.0) DESC, related.name
+    """
+
+
+def related_result(record) -> Dict[str, Any]:
+    return {
+        "entity": dict(record["related"]),
+        "relationships": [dict(rel) for rel in record["r"]],
+        "distance": record["distance"],
+        "chunk_ids": record["chunk_ids"],
+        "retrieval_method": "graph_traversal",
+    }
+
+
+def group_related_batch(
+    records, entity_names: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in entity_names}
+    for record in records:
+        grouped[record["seed"]].append(
+            {
+                "entity": dict(record["related"]),
+                "relationships": [dict(rel) for rel in record["rels"]],
+                "distance": record["distance"],
+                "chunk_ids": record["chunk_ids"],
+                "seed_entity": record["seed"],
+                "retrieval_method": "graph_traversal",
+            }
+        )
+    return grouped
+
+
+def traversal_mode(settings, embedded: bool) -> str:
+    """``bfs`` or ``path``; embedded backends only traverse hop by hop"""
+    if embedded:
+        return "bfs"
+    mode = settings.graph_traversal_mode
+    if mode not in ("bfs", "path"):
+        raise ValueError(f"Unsupported graph traversal mode: {mode}")
+    return mode
+
+
+def fuzzy_lucene_query(text: str) -> str:
+    """Append Lucene fuzzy operators to each term"""
+    terms = [term for term in text.split() if term.isalnum()]
+    return " ".join(f"{term}~" for term in terms)
+
+
+def property_query(
+    node_labels: Optional[List[str]], properties: Optional[Dict[str, Any]], limit: int
+):
+    """Build a label/property match, defaulting to the indexed entity label"""
+    labels = ":".join(node_labels) if node_labels else ENTITY_LABEL
+
+    where_clauses = []
+    params = {}
+
+    if properties:
+        for key, value in properties.items():
+            param_key = f"prop_{key}"
+            where_clauses.append(f"n.{key} = ${param_key}")
+            params[param_key] = value
+
+    where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+
+    query = f"""
+    MATCH (n{":" + labels if labels else ""})
+    {where_clause}
+    RETURN n
+    LIMIT {int(limit)}
+    """
+    return query, params
+
+
+def property_result(record) -> Dict[str, Any]:
+    return {"entity": dict(record["n"]), "retrieval_method": "graph_property_search"}
+
+
+def path_result(record) -> Dict[str, Any]:
+    path = record["path"]
+    return {
+        "path_nodes": [dict(node) for node in path.nodes],
+        "path_relationships": [dict(rel) for rel in path.relationships],
+        "distance": record["distance"],
+        "retrieval_method": "graph_path",
+    }
+
+
+def neighbor_result(record) -> Dict[str, Any]:
+    return {
+        "entity": dict(record["neighbor"]),
+        "relationship": dict(record["r"]),
+        "relationship_type": record["relationship_type"],
+        "distance": 1,
+        "chunk_ids": record["chunk_ids"],
+        "retrieval_method": "graph_neighbors",
+    }
+
+
+def fuzzy_result(record) -> Dict[str, Any]:
+    return {
+        "entity": dict(record["node"]),
+        "match_score": record["score"],
+        "retrieval_method": "graph_fulltext_search",
+    }
+
+
+def rank_bfs_hits(
+    hits: Dict[str, Dict[str, Any]], entity_names: List[str], limit_per_entity: int
+) -> Dict[str, List[Any]]:
+    """Group BFS hits by seed, nearest and most central first"""
+    by_seed: Dict[str, List[Any]] = {name: [] for name in entity_names}
+    for node_id, hit in hits.items():
+        by_seed.setdefault(hit["seed"], []).append((node_id, hit))
+
+    for seed_hits in by_seed.values():
+        seed_hits.sort(
+            key=lambda item: (
+                item[1]["distance"],
+                -item[1]["centrality"],
+                item[1]["name"] or "",
+            )
+        )
+        del seed_hits[limit_per_entity:]
+    return by_seed
+
+
+def format_bfs_results(
+    by_seed: Dict[str, List[Any]], nodes: Dict[str, Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        seed: [
+            {
+                "entity": nodes[node_id]["entity"],
+                "relationships": hit["relationships"],
+                "distance": hit["distance"],
+                "chunk_ids": nodes[node_id]["chunk_ids"],
+                "seed_entity": seed,
+                "retrieval_method": "graph_traversal",
+            }
+            for node_id, hit in seed_hits
+            if node_id in nodes
+        ]
+        for seed, seed_hits in by_seed.items()
+    }
+
+
 class GraphRetriever:
     """Graph-based retrieval for relationship queries"""
 
-    def __init__(self):
-        self.graph_store = GraphStore()
+    def __init__(self, chunks_per_entity: int = 3):
+        self.graph_store = create_graph_store()
+        self.chunks_per_entity = chunks_per_entity
+        # Embedded backends answer lookups themselves instead of via Cypher
+        self.embedded = self.graph_store.embedded
+
+        settings = get_settings()
+        self.snapshot = (
+            get_graph_snapshot()
+            if settings.graph_snapshot_enabled and not self.embedded
+            else None
+        )
+        self.snapshot_max_depth = settings.graph_snapshot_max_depth
+        self.traversal_mode = traversal_mode(settings, self.embedded)
+
+    def _use_snapshot(self, max_depth: int) -> bool:
+        """Serve shallow traversals from the in-memory snapshot once loaded"""
+        return (
+            self.snapshot is not None
+            and self.snapshot.loaded
+            and max_depth <= self.snapshot_max_depth
+        )
 
     def find_related_entities(
         self,
@@ -19,37 +271,25 @@ class GraphRetriever:
     ) -> List[Dict[str, Any]]:
         """Find entities related to given entity"""
 
+        if self._use_snapshot(max_depth):
+            return self.snapshot.related_entities(
+                entity_name, relationship_types, max_depth, limit
+            )
+
+        if self.traversal_mode == "bfs":
+            grouped = self._find_related_bfs(
+                [entity_name], relationship_types, max_depth, limit
+            )
+            return grouped.get(entity_name, [])
+
         try:
-            with self.graph_store.driver.session() as session:
-                # Build relationship filter
-                rel_filter = ""
-                if relationship_types:
-                    rel_types = "|".join(relationship_types)
-                    rel_filter = f":{rel_types}"
-
-                query = f"""
-                MATCH path = (e {{name: $entity_name}})-[r{rel_filter}*1..{max_depth}]-(related)
-                RETURN related, r, length(path) as distance
-                ORDER BY distance, related.name
-                LIMIT {limit}
-                """
-
-                result = session.run(query, entity_name=entity_name)
-
-                related_entities = []
-                for record in result:
-                    related = record["related"]
-                    relationships = record["r"]
-                    distance = record["distance"]
-
-                    related_entities.append(
-                        {
-                            "entity": dict(related),
-                            "relationships": [dict(rel) for rel in relationships],
-                            "distance": distance,
-                            "retrieval_method": "graph_traversal",
-                        }
-                    )
+            with self.graph_store.session() as session:
+                result = session.run(
+                    related_query(relationship_types, max_depth, limit),
+                    entity_name=entity_name,
+                    chunks_per_entity=self.chunks_per_entity,
+                )
+                related_entities = [related_result(record) for record in result]
 
                 logger.info(
                     f"Found {len(related_entities)} related entities for {entity_name}"
@@ -60,39 +300,102 @@ class GraphRetriever:
             logger.error(f"Graph search error: {e}")
             return []
 
-    def find_path_between_entities(
-        self, entity1: str, entity2: str, max_depth: int = 4
-    ) -> List[Dict[str, Any]]:
-        """Find shortest path between two entities"""
+    def find_related_entities_batch(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]] = None,
+        max_depth: int = 2,
+        limit_per_entity: int = 10,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Find related entities for several seeds in a single query
+
+        Each related node is returned once, under the seed it is closest to.
+        """
+
+        entity_names = list(dict.fromkeys(entity_names))
+        if not entity_names:
+            return {}
+
+        if self._use_snapshot(max_depth):
+            return self.snapshot.related_entities_batch(
+                entity_names, relationship_types, max_depth, limit_per_entity
+            )
+
+        if self.traversal_mode == "bfs":
+            return self._find_related_bfs(
+                entity_names, relationship_types, max_depth, limit_per_entity
+            )
 
         try:
-            with self.graph_store.driver.session() as session:
-                query = f"""
-                MATCH path = shortestPath((e1 {{name: $entity1}})-[*1..{max_depth}]-(e2 {{name: $entity2}}))
-                RETURN path, length(path) as distance
-                """
+            with self.graph_store.session() as session:
+                result = session.run(
+                    related_batch_query(relationship_types, max_depth),
+                    entity_names=entity_names,
+                    limit=limit_per_entity,
+                    chunks_per_entity=self.chunks_per_entity,
+                )
+                grouped = group_related_batch(result, entity_names)
 
-                result = session.run(query, entity1=entity1, entity2=entity2)
-                record = result.single()
+                logger.info(
+                    f"Found {sum(len(v) for v in grouped.values())} related entities for {len(entity_names)} seeds"
+                )
+                return grouped
 
-                if record:
-                    path = record["path"]
-                    distance = record["distance"]
+        except Exception as e:
+            logger.error(f"Graph batch search error: {e}")
+            return {}
 
-                    # Extract nodes and relationships from path
-                    nodes = [dict(node) for node in path.nodes]
-                    relationships = [dict(rel) for rel in path.relationships]
+    def _find_related_bfs(
+        self,
+        entity_names: List[str],
+        relationship_types: Optional[List[str]],
+        max_depth: int,
+        limit_per_entity: int,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Capped breadth-first expansion, grouped by closest seed"""
 
-                    return [
-                        {
-                            "path_nodes": nodes,
-                            "path_relationships": relationships,
-                            "distance": distance,
-                            "retrieval_method": "graph_path",
-                        }
-                    ]
+        try:
+            hits = self.graph_store.expand_bfs(
+                entity_names, max_depth, relationship_types, seed_key="name"
+            )
+
+            by_seed = rank_bfs_hits(hits, entity_names, limit_per_entity)
+            nodes = self.graph_store.get_entities(
+                [node_id for seed_hits in by_seed.values() for node_id, _ in seed_hits],
+                self.chunks_per_entity,
+            )
+            grouped = format_bfs_results(by_seed, nodes)
+
+            logger.info(
+                f"BFS found {sum(len(v) for v in grouped.values())} related entities for {len(entity_names)} seeds"
+            )
+            return grouped
 
-                return []
+        except Exception as e:
+            logger.error(f"Graph BFS search error: {e}")
+            return {}
+
+    def find_path_between_entities(
+        self, entity1: str, entity2: str, max_depth: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Find shortest path between two entities"""
+
+        # Bidirectional search only expands about half the depth from each end
+        if self._use_snapshot((max_depth + 1) // 2):
+            path = self.snapshot.shortest_path(entity1, entity2, max_depth)
+            return [path] if path else []
+
+        if self.embedded:
+            path = self.graph_store.shortest_path(entity1, entity2, max_depth)
+            return [path] if path else []
+
+        try:
+            with self.graph_store.session() as session:
+                result = session.run(
+                    path_query(max_depth), entity1=entity1, entity2=entity2
+                )
+                record = result.single()
+                return [path_result(record)] if record else []
 
         except Exception as e:
             logger.error(f"Graph path search error: {e}")
@@ -106,45 +409,49 @@ class GraphRetriever:
     ) -> List[Dict[str, Any]]:
         """Search nodes by labels and properties"""
 
-        try:
-            with self.graph_store.driver.session() as session:
-                # Build query
-                labels = ":".join(node_labels) if node_labels else ""
+        if self.embedded:
+            return self.graph_store.search_by_properties(node_labels, properties, limit)
 
-                where_clauses = []
-                params = {}
+        try:
+            with self.graph_store.session() as session:
+                query, params = property_query(node_labels, properties, limit)
+                result = session.run(query, **params)
+                nodes = [property_result(record) for record in result]
 
-                if properties:
-                    for key, value in properties.items():
-                        param_key = f"prop_{key}"
-                        where_clauses.append(f"n.{key} = ${param_key}")
-                        params[param_key] = value
+                logger.info(f"Found {len(nodes)} nodes matching criteria")
+                return nodes
 
-                where_clause = (
-                    "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-                )
+        except Exception as e:
+            logger.error(f"Graph property search error: {e}")
+            return []
 
-                query = f"""
-                MATCH (n{":" + labels if labels else ""})
-                {where_clause}
-                RETURN n
-                LIMIT {limit}
-                """
+    def search_entities_fuzzy(
+        self, text: str, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Find entities whose name or aliases approximately match text"""
 
-                result = session.run(query, **params)
+        if self.embedded:
+            return self.graph_store.search_entities_fuzzy(text, limit)
 
-                nodes = []
-                for record in result:
-                    node = dict(record["n"])
-                    nodes.append(
-                        {"entity": node, "retrieval_method": "graph_property_search"}
-                    )
+        try:
+            with self.graph_store.session() as session:
+                lucene_query = fuzzy_lucene_query(text)
+                if not lucene_query:
+                    return []
+
+                result = session.run(
+                    FULLTEXT_QUERY,
+                    index_name=FULLTEXT_INDEX,
+                    query=lucene_query,
+                    limit=limit,
+                )
+                nodes = [fuzzy_result(record) for record in result]
 
-                logger.info(f"Found {len(nodes)} nodes matching criteria")
+                logger.info(f"Found {len(nodes)} entities matching '{text}'")
                 return nodes
 
         except Exception as e:
-            logger.error(f"Graph property search error: {e}")
+            logger.error(f"Graph fuzzy search error: {e}")
             return []
 
     def get_entity_neighbors(
@@ -152,31 +459,23 @@ class GraphRetriever:
     ) -> List[Dict[str, Any]]:
         """Get direct neighbors of an entity"""
 
+        if self._use_snapshot(1):
+            return self.snapshot.neighbors(entity_name, limit)
+
+        if self.embedded:
+            return self.graph_store.neighbors(
+                entity_name, limit, self.chunks_per_entity
+            )
+
         try:
-            with self.graph_store.driver.session() as session:
-                query = """
-                MATCH (e {name: $entity_name})-[r]-(neighbor)
-                RETURN neighbor, r, type(r) as relationship_type
-                LIMIT $limit
-                """
-
-                result = session.run(query, entity_name=entity_name, limit=limit)
-
-                neighbors = []
-                for record in result:
-                    neighbor = dict(record["neighbor"])
-                    relationship = dict(record["r"])
-                    rel_type = record["relationship_type"]
-
-                    neighbors.append(
-                        {
-                            "entity": neighbor,
-                            "relationship": relationship,
-                            "relationship_type": rel_type,
-                            "distance": 1,
-                            "retrieval_method": "graph_neighbors",
-                        }
-                    )
+            with self.graph_store.session() as session:
+                result = session.run(
+                    NEIGHBORS_QUERY,
+                    entity_name=entity_name,
+                    limit=limit,
+                    chunks_per_entity=self.chunks_per_entity,
+                )
+                neighbors = [neighbor_result(record) for record in result]
 
                 logger.info(f"Found {len(neighbors)} neighbors for {entity_name}")
                 return neighbors
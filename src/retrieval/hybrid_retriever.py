@@ -1,7 +1,12 @@
 # src/retrieval/hybrid_retriever.py
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional
 from src.retrieval.vector_retriever import VectorRetriever
 from src.retrieval.graph_retriever import GraphRetriever
+from src.retrieval.async_graph_retriever import AsyncGraphRetriever
+from src.retrieval.graph_hydrator import GraphHydrator
+from src.knowledge_base.graph_centrality import centrality_score, get_graph_centrality
+from config.settings import get_settings
 from loguru import logger
 import re
 
@@ -12,6 +17,15 @@ class HybridRetriever:
     def __init__(self):
         self.vector_retriever = VectorRetriever()
         self.graph_retriever = GraphRetriever()
+        self.graph_hydrator = GraphHydrator()
+        self._async_graph_retriever: Optional[AsyncGraphRetriever] = None
+
+        settings = get_settings()
+        self.centrality_weight = settings.graph_centrality_weight
+        self.ppr_enabled = settings.graph_ppr_enabled
+        if self.ppr_enabled:
+            # Start loading the matrix now rather than on the first query
+            get_graph_centrality()
 
     def search(
         self,
@@ -49,6 +63,46 @@ class HybridRetriever:
             # Default to vector search
             return self.vector_retriever.search(query, top_k)
 
+    async def asearch(
+        self,
+        query: str,
+        strategy: str = "auto",
+        top_k: int = 10,
+        vector_weight: float = 0.7,
+        graph_weight: float = 0.3,
+    ) -> List[Dict[str, Any]]:
+        """Async variant of ``search`` for use inside the event loop
+
+        Graph queries run on the async Neo4j driver; vector search and
+        hydration run on worker threads. Combined searches run both
+        branches concurrently.
+        """
+
+        if strategy == "auto":
+            strategy = self._determine_strategy(query)
+
+        logger.info(f"Using strategy: {strategy} for query: {query[:50]}...")
+
+        if strategy == "graph_only":
+            return await self._graph_search_for_query_async(query, top_k)
+
+        if strategy == "combined":
+            vector_results, graph_results = await asyncio.gather(
+                asyncio.to_thread(self.vector_retriever.search, query, top_k),
+                self._graph_search_for_query_async(query, top_k),
+            )
+            return self._merge_results(
+                vector_results, graph_results, top_k, vector_weight, graph_weight
+            )
+
+        return await asyncio.to_thread(self.vector_retriever.search, query, top_k)
+
+    @property
+    def async_graph_retriever(self) -> AsyncGraphRetriever:
+        if self._async_graph_retriever is None:
+            self._async_graph_retriever = AsyncGraphRetriever()
+        return self._async_graph_retriever
+
     def _determine_strategy(self, query: str) -> str:
         """Automatically determine best search strategy"""
 
@@ -107,18 +161,78 @@ class HybridRetriever:
 
         results = []
 
-        for entity in entities:
-            # Get related entities
-            related = self.graph_retriever.find_related_entities(
-                entity, max_depth=2, limit=top_k // len(entities) if entities else top_k
+        if entities:
+            # Get related entities for all seeds in one round trip
+            related_by_entity = self.graph_retriever.find_related_entities_batch(
+                entities, max_depth=2, limit_per_entity=max(1, top_k // len(entities))
             )
-            results.extend(related)
+            for entity in entities:
+                results.extend(related_by_entity.get(entity, []))
+
+            if self.ppr_enabled and results:
+                results = self._personalize(results, entities)
 
         # If no entities found, try property search
         if not results:
             results = self.graph_retriever.search_by_properties(limit=top_k)
 
-        return results[:top_k]
+        # Swap entity hits for the passages that mention them
+        return self.graph_hydrator.hydrate(results, top_k)
+
+    async def _graph_search_for_query_async(
+        self, query: str, top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Async graph search based on query"""
+
+        entities = self._extract_entities_from_query(query)
+
+        results = []
+
+        if entities:
+            related_by_entity = (
+                await self.async_graph_retriever.find_related_entities_batch(
+                    entities,
+                    max_depth=2,
+                    limit_per_entity=max(1, top_k // len(entities)),
+                )
+            )
+            for entity in entities:
+                results.extend(related_by_entity.get(entity, []))
+
+            if self.ppr_enabled and results:
+                results = await asyncio.to_thread(self._personalize, results, entities)
+
+        if not results:
+            results = await self.async_graph_retriever.search_by_properties(
+                limit=top_k
+            )
+
+        # Hydration reads Postgres, keep it off the event loop
+        return await asyncio.to_thread(self.graph_hydrator.hydrate, results, top_k)
+
+    def _personalize(
+        self, results: List[Dict[str, Any]], seeds: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Replace global centrality with personalised PageRank from the seeds"""
+        try:
+            scores = get_graph_centrality().personalized_pagerank(seeds)
+        except Exception as e:
+            logger.error(f"Personalised PageRank error: {e}")
+            return results
+
+        if not scores:
+            return results
+
+        return [
+            {
+                **result,
+                "entity": {
+                    **result["entity"],
+                    "centrality": scores.get(result["entity"].get("id"), 0.0),
+                },
+            }
+            for result in results
+        ]
 
     def _combined_search(
         self, query: str, top_k: int, vector_weight: float, graph_weight: float
@@ -129,20 +243,41 @@ class HybridRetriever:
         vector_results = self.vector_retriever.search(query, top_k)
         graph_results = self._graph_search_for_query(query, top_k)
 
-        # Combine and score results
+        return self._merge_results(
+            vector_results, graph_results, top_k, vector_weight, graph_weight
+        )
+
+    def _merge_results(
+        self,
+        vector_results: List[Dict[str, Any]],
+        graph_results: List[Dict[str, Any]],
+        top_k: int,
+        vector_weight: float,
+        graph_weight: float,
+    ) -> List[Dict[str, Any]]:
+        """Weight, merge and deduplicate vector and graph results"""
+
         combined_results = []
 
-        # Add vector results with weighted scores
+        # Add vector results with weighted scores (copied, cached results are shared)
         for result in vector_results:
+            result = dict(result)
             result["combined_score"] = result.get("similarity_score", 0) * vector_weight
             result["search_methods"] = ["vector"]
             combined_results.append(result)
 
         # Add graph results with weighted scores
         for result in graph_results:
-            # Create a similarity score based on graph distance
-            distance = result.get("distance", 1)
-            graph_score = 1.0 / distance if distance > 0 else 1.0
+            # Hydrated passages carry an accumulated score, raw hits are
+            # scored by distance and entity centrality
+            if "graph_score" in result:
+                graph_score = min(1.0, result["graph_score"])
+            else:
+                graph_score = centrality_score(
+                    result.get("distance", 1),
+                    result.get("entity", {}).get("centrality", 0.0),
+                    self.centrality_weight,
+                )
 
             result["combined_score"] = graph_score * graph_weight
             result["search_methods"] = ["graph"]
@@ -209,11 +344,11 @@ class HybridRetriever:
         expanded_results.extend(base_results)
 
         # Context-based graph search
+        related_by_entity = self.graph_retriever.find_related_entities_batch(
+            context_entities, max_depth=1, limit_per_entity=2
+        )
         for entity in context_entities:
-            related = self.graph_retriever.find_related_entities(
-                entity, max_depth=1, limit=2
-            )
-            expanded_results.extend(related)
+            expanded_results.extend(related_by_entity.get(entity, []))
 
         # Deduplicate and sort
         unique_results = self._deduplicate_results(expanded_results)
@@ -3,7 +3,11 @@ from typing import List, Dict, Any, Optional
 from src.knowledge_base.vector_store import VectorStore
 from src.ingestion.embedder import Embedder
 from src.knowledge_base.cache import CacheStore
+from src.knowledge_base.semantic_cache import SemanticCache
+from src.utils.single_flight import SingleFlight
+from config.settings import get_settings
 from loguru import logger
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 
 
@@ -14,6 +18,27 @@ class VectorRetriever:
         self.vector_store = VectorStore()
         self.embedder = Embedder()
         self.cache = CacheStore()
+        self.settings = get_settings()
+        self.single_flight = SingleFlight(
+            redis_client=self.cache.redis_client
+            if self.settings.single_flight_distributed
+            else None,
+            lock_ttl_ms=self.settings.single_flight_lock_ttl_ms,
+            wait_timeout=self.settings.single_flight_wait_timeout,
+        )
+        self.semantic_cache = None
+        self._sampler = None
+        if self.settings.semantic_cache_enabled:
+            # Sampled hits are re-checked off the request path
+            self._sampler = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="semantic-cache-sample"
+            )
+            self.semantic_cache = SemanticCache(
+                threshold=self.settings.semantic_cache_threshold,
+                max_entries=self.settings.semantic_cache_max_entries,
+                ttl=self.settings.semantic_cache_ttl,
+                sample_rate=self.settings.semantic_cache_sample_rate,
+            )
 
     def search(
         self,
@@ -24,19 +49,85 @@ class VectorRetriever:
     ) -> List[Dict[str, Any]]:
         """Perform vector similarity search"""
 
-        # Create cache key
-        cache_key = self._create_cache_key(query, top_k, filters)
+        # Create cache key for the current corpus generation
+        generation = self.cache.get_generation() if use_cache else 0
+        cache_key = self._create_cache_key(query, top_k, filters, generation)
+        embedding_key = self._create_embedding_key(query)
 
-        # Check cache first
+        # Check cache first, fetching results and query embedding together
+        cached_embedding = None
         if use_cache:
-            cached_results = self.cache.get(cache_key)
+            cached_results, cached_embedding = self.cache.get_many(
+                [cache_key, embedding_key]
+            )
             if cached_results:
                 logger.info("Retrieved results from cache")
                 return cached_results
 
+        if not use_cache:
+            return self._search_uncached(
+                query, top_k, filters, cache_key, embedding_key, generation, None, False
+            )
+
+        # Collapse concurrent misses for the same key into one retrieval
+        return self.single_flight.do(
+            cache_key,
+            lambda: self._search_uncached(
+                query,
+                top_k,
+                filters,
+                cache_key,
+                embedding_key,
+                generation,
+                cached_embedding,
+                True,
+            ),
+            fetch=lambda: self.cache.get(cache_key),
+        )
+
+    def _search_uncached(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        cache_key: str,
+        embedding_key: str,
+        generation: int,
+        cached_embedding: Optional[Any],
+        use_cache: bool,
+    ) -> List[Dict[str, Any]]:
+        """Embed the query and search the vector store, filling the caches"""
         try:
             # Generate query embedding
-            query_embedding = self.embedder.embed_text(query)
+            if cached_embedding is not None:
+                query_embedding = cached_embedding.tolist()
+            else:
+                query_embedding = self.embedder.embed_text(query)
+                if use_cache:
+                    self.cache.set_vector(
+                        embedding_key,
+                        query_embedding,
+                        expire=self.settings.search_cache_ttl,
+                    )
+
+            # Check semantic cache for a near-identical query
+            group = SemanticCache.make_group(top_k, filters, generation)
+            if use_cache and self.semantic_cache:
+                hit = self.semantic_cache.lookup(query_embedding, group)
+                if hit:
+                    logger.info(
+                        f"Retrieved results from semantic cache (similarity {hit['similarity']:.3f})"
+                    )
+                    if hit["sampled"]:
+                        self._sampler.submit(
+                            self._verify_semantic_hit,
+                            query,
+                            query_embedding,
+                            top_k,
+                            filters,
+                            hit,
+                        )
+                    return hit["results"]
 
             # Search vector store
             results = self.vector_store.search(
@@ -46,9 +137,15 @@ class VectorRetriever:
             # Format results
             formatted_results = self._format_results(results)
 
-            # Cache results for 1 hour
+            # Cache results; ingestion bumps the generation so stale keys age out
             if use_cache:
-                self.cache.set(cache_key, formatted_results, expire=3600)
+                self.cache.set(
+                    cache_key, formatted_results, expire=self.settings.search_cache_ttl
+                )
+                if self.semantic_cache:
+                    self.semantic_cache.store(
+                        query_embedding, group, query, formatted_results
+                    )
 
             logger.info(f"Found {len(formatted_results)} results for query")
             return formatted_results
@@ -57,6 +154,38 @@ class VectorRetriever:
             logger.error(f"Vector search error: {e}")
             return []
 
+    def _verify_semantic_hit(
+        self,
+        query: str,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        hit: Dict[str, Any],
+    ):
+        """Compare a sampled semantic hit against a fresh search"""
+        try:
+            fresh = self.vector_store.search(
+                query_embedding=query_embedding, n_results=top_k, where=filters
+            )
+            self.semantic_cache.record_sample(
+                query=query,
+                cached_query=hit["query"],
+                similarity=hit["similarity"],
+                cached_ids=[r["id"] for r in hit["results"]],
+                fresh_ids=fresh.get("ids", [[]])[0],
+            )
+        except Exception as e:
+            logger.error(f"Semantic cache sampling error: {e}")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get semantic cache and request coalescing statistics"""
+        return {
+            "semantic_cache": self.semantic_cache.get_stats()
+            if self.semantic_cache
+            else "disabled",
+            "single_flight": self.single_flight.get_stats(),
+        }
+
     def _format_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Format ChromaDB results"""
         formatted = []
@@ -81,11 +210,20 @@ class VectorRetriever:
         return formatted
 
     def _create_cache_key(
-        self, query: str, top_k: int, filters: Optional[Dict[str, Any]]
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        generation: int = 0,
     ) -> str:
         """Create cache key for query"""
         content = f"vector_search:{query}:{top_k}:{filters}"
-        return f"search:{hashlib.md5(content.encode()).hexdigest()}"
+        return f"search:{generation}:{hashlib.md5(content.encode()).hexdigest()}"
+
+    def _create_embedding_key(self, query: str) -> str:
+        """Create cache key for a query embedding"""
+        content = f"{self.embedder.model}:{query}"
+        return f"embedding:{hashlib.md5(content.encode()).hexdigest()}"
 
     def search_by_document(
         self, doc_id: str, query: str, top_k: int = 5
@@ -0,0 +1,144 @@
+# src/utils/single_flight.py
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+# Delete the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single execution
+
+    Within a process, followers wait for the leader's result. When a Redis
+    client is given, leaders also take a short lock so that leaders in other
+    processes poll ``fetch`` (normally a cache read) instead of recomputing.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        lock_ttl_ms: int = 10000,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05,
+    ):
+        self.redis_client = redis_client
+        self.lock_ttl_ms = lock_ttl_ms
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._release = (
+            redis_client.register_script(_RELEASE_SCRIPT) if redis_client else None
+        )
+
+        self._leaders = 0
+        self._collapsed = 0
+        self._remote_collapsed = 0
+        self._lock_timeouts = 0
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        fetch: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """Run fn once per key across concurrent callers and share the result"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._collapsed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+                leader = True
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                logger.warning(f"Single-flight wait timed out for {key}")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_leader(key, fn, fetch)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "collapsed": self._collapsed,
+                "remote_collapsed": self._remote_collapsed,
+                "lock_timeouts": self._lock_timeouts,
+                "distributed": self.redis_client is not None,
+            }
+
+    def _run_leader(
+        self, key: str, fn: Callable[[], Any], fetch: Optional[Callable[[], Any]]
+    ) -> Any:
+        if self.redis_client is None or fetch is None:
+            return fn()
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = self.redis_client.set(
+                lock_key, token, nx=True, px=self.lock_ttl_ms
+            )
+        except Exception as e:
+            logger.error(f"Single-flight lock error: {e}")
+            return fn()
+
+        if not acquired:
+            # Another process is computing this key, wait for its result
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                value = fetch()
+                if value is not None:
+                    with self._lock:
+                        self._remote_collapsed += 1
+                    return value
+                if not self.redis_client.exists(lock_key):
+                    break
+            else:
+                with self._lock:
+                    self._lock_timeouts += 1
+            return fn()
+
+        try:
+            return fn()
+        finally:
+            try:
+                self._release(keys=[lock_key], args=[token])
+            except Exception as e:
+                logger.error(f"Single-flight unlock error: {e}")
@@ -0,0 +1,27 @@
+# tests/conftest.py
+import sys
+import types
+
+import pytest
+
+from src.knowledge_base import cache as cache_module
+
+try:
+    import chromadb  # noqa: F401
+except ImportError:
+    # Memory modules import chromadb at load time; tests replace the client
+    chromadb = types.ModuleType("chromadb")
+    chromadb.config = types.ModuleType("chromadb.config")
+    chromadb.config.Settings = dict
+    chromadb.PersistentClient = None
+    sys.modules["chromadb"] = chromadb
+    sys.modules["chromadb.config"] = chromadb.config
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """In-memory Redis behind every CacheStore created during the test"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(cache_module, "get_redis_client", lambda: client)
+    return client
@@ -0,0 +1,122 @@
+# tests/test_async_graph_retriever.py
+import asyncio
+
+import pytest
+
+from config.settings import get_settings
+from src.knowledge_base.graph_store import GraphStore
+from src.retrieval import async_graph_retriever as async_module
+from src.retrieval.async_graph_retriever import AsyncGraphRetriever
+
+
+class FakeNode(dict):
+    pass
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    def __aiter__(self):
+        self._iter = iter(self.records)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeAsyncDriver:
+    """Records every query and the database of the session it ran in"""
+
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+        self.databases = []
+
+    def session(self, database=None, default_access_mode=None):
+        self.databases.append(database)
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, work):
+        return await work(self)
+
+    async def run(self, query, **params):
+        self.queries.append(query)
+        return FakeResult(self.records)
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    def build(mode, records=()):
+        settings = get_settings()
+        monkeypatch.setattr(settings, "graph_backend", "neo4j")
+        monkeypatch.setattr(settings, "graph_snapshot_enabled", False)
+        monkeypatch.setattr(settings, "graph_traversal_mode", mode)
+        driver = FakeAsyncDriver(list(records))
+        monkeypatch.setattr(async_module, "get_async_graph_driver", lambda: driver)
+        return AsyncGraphRetriever(), driver
+
+    return build
+
+
+def test_path_mode_runs_the_same_path_query_as_the_sync_retriever(retriever):
+    record = {
+        "seed": "Alpha",
+        "related": FakeNode(name="Beta"),
+        "rels": [FakeNode(weight=1.0)],
+        "distance": 1,
+        "chunk_ids": ["c1"],
+    }
+    async_retriever, driver = retriever("path", [record])
+
+    grouped = asyncio.run(
+        async_retriever.find_related_entities_batch(["Alpha"], max_depth=2)
+    )
+
+    assert grouped["Alpha"][0]["entity"] == {"name": "Beta"}
+    assert grouped["Alpha"][0]["seed_entity"] == "Alpha"
+    (query,) = driver.queries
+    assert "UNWIND $entity_names" in query and "*1..2" in query
+    assert driver.databases == [get_settings().neo4j_database]
+
+
+def test_bfs_mode_expands_hop_by_hop(retriever):
+    async_retriever, driver = retriever("bfs")
+
+    grouped = asyncio.run(
+        async_retriever.find_related_entities_batch(["Alpha"], max_depth=2)
+    )
+
+    assert grouped == {"Alpha": []}
+    assert all("*1.." not in query for query in driver.queries)
+
+
+def test_unknown_traversal_mode_is_rejected(retriever):
+    with pytest.raises(ValueError, match="traversal mode"):
+        retriever("shortest")
+
+
+def test_sync_sessions_use_the_configured_database():
+    opened = []
+
+    class Driver:
+        def session(self, **kwargs):
+            opened.append(kwargs)
+
+    store = GraphStore.__new__(GraphStore)
+    store.settings = get_settings()
+    store.driver = Driver()
+    store.session(default_access_mode="READ")
+
+    assert opened == [
+        {"database": get_settings().neo4j_database, "default_access_mode": "READ"}
+    ]
@@ -0,0 +1,69 @@
+# tests/test_codecs.py
+import json
+
+import numpy as np
+import pytest
+
+from src.knowledge_base.codecs import (
+    CODEC_VECTOR,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    MAGIC,
+    CacheCodec,
+)
+
+VALUE = {
+    "query": "what is rag",
+    "results": [{"id": "c1", "score": 0.91, "metadata": {"page": 3}}] * 50,
+    "empty": None,
+}
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack", "pickle"])
+@pytest.mark.parametrize("compression", ["none", "zstd"])
+def test_values_round_trip(codec, compression):
+    cache_codec = CacheCodec(codec=codec, compression=compression)
+    assert cache_codec.decode(cache_codec.encode(VALUE)) == VALUE
+
+
+def test_large_values_are_compressed_and_small_ones_are_not():
+    codec = CacheCodec(codec="msgpack", compression="zstd", compression_threshold=64)
+    assert codec.encode(VALUE)[4] == COMPRESSION_ZSTD
+    assert codec.encode({"a": 1})[4] == COMPRESSION_NONE
+
+
+def test_legacy_json_values_still_decode():
+    codec = CacheCodec()
+    legacy = json.dumps(VALUE).encode()
+    assert not legacy.startswith(MAGIC)
+    assert codec.decode(legacy) == VALUE
+    assert codec.decode(b"[1, 2]") == [1, 2]
+
+
+def test_values_decode_across_codec_settings():
+    written = CacheCodec(codec="pickle", compression="zstd", compression_threshold=0)
+    reader = CacheCodec(codec="msgpack", compression="none")
+    assert reader.decode(written.encode(VALUE)) == VALUE
+
+
+def test_vectors_round_trip_as_float32():
+    codec = CacheCodec()
+    data = codec.encode_vector([0.5, -1.25, 3.0])
+    assert data[3] == CODEC_VECTOR
+    decoded = codec.decode(data)
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [0.5, -1.25, 3.0]
+
+
+def test_msgpack_keeps_numpy_arrays():
+    codec = CacheCodec(codec="msgpack")
+    decoded = codec.decode(codec.encode({"v": np.arange(4, dtype=np.float32)}))
+    assert decoded["v"].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_unknown_format_version_is_rejected():
+    codec = CacheCodec()
+    data = bytearray(codec.encode(VALUE))
+    data[2] = 99
+    with pytest.raises(ValueError):
+        codec.decode(bytes(data))
@@ -0,0 +1,80 @@
+# tests/test_context_assembler.py
+from src.memory.context_assembler import (
+    SECTION_HEADERS,
+    ContextAssembler,
+    count_tokens,
+)
+
+
+def _results(n):
+    return [
+        {"content": f"passage number {i} " * 5, "combined_score": 1.0 - i * 0.1}
+        for i in range(n)
+    ]
+
+
+def _turns(n):
+    return [
+        {"user_message": f"question {i}", "assistant_response": f"answer {i}"}
+        for i in range(n)
+    ]
+
+
+def test_everything_fits_in_section_order():
+    assembler = ContextAssembler(budget=10_000, max_item_tokens=500)
+    packed = assembler.assemble(
+        retrieved=_results(2),
+        session_history=_turns(2),
+        working_messages=[{"role": "user", "content": "hello"}],
+    )
+
+    lines = packed["context"].splitlines()
+    assert lines[0] == SECTION_HEADERS["retrieval"]
+    assert lines.index(SECTION_HEADERS["session"]) < lines.index(SECTION_HEADERS["working"])
+    assert lines[-1] == "user: hello"
+    assert packed["included"] == {"retrieval": 2, "session": 2, "working": 1}
+    assert packed["dropped"] == []
+    assert packed["tokens"] <= packed["budget"]
+
+
+def test_budget_is_never_exceeded_and_low_value_items_drop_first():
+    assembler = ContextAssembler(budget=60, max_item_tokens=500)
+    packed = assembler.assemble(retrieved=_results(8))
+
+    assert packed["tokens"] <= 60
+    assert count_tokens(packed["context"]) <= 60
+    kept = packed["included"]["retrieval"]
+    assert 0 < kept < 8
+    # Scores fall with rank, so exactly the tail is dropped
+    assert sorted(item["index"] for item in packed["dropped"]) == list(range(kept, 8))
+
+
+def test_recent_turns_outrank_older_ones():
+    assembler = ContextAssembler(budget=25, max_item_tokens=500)
+    packed = assembler.assemble(session_history=_turns(6))
+
+    assert "question 5" in packed["context"]
+    assert "question 0" not in packed["context"]
+
+
+def test_summary_is_emitted_before_the_turns():
+    assembler = ContextAssembler(budget=10_000, max_item_tokens=500)
+    packed = assembler.assemble(session_history=_turns(2), session_summary="earlier talk")
+
+    lines = packed["context"].splitlines()
+    assert lines[:2] == [SECTION_HEADERS["session"], "Summary: earlier talk"]
+    assert packed["included"]["session"] == 3
+
+
+def test_long_items_are_truncated_to_the_item_limit():
+    assembler = ContextAssembler(budget=10_000, max_item_tokens=20)
+    packed = assembler.assemble(retrieved=[{"content": "word " * 500, "combined_score": 0.9}])
+
+    body = packed["context"].splitlines()[1]
+    assert count_tokens(body) <= 20
+
+
+def test_empty_inputs_give_an_empty_context():
+    packed = ContextAssembler(budget=100).assemble()
+    assert packed["context"] == ""
+    assert packed["tokens"] == 0
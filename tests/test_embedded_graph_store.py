@@ -0,0 +1,213 @@
+# tests/test_embedded_graph_store.py
+import json
+import random
+from collections import deque
+
+import pytest
+
+from src.knowledge_base.embedded_graph_store import EmbeddedGraphStore
+from src.knowledge_base.graph_store import remove_document_weight
+
+
+def brute_force_distances(edges, seed, max_depth, types=None):
+    adjacency = {}
+    for source, target, rel_type in edges:
+        if types is None or rel_type in types:
+            adjacency.setdefault(source, set()).add(target)
+            adjacency.setdefault(target, set()).add(source)
+    distances = {seed: 0}
+    queue = deque([seed])
+    while queue:
+        node = queue.popleft()
+        if distances[node] == max_depth:
+            continue
+        for nbr in adjacency.get(node, ()):
+            if nbr not in distances:
+                distances[nbr] = distances[node] + 1
+                queue.append(nbr)
+    del distances[seed]
+    return distances
+
+
+@pytest.fixture
+def graph():
+    random.seed(11)
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities(
+        [
+            {"id": f"e{i}", "type": "Concept", "properties": {"name": f"Entity {i}"}}
+            for i in range(80)
+        ]
+    )
+    edges = set()
+    while len(edges) < 150:
+        a, b = random.sample(range(80), 2)
+        edges.add((f"e{a}", f"e{b}", random.choice(["RELATED_TO", "CO_OCCURS_WITH"])))
+    store.merge_relationships(
+        [{"from": a, "to": b, "type": t, "properties": {"weight": random.random()}} for a, b, t in edges]
+    )
+    return store, edges
+
+
+@pytest.mark.parametrize("max_depth", [1, 2, 3])
+@pytest.mark.parametrize("types", [None, ["RELATED_TO"]])
+def test_expand_bfs_matches_brute_force(graph, max_depth, types):
+    store, edges = graph
+    seeds = ["e0", "e7", "e50"]
+    results = store.expand_bfs(
+        seeds, max_depth, types, fanout=1000, max_frontier=1000, max_degree=1000
+    )
+
+    expected = {}
+    for seed in seeds:
+        for node, distance in brute_force_distances(edges, seed, max_depth, types).items():
+            if node not in seeds:
+                expected[node] = min(distance, expected.get(node, distance))
+    assert {node: hit["distance"] for node, hit in results.items()} == expected
+    for node, hit in results.items():
+        assert hit["name"] == f"Entity {node[1:]}"
+        assert len(hit["relationships"]) == hit["distance"]
+
+
+def test_expand_bfs_caps_fanout_by_heaviest_edges():
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities([{"id": f"e{i}", "properties": {"name": f"E{i}"}} for i in range(5)])
+    store.merge_relationships(
+        [
+            {"from": "e0", "to": f"e{i}", "type": "RELATED_TO", "properties": {"weight": i}}
+            for i in range(1, 5)
+        ]
+    )
+
+    results = store.expand_bfs(["e0"], 1, fanout=2)
+    assert set(results) == {"e3", "e4"}
+
+
+def test_super_nodes_are_reached_but_not_expanded():
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities([{"id": f"e{i}", "properties": {"name": f"E{i}"}} for i in range(5)])
+    store.merge_relationships(
+        [{"from": "e1", "to": f"e{i}", "type": "RELATED_TO"} for i in (0, 2, 3, 4)]
+    )
+
+    assert set(store.expand_bfs(["e0"], 2, max_degree=3)) == {"e1"}
+    assert set(store.expand_bfs(["e0"], 2, max_degree=4)) == {"e1", "e2", "e3", "e4"}
+
+
+def test_shortest_path_matches_brute_force(graph):
+    store, edges = graph
+    distances = brute_force_distances(edges, "e0", 4)
+    for target in ("e3", "e21", "e40", "e79"):
+        path = store.shortest_path("Entity 0", f"Entity {target[1:]}", 4)
+        if target in distances:
+            assert path["distance"] == distances[target]
+            assert path["path_nodes"][0]["id"] == "e0"
+            assert path["path_nodes"][-1]["id"] == target
+        else:
+            assert path is None
+
+
+def test_neighbors_include_top_chunks(graph):
+    store, edges = graph
+    store.merge_mentions(
+        [
+            {"from": "e1", "to": f"c{i}", "doc_id": "d", "count": i}
+            for i in range(1, 5)
+        ]
+    )
+    store.merge_relationships([{"from": "e0", "to": "e1", "type": "RELATED_TO"}])
+
+    hits = {hit["entity"]["id"]: hit for hit in store.neighbors("Entity 0", limit=100)}
+    assert set(hits) == set(brute_force_distances(edges | {("e0", "e1", "RELATED_TO")}, "e0", 1))
+    assert hits["e1"]["chunk_ids"] == ["c4", "c3", "c2"]
+
+
+def test_merge_relationships_counts_only_written_edges():
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities([{"id": "a", "properties": {"name": "A"}}, {"id": "b", "properties": {"name": "B"}}])
+
+    written = store.merge_relationships(
+        [
+            {"from": "a", "to": "b", "type": "RELATED_TO"},
+            {"from": "a", "to": "missing", "type": "RELATED_TO"},
+            {"from": "a", "to": "a", "type": "RELATED_TO"},
+        ]
+    )
+
+    assert written == 1
+    assert store.get_graph_stats()["relationships"] == 1
+
+
+def test_weights_accumulate_once_per_document():
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities([{"id": "a", "properties": {"name": "A"}}, {"id": "b", "properties": {"name": "B"}}])
+    row = {"from": "a", "to": "b", "type": "CO_OCCURS_WITH"}
+
+    store.merge_relationships([{**row, "properties": {"weight": 2, "doc_id": "d1"}}])
+    store.merge_relationships([{**row, "properties": {"weight": 2, "doc_id": "d1"}}])
+    store.merge_relationships([{**row, "properties": {"weight": 3, "doc_id": "d2"}}])
+
+    (_, rel), = store._adjacent(["a"], None, None)["a"]
+    assert rel["weight"] == 5
+    assert rel["doc_ids"] == ["d1", "d2"]
+
+
+def _edges(store):
+    rows = store.conn.execute(
+        "SELECT source, target, weight, properties FROM relationships"
+    ).fetchall()
+    return {
+        (row[0], row[1]): (row[2], json.loads(row[3])["doc_ids"]) for row in rows
+    }
+
+
+def test_deleting_a_document_removes_its_graph_contribution():
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities([{"id": e, "type": "Concept"} for e in "abcd"])
+
+    def edge(source, target, doc_id, weight):
+        return {
+            "from": source,
+            "to": target,
+            "type": "CO_OCCURS_WITH",
+            "properties": {"weight": weight, "doc_id": doc_id},
+        }
+
+    store.merge_relationships(
+        [edge("a", "b", "d1", 2.0), edge("b", "c", "d1", 1.0)]
+    )
+    store.merge_relationships(
+        [edge("a", "b", "d2", 1.0), edge("a", "d", "d2", 1.0)]
+    )
+    store.merge_mentions(
+        [
+            {"from": e, "to": f"{doc}-chunk", "doc_id": doc, "count": 1}
+            for doc, entities in (("d1", "abc"), ("d2", "abd"))
+            for e in entities
+        ]
+    )
+    assert _edges(store)[("a", "b")] == (3.0, ["d1", "d2"])
+
+    store.delete_document_chunks("d1")
+
+    assert _edges(store) == {("a", "b"): (1.0, ["d2"]), ("a", "d"): (1.0, ["d2"])}
+    entities = [row[0] for row in store.conn.execute("SELECT id FROM entities")]
+    assert sorted(entities) == ["a", "b", "d"]
+    assert set(store.expand_bfs(["a"], max_depth=2)) == {"b", "d"}
+
+    store.delete_document_chunks("d2")
+    assert _edges(store) == {}
+    assert store.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 0
+
+
+def test_legacy_edges_lose_an_even_share():
+    legacy = {"weight": 3.0, "doc_ids": ["d1", "d2", "d3"], "label": "x"}
+
+    remaining = remove_document_weight(legacy, "d2")
+    assert remaining["weight"] == pytest.approx(2.0)
+    assert remaining["doc_ids"] == ["d1", "d3"]
+    assert remaining["doc_weights"] == [1.0, 1.0]
+    assert remaining["label"] == "x"
+
+    assert remove_document_weight(legacy, "other") is legacy
+    assert remove_document_weight({"weight": 1.0, "doc_ids": ["d1"]}, "d1") is None
@@ -0,0 +1,82 @@
+# tests/test_entity_chunks.py
+from src.ingestion.extractor import RuleBasedExtractor, entity_id
+from src.knowledge_base import metadata_store as metadata_module
+from src.knowledge_base.metadata_store import MetadataStore
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+
+    def cursor(self):
+        return self
+
+    def close(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+
+def _store(monkeypatch):
+    written = []
+    monkeypatch.setattr(
+        metadata_module,
+        "execute_values",
+        lambda cursor, sql, rows, page_size: written.extend(rows),
+    )
+    store = MetadataStore.__new__(MetadataStore)
+    store.conn = FakeConnection()
+    return store, written
+
+
+def test_case_colliding_names_are_one_mention_per_chunk():
+    extractor = RuleBasedExtractor(workers=1)
+    extracted = extractor.extract(
+        [{"chunk_id": "c1", "text": "Apple sued APPLE and apple Inc lost to Apple."}],
+        "doc",
+    )
+
+    apple = entity_id("Apple")
+    mentions = [m for m in extracted["mentions"] if m["from"] == apple]
+    assert len(mentions) == 1
+    assert mentions[0]["count"] == 3
+    assert all(r["from"] != r["to"] for r in extracted["relationships"])
+    names = {e["id"]: e["properties"]["name"] for e in extracted["entities"]}
+    assert names[apple] == "Apple"
+
+
+def test_gazetteer_terms_keep_their_canonical_name():
+    extractor = RuleBasedExtractor(gazetteer={"OpenAI": "Organization"}, workers=1)
+    extracted = extractor.extract(
+        [{"chunk_id": "c1", "text": "openai and OPENAI and OpenAI"}], "doc"
+    )
+
+    assert extracted["entities"] == [
+        {
+            "id": entity_id("OpenAI"),
+            "type": "Organization",
+            "properties": {"name": "OpenAI"},
+        }
+    ]
+    assert extracted["mentions"][0]["count"] == 3
+
+
+def test_duplicate_links_are_summed_before_upsert(monkeypatch):
+    store, written = _store(monkeypatch)
+    store.store_entity_chunks(
+        [
+            {"entity_id": "e1", "chunk_id": "c1", "score": 2},
+            {"entity_id": "e1", "chunk_id": "c1", "score": 1},
+            {"entity_id": "e1", "chunk_id": "c2", "score": 1},
+        ]
+    )
+
+    assert sorted(written) == [("e1", "c1", 3), ("e1", "c2", 1)]
+    assert store.conn.commits == 1
+
+
+def test_no_rows_skip_the_database(monkeypatch):
+    store, written = _store(monkeypatch)
+    store.store_entity_chunks([])
+    assert written == [] and store.conn.commits == 0
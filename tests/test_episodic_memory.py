@@ -0,0 +1,134 @@
+# tests/test_episodic_memory.py
+import math
+import time
+
+import pytest
+
+from src.memory import episodic_memory
+from src.memory.episodic_memory import EpisodicMemory, decay_weight
+
+VOCABULARY = ("cats", "dogs", "rust")
+
+
+def _embed(text):
+    return [float(text.count(word)) for word in VOCABULARY] + [1e-3]
+
+
+class FakeEmbedder:
+    def embed_text(self, text):
+        return _embed(text)
+
+    def embed_batch(self, texts, batch_size=None):
+        return [_embed(text) for text in texts]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, ids, embeddings, documents, metadatas):
+        for row in zip(ids, embeddings, documents, metadatas):
+            self.rows[row[0]] = row[1:]
+
+    def count(self):
+        return len(self.rows)
+
+    def query(self, query_embeddings, n_results, include):
+        query = query_embeddings[0]
+
+        def distance(embedding):
+            dot = sum(a * b for a, b in zip(query, embedding))
+            norms = math.hypot(*query) * math.hypot(*embedding)
+            return 1 - dot / norms
+
+        ranked = sorted(self.rows.items(), key=lambda item: distance(item[1][0]))
+        ranked = ranked[:n_results]
+        return {
+            "ids": [[key for key, _ in ranked]],
+            "documents": [[row[1] for _, row in ranked]],
+            "metadatas": [[row[2] for _, row in ranked]],
+            "distances": [[distance(row[0]) for _, row in ranked]],
+        }
+
+
+class FakeClient:
+    def __init__(self, *args, **kwargs):
+        self.collections = {}
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self.collections.setdefault(name, FakeCollection())
+
+    def get_collection(self, name):
+        return self.collections[name]
+
+    def delete_collection(self, name):
+        del self.collections[name]
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    monkeypatch.setattr(episodic_memory.chromadb, "PersistentClient", FakeClient)
+    monkeypatch.setattr(episodic_memory, "Embedder", FakeEmbedder)
+    memory = EpisodicMemory(
+        batch_size=4, flush_interval=0.05, half_life_days=1, decay_floor=0.2
+    )
+    yield memory
+    memory.close()
+
+
+def test_decay_weight():
+    assert decay_weight(0, 1, 0.2) == pytest.approx(1.0)
+    assert decay_weight(-100, 1, 0.2) == pytest.approx(1.0)
+    assert decay_weight(86400, 1, 0.2) == pytest.approx(0.6)
+    assert decay_weight(1e9, 1, 0.2) == pytest.approx(0.2)
+
+
+def test_recorded_episodes_are_recalled_per_user(memory):
+    assert memory.record("alice", "tell me about cats", "cats purr", session_id="s1")
+    assert memory.record("alice", "and rust?", "rust is a language")
+    assert memory.record("bob", "dogs?", "dogs bark")
+    memory.close()
+
+    assert memory.count("alice") == 2
+    assert memory.count("bob") == 1
+    recalled = memory.recall("alice", "cats", top_k=1)
+    assert len(recalled) == 1
+    assert recalled[0]["content"].startswith("User: tell me about cats")
+    assert recalled[0]["metadata"]["session_id"] == "s1"
+    assert all("dogs" not in episode["content"] for episode in memory.recall("alice", "dogs"))
+
+
+def test_recall_weights_similarity_by_age(memory):
+    now = time.time()
+    memory._collection("carol", create=True).add(
+        ids=["old", "new", "other"],
+        embeddings=[_embed("cats"), _embed("cats cats dogs"), _embed("rust")],
+        documents=["old cats", "new cats", "rust"],
+        metadatas=[
+            {"timestamp": now - 30 * 86400},
+            {"timestamp": now},
+            {"timestamp": now},
+        ],
+    )
+
+    recalled = memory.recall("carol", "cats", top_k=3)
+    # The exact but month-old match ranks below a close recent one
+    assert [episode["id"] for episode in recalled][:2] == ["new", "old"]
+    assert recalled[1]["similarity_score"] > recalled[0]["similarity_score"]
+    assert recalled[0]["combined_score"] > recalled[1]["combined_score"]
+
+    assert [e["id"] for e in memory.recall("carol", "cats", min_score=0.5)] == ["new"]
+
+
+def test_unknown_user_and_forget(memory):
+    assert memory.recall("nobody", "cats") == []
+    assert memory.count("nobody") == 0
+
+    memory.record("dave", "cats", "cats", metadata={"tags": ["x"], "source": "api"})
+    memory.close()
+    stored = memory.recall("dave", "cats")[0]["metadata"]
+    assert stored["source"] == "api"
+    assert "tags" not in stored
+
+    memory.forget("dave")
+    assert memory.recall("dave", "cats") == []
@@ -0,0 +1,71 @@
+# tests/test_graph_centrality.py
+import time
+
+import pytest
+
+from src.knowledge_base.embedded_graph_store import EmbeddedGraphStore
+from src.knowledge_base.graph_centrality import GraphCentrality
+
+
+@pytest.fixture
+def store():
+    store = EmbeddedGraphStore(":memory:")
+    store.merge_entities(
+        [{"id": f"e{i}", "type": "Concept", "properties": {"name": f"E{i}"}} for i in range(4)]
+    )
+    # Star around e0, plus e3 hanging off e1
+    store.merge_relationships(
+        [
+            {"from": "e0", "to": "e1", "type": "RELATED_TO"},
+            {"from": "e0", "to": "e2", "type": "RELATED_TO"},
+            {"from": "e1", "to": "e3", "type": "RELATED_TO"},
+        ]
+    )
+    return store
+
+
+def test_embedded_store_scores_are_written_and_marked_updated(store):
+    before = dict(store.conn.execute("SELECT id, updated_at FROM entities").fetchall())
+    time.sleep(0.002)
+
+    centrality = GraphCentrality(store)
+    centrality.load_from_graph()
+    assert centrality.compute_and_store()["entities"] == 4
+
+    entities = store.get_entities(["e0", "e1", "e2", "e3"])
+    scores = {node_id: hit["entity"]["centrality"] for node_id, hit in entities.items()}
+    assert max(scores, key=scores.get) in ("e0", "e1")
+    assert max(scores.values()) == pytest.approx(1.0)
+    after = dict(store.conn.execute("SELECT id, updated_at FROM entities").fetchall())
+    assert all(after[node_id] > before[node_id] for node_id in before)
+
+
+def test_personalized_pagerank_is_empty_until_loaded(store):
+    centrality = GraphCentrality(store)
+    assert centrality.personalized_pagerank(["E0"]) == {}
+
+    centrality.load_from_graph()
+    scores = centrality.personalized_pagerank(["E0"])
+    assert "e0" not in scores
+    assert max(scores.values()) == pytest.approx(1.0)
+
+
+def test_background_load_backs_off_after_failures(store, tmp_path, monkeypatch):
+    centrality = GraphCentrality(store)
+    calls = []
+
+    def failing_load():
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RuntimeError("graph unavailable")
+        GraphCentrality.load_from_graph(centrality)
+
+    monkeypatch.setattr(centrality, "load_from_graph", failing_load)
+    centrality.start_background_load(
+        str(tmp_path / "missing.npz"), retry_delay=0.05, max_retry_delay=1.0
+    )
+
+    assert centrality.load_complete.wait(timeout=5)
+    assert centrality.loaded and centrality.load_error is None
+    assert len(calls) == 3
+    assert calls[2] - calls[1] >= calls[1] - calls[0]
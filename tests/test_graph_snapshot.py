@@ -0,0 +1,211 @@
+# tests/test_graph_snapshot.py
+import random
+from collections import deque
+
+import pytest
+
+from src.knowledge_base.graph_snapshot import GraphSnapshot, StringTable
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0]
+
+
+class FakeGraph:
+    """Entities and typed edges answering the snapshot's Cypher queries"""
+
+    def __init__(self):
+        self.nodes = {}  # id -> {"name", "type", "updated_at", "centrality"}
+        self.edges = {}  # (source, target, type) -> weight
+        self.clock = 10_000
+
+    @property
+    def driver(self):
+        return self
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_node(self, node_id, name=None, node_type="Concept"):
+        self.clock += 1
+        self.nodes[node_id] = {
+            "name": name or node_id,
+            "type": node_type,
+            "updated_at": self.clock,
+            "centrality": random.random(),
+        }
+
+    def add_edge(self, source, target, rel_type="RELATED_TO", weight=1.0):
+        self.clock += 1
+        self.edges[(source, target, rel_type)] = weight
+        for node in (source, target):
+            self.nodes[node]["updated_at"] = self.clock
+
+    def run(self, query, since=None):
+        if "count(e) AS entities" in query:
+            return FakeResult([{"entities": len(self.nodes), "relationships": len(self.edges)}])
+        if "RETURN e.id AS id" in query:
+            return FakeResult(
+                {"id": node_id, **node}
+                for node_id, node in self.nodes.items()
+                if since is None or node["updated_at"] > since
+            )
+        records = []
+        for (source, target, rel_type), weight in self.edges.items():
+            if since is None:
+                records.append((source, target, rel_type, weight))
+                continue
+            if self.nodes[source]["updated_at"] > since:
+                records.append((source, target, rel_type, weight))
+            if self.nodes[target]["updated_at"] > since:
+                records.append((target, source, rel_type, weight))
+        return FakeResult(
+            {"source": s, "target": t, "type": r, "weight": w} for s, t, r, w in records
+        )
+
+
+def brute_force_distances(graph, seed_id, max_depth, types=None):
+    adjacency = {node: set() for node in graph.nodes}
+    for source, target, rel_type in graph.edges:
+        if types is None or rel_type in types:
+            adjacency[source].add(target)
+            adjacency[target].add(source)
+    distances = {seed_id: 0}
+    queue = deque([seed_id])
+    while queue:
+        node = queue.popleft()
+        if distances[node] == max_depth:
+            continue
+        for nbr in adjacency[node]:
+            if nbr not in distances:
+                distances[nbr] = distances[node] + 1
+                queue.append(nbr)
+    del distances[seed_id]
+    return distances
+
+
+@pytest.fixture
+def graph():
+    random.seed(7)
+    graph = FakeGraph()
+    for i in range(60):
+        graph.add_node(f"e{i}", name=f"Entity {i}")
+    for _ in range(120):
+        a, b = random.sample(range(60), 2)
+        graph.add_edge(f"e{a}", f"e{b}", random.choice(["RELATED_TO", "CO_OCCURS_WITH"]))
+    return graph
+
+
+def snapshot_distances(snapshot, name, max_depth, types=None):
+    results = snapshot.related_entities(name, types, max_depth, limit=10_000)
+    return {hit["entity"]["id"]: hit["distance"] for hit in results}
+
+
+def test_string_table_finds_first_index():
+    table = StringTable(["b", None, "a", "b"])
+    assert table.find("b") == 0
+    assert table.find("a") == 2
+    assert table.find("zzz") is None
+    assert table.tolist() == ["b", None, "a", "b"]
+
+
+@pytest.mark.parametrize("max_depth", [1, 2, 3])
+@pytest.mark.parametrize("types", [None, ["CO_OCCURS_WITH"]])
+def test_related_entities_match_brute_force_bfs(graph, max_depth, types):
+    snapshot = GraphSnapshot(graph, full_reload_interval=3600)
+    snapshot.load()
+    for seed in ("e0", "e13", "e42"):
+        expected = brute_force_distances(graph, seed, max_depth, types)
+        name = graph.nodes[seed]["name"]
+        assert snapshot_distances(snapshot, name, max_depth, types) == expected
+
+
+def test_shortest_path_length_matches_brute_force(graph):
+    snapshot = GraphSnapshot(graph, full_reload_interval=3600)
+    snapshot.load()
+    distances = brute_force_distances(graph, "e0", 4)
+    for target in ("e5", "e17", "e33", "e58"):
+        path = snapshot.shortest_path("Entity 0", graph.nodes[target]["name"], 4)
+        if target in distances:
+            assert path["distance"] == distances[target]
+            assert path["path_nodes"][-1]["id"] == target
+        else:
+            assert path is None
+
+
+def test_incremental_refresh_adds_nodes_and_edges(graph):
+    snapshot = GraphSnapshot(graph, rebuild_fraction=1.0, full_reload_interval=3600)
+    snapshot.load()
+
+    graph.add_node("new", name="Brand New")
+    graph.add_edge("new", "e0", "RELATED_TO")
+    graph.nodes["e1"]["name"] = "Renamed"
+    graph.nodes["e1"]["updated_at"] = graph.clock + 1
+    snapshot.refresh()
+
+    assert snapshot.get_stats()["overlay_nodes"] > 0
+    assert snapshot_distances(snapshot, "Brand New", 2) == brute_force_distances(
+        graph, "new", 2
+    )
+    assert snapshot_distances(snapshot, "Renamed", 1) == brute_force_distances(
+        graph, "e1", 1
+    )
+    assert snapshot.related_entities("Entity 1") == []
+
+
+def test_deletions_force_a_full_reload(graph):
+    snapshot = GraphSnapshot(graph, rebuild_fraction=1.0, full_reload_interval=3600)
+    snapshot.load()
+
+    removed = next(iter(graph.edges))
+    del graph.edges[removed]
+    snapshot.refresh()
+
+    assert snapshot.get_stats()["overlay_nodes"] == 0
+    assert snapshot_distances(snapshot, "Entity 0", 3) == brute_force_distances(
+        graph, "e0", 3
+    )
+
+
+def hub_graph():
+    graph = FakeGraph()
+    graph.add_node("hub", name="Hub")
+    for i in range(10):
+        graph.add_node(f"s{i}", name=f"Spoke {i}")
+        graph.add_edge("hub", f"s{i}", weight=float(i))
+        graph.add_node(f"l{i}", name=f"Leaf {i}")
+        graph.add_edge(f"s{i}", f"l{i}")
+    return graph
+
+
+def test_fanout_keeps_the_heaviest_edges():
+    snapshot = GraphSnapshot(hub_graph(), full_reload_interval=3600, fanout=3)
+    snapshot.load()
+    distances = snapshot_distances(snapshot, "Hub", 2)
+    assert distances == {
+        "s9": 1, "s8": 1, "s7": 1, "l9": 2, "l8": 2, "l7": 2,
+    }
+
+
+def test_frontier_and_degree_caps_stop_expansion():
+    graph = hub_graph()
+    graph.add_node("root", name="Root")
+    graph.add_edge("root", "hub")
+
+    snapshot = GraphSnapshot(graph, full_reload_interval=3600, max_degree=5)
+    snapshot.load()
+    # The hub is reported but too connected to expand
+    assert snapshot_distances(snapshot, "Root", 3) == {"hub": 1}
+
+    snapshot = GraphSnapshot(graph, full_reload_interval=3600, max_frontier=2)
+    snapshot.load()
+    distances = snapshot_distances(snapshot, "Hub", 2)
+    assert sum(1 for d in distances.values() if d == 1) == 11
+    assert sum(1 for d in distances.values() if d == 2) == 2
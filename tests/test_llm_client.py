@@ -0,0 +1,49 @@
+# tests/test_llm_client.py
+import pytest
+
+from src.llm.client import to_gemini_contents
+
+
+def test_roles_are_mapped_and_consecutive_turns_merged():
+    contents, system = to_gemini_contents(
+        [
+            {"role": "system", "content": "be brief"},
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+            {"role": "user", "content": "question"},
+            {"role": "user", "content": "more detail"},
+        ],
+        system_prompt="you are helpful",
+    )
+
+    assert contents == [
+        {"role": "user", "parts": ["hi"]},
+        {"role": "model", "parts": ["hello"]},
+        {"role": "user", "parts": ["question", "more detail"]},
+    ]
+    assert system == "you are helpful\n\nbe brief"
+
+
+def test_no_system_prompt():
+    contents, system = to_gemini_contents([{"role": "user", "content": "hi"}])
+    assert contents == [{"role": "user", "parts": ["hi"]}]
+    assert system is None
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [[], [{"role": "system", "content": "only instructions"}]],
+)
+def test_empty_conversation_is_rejected(messages):
+    with pytest.raises(ValueError, match="at least one"):
+        to_gemini_contents(messages, system_prompt="sys")
+
+
+def test_conversation_must_end_with_a_user_turn():
+    with pytest.raises(ValueError, match="end with a user turn"):
+        to_gemini_contents(
+            [
+                {"role": "user", "content": "hi"},
+                {"role": "assistant", "content": "hello"},
+            ]
+        )
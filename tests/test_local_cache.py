@@ -0,0 +1,97 @@
+# tests/test_local_cache.py
+import json
+import time
+
+import pytest
+
+from src.knowledge_base import cache as cache_module
+from src.knowledge_base.cache import CacheStore, INVALIDATION_CHANNEL, PROCESS_ID
+from src.knowledge_base.local_cache import LocalCache
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = LocalCache(max_entries=2, max_bytes=1024, ttl=60)
+    cache.set("a", 1, 1)
+    cache.set("b", 2, 1)
+    cache.get("a")
+    cache.set("c", 3, 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_limit_evicts_and_rejects_oversized_values():
+    cache = LocalCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.set("a", "a", 6)
+    cache.set("b", "b", 6)
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] == 6
+
+    cache.set("b", "big", 11)
+    assert cache.get("b") is None
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = LocalCache(ttl=60)
+    cache.set("a", 1, 1, ttl=5)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_delete_pattern_only_removes_matching_keys():
+    cache = LocalCache()
+    cache.set("query:1", 1, 1)
+    cache.set("query:2", 2, 1)
+    cache.set("doc:1", 3, 1)
+    cache.delete_pattern("query:*")
+
+    assert cache.get("query:1") is None
+    assert cache.get("doc:1") == 3
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server)
+    local = LocalCache()
+    monkeypatch.setattr(cache_module, "get_redis_client", lambda: client)
+    monkeypatch.setattr(cache_module, "get_local_cache", lambda: local)
+    return CacheStore(use_local_cache=True)
+
+
+def test_writes_publish_invalidations_for_other_processes(store):
+    pubsub = store.redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(INVALIDATION_CHANNEL)
+
+    store.set("k", {"v": 1})
+    store.delete_many(["k", "j"])
+
+    messages = []
+    for _ in range(10):
+        message = pubsub.get_message(timeout=0.1)
+        if message:
+            messages.append(json.loads(message["data"]))
+    assert [m["keys"] for m in messages] == [["k"], ["k", "j"]]
+    assert all(m["sender"] == PROCESS_ID for m in messages)
+
+
+def test_reads_are_served_from_local_cache(store):
+    store.set("k", [1, 2])
+    store.redis_client.delete("k")  # only L1 has it now
+
+    assert store.get("k") == [1, 2]
+    store.delete("k")
+    assert store.get("k") is None
+    assert store.local_cache.get("k") is None
+
+
+def test_bump_generation_returns_counter_and_caches_it(store):
+    assert store.bump_generation("gen") == 1
+    assert store.bump_generation("gen") == 2
+    assert store.local_cache.get("generation:gen") == 2
@@ -0,0 +1,55 @@
+# tests/test_semantic_cache.py
+import time
+
+from src.knowledge_base.semantic_cache import SemanticCache
+
+
+def test_lookup_hits_similar_query_in_same_group():
+    cache = SemanticCache(threshold=0.9, max_entries=4, sample_rate=0.0)
+    cache.store([1.0, 0.0], "g", "query", [{"id": "a"}])
+
+    hit = cache.lookup([0.99, 0.05], "g")
+    assert hit["results"] == [{"id": "a"}]
+    assert hit["query"] == "query"
+
+    assert cache.lookup([0.99, 0.05], "other") is None
+    assert cache.lookup([0.0, 1.0], "g") is None
+
+
+def test_expired_entries_are_dropped_with_their_group():
+    cache = SemanticCache(threshold=0.9, max_entries=4, sample_rate=0.0)
+    cache.store([1.0, 0.0], "short", "q1", [], ttl=1)
+    cache.store([0.0, 1.0], "long", "q2", [], ttl=60)
+
+    cache._expire(time.time() + 2)
+
+    assert cache.get_stats()["entries"] == 1
+    assert "short" not in cache._group_ids
+    assert cache.lookup([0.0, 1.0], "long") is not None
+
+
+def test_least_recently_used_entry_is_evicted_when_full():
+    cache = SemanticCache(threshold=0.9, max_entries=2, sample_rate=0.0)
+    cache.store([1.0, 0.0, 0.0], "g", "a", [])
+    cache.store([0.0, 1.0, 0.0], "g", "b", [])
+    cache.lookup([1.0, 0.0, 0.0], "g")  # touch "a"
+    cache.store([0.0, 0.0, 1.0], "g", "c", [])
+
+    assert cache.lookup([1.0, 0.0, 0.0], "g")["query"] == "a"
+    assert cache.lookup([0.0, 1.0, 0.0], "g") is None
+
+
+def test_slot_reuse_does_not_expire_new_entry():
+    cache = SemanticCache(threshold=0.9, max_entries=1, sample_rate=0.0)
+    cache.store([1.0, 0.0], "g", "old", [], ttl=1)
+    cache.store([0.0, 1.0], "g", "new", [], ttl=60)  # evicts "old" from the slot
+
+    cache._expire(time.time() + 2)
+
+    assert cache.lookup([0.0, 1.0], "g")["query"] == "new"
+
+
+def test_default_sample_rate_matches_settings():
+    from config.settings import Settings
+
+    assert SemanticCache().sample_rate == Settings().semantic_cache_sample_rate
@@ -0,0 +1,202 @@
+# tests/test_semantic_memory.py
+import threading
+
+import pytest
+from psycopg2.errors import UniqueViolation
+
+from src.memory import semantic_memory as semantic_module
+from src.memory.semantic_memory import SemanticMemory, content_hash
+
+VOCABULARY = ("paris", "berlin", "tea")
+
+
+def _embed(text):
+    return [float(text.lower().count(word)) for word in VOCABULARY] + [1e-3]
+
+
+def _row(fact_id, content, key=None):
+    return (fact_id, key, content, 1, 1, 1.0, None, {}, None, None)
+
+
+class FakeEmbedder:
+    def embed_text(self, text):
+        return _embed(text)
+
+    def embed_batch(self, texts, batch_size=None):
+        return [_embed(text) for text in texts]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.vectors = {}
+        self.deleted = []
+
+    def get(self, ids, include):
+        found = [i for i in ids if i in self.vectors]
+        return {"ids": found, "embeddings": [self.vectors[i] for i in found]}
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.vectors.update(zip(ids, embeddings))
+
+    def delete(self, ids):
+        self.deleted.extend(ids)
+
+
+class FakeChroma:
+    def __init__(self, *args, **kwargs):
+        self.collection = FakeCollection()
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self.collection
+
+
+class TrackingLock:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.depth = 0
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.depth += 1
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+        self.lock.release()
+
+
+class FakeConnection:
+    """Active rows for one user; other stores' rows are keyed by content hash"""
+
+    def __init__(self):
+        self.rows = []
+        self.stored_elsewhere = {}
+        # Rows another process commits just before our next insert
+        self.conflict = None
+        self.selects = []
+        self.commits = 0
+        self.memory = None
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        if sql.lstrip().startswith("SELECT"):
+            self.selects.append(self.memory._lock.depth if self.memory else None)
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def store(monkeypatch):
+    conn = FakeConnection()
+    statements = []
+
+    def execute_values(cursor, sql, rows, fetch=False):
+        statements.append((" ".join(sql.split()), rows))
+        if conn.conflict is not None and sql.lstrip().startswith("INSERT"):
+            conn.rows, conn.conflict = conn.conflict, None
+            raise UniqueViolation("idx_semantic_facts_active_key")
+        if fetch:
+            return [(conn.stored_elsewhere.get(row[4], row[0]), row[4]) for row in rows]
+
+    monkeypatch.setattr(semantic_module.psycopg2, "connect", lambda url: conn)
+    monkeypatch.setattr(semantic_module.chromadb, "PersistentClient", FakeChroma)
+    monkeypatch.setattr(semantic_module, "Embedder", FakeEmbedder)
+    monkeypatch.setattr(semantic_module, "execute_values", execute_values)
+
+    memory = SemanticMemory(merge_threshold=0.92)
+    memory._lock = TrackingLock()
+    conn.memory = memory
+    return memory, conn, statements
+
+
+def test_profile_is_read_under_the_lock_and_cached(store):
+    memory, conn, _ = store
+    conn.rows = [_row("f1", "Drinks tea")]
+    commits = conn.commits
+
+    assert [fact["fact_id"] for fact in memory.get_profile("u")] == ["f1"]
+    assert conn.selects == [1]
+    # The read transaction is closed, not left open on the shared connection
+    assert conn.commits == commits + 1
+
+    memory.search("u", "tea")
+    assert conn.selects == [1]
+
+
+def test_new_fact_is_inserted_and_indexed(store):
+    memory, conn, statements = store
+
+    assert memory.add_facts("u", ["Drinks tea"]) == {
+        "added": 1,
+        "merged": 0,
+        "superseded": 0,
+    }
+    (sql, rows), = statements
+    assert sql.startswith("INSERT") and "RETURNING fact_id" in sql
+    assert list(memory.collection.vectors) == [rows[0][0]]
+    assert memory.get_profile("u")[0]["content"] == "Drinks tea"
+    assert len(conn.selects) == 1
+
+
+def test_content_stored_by_another_writer_is_merged_onto_its_row(store):
+    memory, conn, statements = store
+    conn.stored_elsewhere[content_hash("Drinks tea")] = "theirs"
+
+    assert memory.add_facts("u", ["Drinks tea"]) == {
+        "added": 0,
+        "merged": 1,
+        "superseded": 0,
+    }
+    # No vector under an id that was never stored
+    assert memory.collection.vectors == {}
+
+    # The cached profile held our id, so it is reloaded from the store
+    conn.rows = [_row("theirs", "Drinks tea")]
+    assert [fact["fact_id"] for fact in memory.get_profile("u")] == ["theirs"]
+    assert len(conn.selects) == 2
+
+
+def test_superseded_fact_points_at_the_row_actually_stored(store):
+    memory, conn, statements = store
+    conn.rows = [_row("f1", "Lives in Paris", key="city")]
+    conn.stored_elsewhere[content_hash("Lives in Berlin")] = "f2"
+
+    result = memory.add_facts("u", [{"content": "Lives in Berlin", "key": "city"}])
+
+    assert result == {"added": 0, "merged": 1, "superseded": 1}
+    supersede, insert, repoint = statements
+    assert supersede[0].startswith("UPDATE") and "status = 'superseded'" in supersede[0]
+    assert "COALESCE(semantic_facts.fact_key, EXCLUDED.fact_key)" in insert[0]
+    assert "superseded_by = v.new_id" in repoint[0]
+    assert repoint[1] == [("f1", "f2")]
+    assert memory.collection.deleted == ["f1"]
+    assert "f2" not in memory.collection.vectors
+
+
+def test_key_stored_by_another_writer_is_superseded_on_retry(store):
+    memory, conn, statements = store
+    memory.get_profile("u")
+    conn.conflict = [_row("theirs", "Lives in Paris", key="city")]
+
+    result = memory.add_facts("u", [{"content": "Lives in Berlin", "key": "city"}])
+
+    assert result == {"added": 1, "merged": 0, "superseded": 1}
+    failed, supersede, insert = statements
+    assert failed[0].startswith("INSERT") and insert[0].startswith("INSERT")
+    new_id = insert[1][0][0]
+    assert supersede[1] == [("theirs", new_id)]
+    # The profile was reloaded before the retry and the fact kept its version
+    assert len(conn.selects) == 2
+    assert insert[1][0][5] == 2
+    assert [fact["content"] for fact in memory.get_profile("u")] == ["Lives in Berlin"]
@@ -0,0 +1,192 @@
+# tests/test_session_archive.py
+import time
+
+import pytest
+
+from config.settings import get_settings
+from src.memory import session_archive as archive_module
+from src.memory import session_memory as session_module
+from src.memory.session_archive import ACTIVE_SESSIONS_KEY, SessionArchive
+from src.memory.session_memory import SessionMemory
+
+
+class FakeConnection:
+    """``session_archive`` as a dict of session_id -> payload bytes"""
+
+    def __init__(self):
+        self.rows = {}
+        self.selected = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT session_id, payload"):
+            self.selected = [
+                (session_id, self.rows[session_id])
+                for session_id in params[0]
+                if session_id in self.rows
+            ]
+        elif sql.startswith("SELECT"):
+            payload = self.rows.get(params[0])
+            self.selected = [(payload,)] if payload is not None else []
+
+    def fetchone(self):
+        return self.selected[0] if self.selected else None
+
+    def fetchall(self):
+        return self.selected
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def archive(fake_redis, monkeypatch):
+    conn = FakeConnection()
+    hooks = []
+
+    def execute_values(cursor, sql, rows):
+        for session_id, payload, _, _ in rows:
+            conn.rows[session_id] = bytes(payload.adapted)
+        for hook in hooks:
+            hook()
+
+    monkeypatch.setattr(archive_module.psycopg2, "connect", lambda url: conn)
+    monkeypatch.setattr(archive_module, "execute_values", execute_values)
+    archive = SessionArchive(idle_seconds=0, batch_size=2)
+    archive.hooks = hooks
+    return archive
+
+
+def _idle_session(fake_redis, session_id, turns=3):
+    session = SessionMemory(session_id)
+    for i in range(turns):
+        session.add_interaction(f"question {i}", f"answer {i}")
+    fake_redis.zadd(ACTIVE_SESSIONS_KEY, {session_id: time.time() - 60})
+    return session
+
+
+def test_idle_sessions_are_spilled_and_restored(fake_redis, archive):
+    for session_id in ("a", "b", "c"):
+        _idle_session(fake_redis, session_id)
+
+    assert archive.spill_idle() == 3
+    assert sorted(archive.conn.rows) == ["a", "b", "c"]
+    assert not fake_redis.exists("session:a:messages", "session:a:meta")
+    assert fake_redis.zcard(ACTIVE_SESSIONS_KEY) == 0
+
+    assert archive.restore("a", ttl=100)
+    assert fake_redis.zscore(ACTIVE_SESSIONS_KEY, "a") is not None
+    assert 0 < fake_redis.ttl("session:a:meta") <= 100
+    history = SessionMemory("a").get_conversation_history()
+    assert [turn["user_message"] for turn in history] == [
+        "question 0",
+        "question 1",
+        "question 2",
+    ]
+    assert SessionMemory("a").get_session_metadata()["total_interactions"] == 3
+
+
+def test_restore_reports_whether_it_restored(fake_redis, archive):
+    _idle_session(fake_redis, "a")
+    archive.spill_idle()
+
+    assert not archive.restore("missing", ttl=100)
+    assert archive.restore("a", ttl=100)
+    # Another request got there first
+    assert not archive.restore("a", ttl=100)
+    assert len(SessionMemory("a").get_conversation_history()) == 3
+
+
+def test_session_written_during_spill_is_kept(fake_redis, archive):
+    session = _idle_session(fake_redis, "a")
+    archive.hooks.append(lambda: fake_redis.zadd(ACTIVE_SESSIONS_KEY, {"a": time.time()}))
+
+    assert archive.spill_idle() == 0
+    assert fake_redis.exists("session:a:messages")
+    assert len(session.get_conversation_history()) == 3
+
+
+def test_expired_sessions_leave_the_index(fake_redis, archive):
+    fake_redis.zadd(ACTIVE_SESSIONS_KEY, {"gone": time.time() - 60})
+
+    assert archive.spill_idle() == 0
+    assert archive.conn.rows == {}
+    assert fake_redis.zcard(ACTIVE_SESSIONS_KEY) == 0
+
+
+@pytest.fixture
+def archived_sessions(archive, monkeypatch):
+    """SessionMemory objects created from here on use the test archive"""
+    monkeypatch.setattr(get_settings(), "session_archive_enabled", True)
+    monkeypatch.setattr(session_module, "get_session_archive", lambda: archive)
+    return archive
+
+
+def _spill(fake_redis, archive, session_id):
+    fake_redis.zadd(ACTIVE_SESSIONS_KEY, {session_id: time.time() - 60})
+    assert archive.spill_idle() == 1
+
+
+def _archived(archive, session_id):
+    return archive.codec.decode(archive.conn.rows[session_id])
+
+
+def test_long_lived_session_restores_before_writing(fake_redis, archived_sessions):
+    session = SessionMemory("a")
+    for i in range(3):
+        session.add_interaction(f"question {i}", f"answer {i}")
+    _spill(fake_redis, archived_sessions, "a")
+
+    # Same object, after its session was spilled
+    session.add_interaction("question 3", "answer 3")
+
+    history = session.get_conversation_history()
+    assert [turn["user_message"] for turn in history] == [
+        f"question {i}" for i in range(4)
+    ]
+    assert session.get_session_metadata()["total_interactions"] == 4
+
+    _spill(fake_redis, archived_sessions, "a")
+    assert len(_archived(archived_sessions, "a")["messages"]) == 4
+
+
+def test_write_is_refused_when_restore_fails(fake_redis, archived_sessions, monkeypatch):
+    session = SessionMemory("a")
+    session.add_interaction("question 0", "answer 0")
+    _spill(fake_redis, archived_sessions, "a")
+
+    def broken(session_id, ttl):
+        raise ConnectionError("postgres unavailable")
+
+    monkeypatch.setattr(archived_sessions, "restore", broken)
+    session.add_interaction("question 1", "answer 1")
+
+    assert not fake_redis.exists("session:a:messages", "session:a:meta")
+    assert len(_archived(archived_sessions, "a")["messages"]) == 1
+
+
+def test_fragment_written_while_spilled_is_merged(fake_redis, archive):
+    _idle_session(fake_redis, "a")
+    assert archive.spill_idle() == 1
+
+    # A writer unaware of the archive starts a new list for the same id
+    fragment = SessionMemory("a")
+    fragment.add_interaction("question 3", "answer 3")
+    _spill(fake_redis, archive, "a")
+
+    archived = _archived(archive, "a")
+    assert [turn["user_message"] for turn in archived["messages"]] == [
+        f"question {i}" for i in range(4)
+    ]
+    assert archived["meta"]["total_interactions"] == "4"
+
+    assert archive.restore("a", ttl=100)
+    assert len(SessionMemory("a").get_conversation_history()) == 4
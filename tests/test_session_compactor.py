@@ -0,0 +1,86 @@
+# tests/test_session_compactor.py
+from src.memory.session_compactor import SessionCompactor
+from src.memory.session_memory import SessionMemory
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, previous, turns):
+        self.calls.append((previous, [turn["user_message"] for turn in turns]))
+        return f"{previous}+{len(turns)}" if previous else str(len(turns))
+
+
+def _session(session_id, turns):
+    session = SessionMemory(session_id, max_messages=50)
+    for i in range(turns):
+        session.add_interaction(f"question {i}", f"answer {i}")
+    return session
+
+
+def test_folds_older_turns_and_keeps_recent(fake_redis):
+    session = _session("s1", 8)
+    summarizer = RecordingSummarizer()
+    compactor = SessionCompactor(summarizer=summarizer, keep_recent=3)
+
+    assert compactor.compact("s1")
+    assert summarizer.calls == [("", [f"question {i}" for i in range(5)])]
+    assert session.get_summary() == "5"
+    history = session.get_conversation_history()
+    assert [turn["user_message"] for turn in history] == [
+        "question 5",
+        "question 6",
+        "question 7",
+    ]
+    assert not fake_redis.exists("lock:session:s1:compact")
+
+
+def test_second_fold_extends_the_summary(fake_redis):
+    session = _session("s2", 5)
+    summarizer = RecordingSummarizer()
+    compactor = SessionCompactor(summarizer=summarizer, keep_recent=2)
+    assert compactor.compact("s2")
+
+    for i in range(5, 8):
+        session.add_interaction(f"question {i}", f"answer {i}")
+    assert compactor.compact("s2")
+
+    assert summarizer.calls[1] == ("3", ["question 3", "question 4", "question 5"])
+    assert session.get_summary() == "3+3"
+    history = session.get_conversation_history()
+    assert [turn["user_message"] for turn in history] == ["question 6", "question 7"]
+
+
+def test_nothing_to_fold(fake_redis):
+    _session("s3", 2)
+    summarizer = RecordingSummarizer()
+    compactor = SessionCompactor(summarizer=summarizer, keep_recent=3)
+
+    assert not compactor.compact("s3")
+    assert summarizer.calls == []
+
+
+def test_commit_is_skipped_if_someone_compacted_meanwhile(fake_redis):
+    session = _session("s4", 6)
+
+    def racing_summarizer(previous, turns):
+        # Another worker commits while this one is summarising
+        fake_redis.hset("session:s4:meta", "summarized_upto", 2)
+        return "stale"
+
+    compactor = SessionCompactor(summarizer=racing_summarizer, keep_recent=2)
+    assert not compactor.compact("s4")
+    assert session.get_summary() == ""
+    assert len(session.get_conversation_history()) == 6
+
+
+def test_held_lock_skips_compaction(fake_redis):
+    _session("s5", 6)
+    fake_redis.set("lock:session:s5:compact", "other")
+    summarizer = RecordingSummarizer()
+    compactor = SessionCompactor(summarizer=summarizer, keep_recent=2)
+
+    assert not compactor.compact("s5")
+    assert summarizer.calls == []
+    assert fake_redis.get("lock:session:s5:compact") == b"other"
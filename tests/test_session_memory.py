@@ -0,0 +1,91 @@
+# tests/test_session_memory.py
+import json
+
+from src.knowledge_base.cache import get_codec
+from src.memory.session_memory import SessionMemory
+
+
+def _interaction(i):
+    return {
+        "user_message": f"question {i}",
+        "assistant_response": f"answer {i}",
+        "timestamp": f"2024-01-01T00:00:0{i}",
+        "metadata": {},
+    }
+
+
+def test_appends_are_kept_in_order_and_trimmed(fake_redis):
+    session = SessionMemory("s1", max_messages=3)
+    for i in range(5):
+        session.add_interaction(f"question {i}", f"answer {i}")
+
+    history = session.get_conversation_history()
+    assert [turn["user_message"] for turn in history] == [
+        "question 2",
+        "question 3",
+        "question 4",
+    ]
+    assert session.get_conversation_history(limit=1)[0]["user_message"] == "question 4"
+    metadata = session.get_session_metadata()
+    assert metadata["interaction_count"] == 3
+    assert metadata["total_interactions"] == 5
+
+
+def test_legacy_json_blob_is_migrated_once(fake_redis):
+    legacy = {
+        "interactions": [_interaction(i) for i in range(3)],
+        "created_at": "2024-01-01T00:00:00",
+    }
+    fake_redis.set("session:old", json.dumps(legacy))
+
+    session = SessionMemory("old")
+    assert session.get_conversation_history() == legacy["interactions"]
+    assert not fake_redis.exists("session:old")
+    metadata = session.get_session_metadata()
+    assert metadata["created_at"] == "2024-01-01T00:00:00"
+    assert metadata["total_interactions"] == 3
+
+    session.add_interaction("question 3", "answer 3")
+    assert len(SessionMemory("old").get_conversation_history()) == 4
+
+
+def test_legacy_blob_in_current_codec_is_migrated(fake_redis):
+    legacy = {"interactions": [_interaction(1)], "created_at": "2024-01-01T00:00:00"}
+    fake_redis.set("session:coded", get_codec().encode(legacy))
+
+    session = SessionMemory("coded")
+    session.add_interaction("question 2", "answer 2")
+
+    history = session.get_conversation_history()
+    assert [turn["user_message"] for turn in history] == ["question 1", "question 2"]
+
+
+def test_legacy_blob_never_overwrites_the_new_layout(fake_redis):
+    SessionMemory("both").add_interaction("new question", "new answer")
+    fake_redis.set("session:both", json.dumps({"interactions": [_interaction(1)]}))
+
+    history = SessionMemory("both").get_conversation_history()
+    assert [turn["user_message"] for turn in history] == ["new question"]
+
+
+def test_context_string_keeps_most_recent_turns_within_budget(fake_redis):
+    session = SessionMemory("ctx")
+    for i in range(4):
+        session.add_interaction(f"question {i}", f"answer {i}")
+
+    full = session.get_context_string()
+    assert full.splitlines()[0] == "User: question 0"
+
+    trimmed = session.get_context_string(max_tokens=12)
+    assert "question 3" in trimmed
+    assert "question 0" not in trimmed
+
+
+def test_clear_session_removes_everything(fake_redis):
+    fake_redis.set("session:gone", json.dumps({"interactions": [_interaction(1)]}))
+    session = SessionMemory("gone")
+    session.add_interaction("q", "a")
+    session.clear_session()
+
+    assert fake_redis.keys("session:gone*") == []
+    assert SessionMemory("gone").get_conversation_history() == []
@@ -0,0 +1,114 @@
+# tests/test_single_flight.py
+import threading
+import time
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "value"
+
+    def caller():
+        results.append(flight.do("key", compute))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait(2)
+    followers = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while flight.get_stats()["collapsed"] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == ["value"] * 5
+    stats = flight.get_stats()
+    assert stats["leaders"] == 1 and stats["in_flight"] == 0
+
+
+def test_leader_error_reaches_followers_and_key_is_released():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def compute():
+        started.set()
+        release.wait(2)
+        raise RuntimeError("boom")
+
+    def caller():
+        try:
+            flight.do("key", compute)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait(2)
+    follower = threading.Thread(target=caller)
+    follower.start()
+    while flight.get_stats()["collapsed"] < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert errors == ["boom", "boom"]
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.get_stats()["leaders"] == 2
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis()
+
+
+def test_leader_releases_its_distributed_lock(redis_client):
+    flight = SingleFlight(redis_client=redis_client)
+    assert flight.do("key", lambda: "value", fetch=lambda: None) == "value"
+    assert not redis_client.exists("lock:key")
+
+
+def test_remote_leader_result_is_fetched_instead_of_recomputed(redis_client):
+    flight = SingleFlight(redis_client=redis_client, poll_interval=0.01)
+    redis_client.set("lock:key", "other-process", px=10000)
+    cached = {}
+    threading.Timer(0.05, lambda: cached.update(value="remote")).start()
+
+    def compute():
+        raise AssertionError("should not recompute")
+
+    assert flight.do("key", compute, fetch=lambda: cached.get("value")) == "remote"
+    assert flight.get_stats()["remote_collapsed"] == 1
+    # Someone else's lock is left alone
+    assert redis_client.get("lock:key") == b"other-process"
+
+
+def test_recomputes_when_remote_leader_gives_up(redis_client):
+    flight = SingleFlight(redis_client=redis_client, poll_interval=0.01)
+    redis_client.set("lock:key", "other-process", px=30)
+
+    assert flight.do("key", lambda: "local", fetch=lambda: None) == "local"
+    assert flight.get_stats()["lock_timeouts"] == 0
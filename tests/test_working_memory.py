@@ -0,0 +1,94 @@
+# tests/test_working_memory.py
+from src.memory import working_memory as working_module
+from src.memory.context_assembler import count_tokens_uncached
+from src.memory.working_memory import WorkingMemory
+
+
+def _memory(n, max_size=10):
+    memory = WorkingMemory(max_size=max_size)
+    for i in range(n):
+        memory.add_message("user", f"message number {i}")
+    return memory
+
+
+def test_zero_size_window_keeps_nothing():
+    memory = WorkingMemory(max_size=0)
+    memory.add_message("user", "hello")
+
+    assert len(memory) == 0
+    assert memory.get_recent() == []
+    assert memory.get_context_string(max_tokens=10) == ""
+    assert memory.token_count == 0
+
+
+def test_oldest_messages_are_evicted():
+    memory = _memory(5, max_size=3)
+
+    assert [m["content"] for m in memory.get_recent()] == [
+        "message number 2",
+        "message number 3",
+        "message number 4",
+    ]
+    assert memory.get_context_string().splitlines()[0] == "user: message number 2"
+
+
+def test_get_recent_keeps_the_list_slice_contract():
+    memory = _memory(4)
+    contents = [m["content"] for m in memory.get_recent()]
+
+    assert [m["content"] for m in memory.get_recent(2)] == contents[-2:]
+    assert [m["content"] for m in memory.get_recent(0)] == contents
+    assert [m["content"] for m in memory.get_recent(9)] == contents
+    assert [m["content"] for m in memory.get_recent(-1)] == contents[1:]
+
+    recent = memory.get_recent(1)[0]
+    assert isinstance(recent, dict)
+    assert set(recent) == {"role", "content", "timestamp", "metadata"}
+    assert recent["metadata"] == {}
+
+
+def test_tokens_are_counted_only_when_a_budget_is_checked(monkeypatch):
+    counted = []
+
+    def counting(text):
+        counted.append(text)
+        return count_tokens_uncached(text)
+
+    monkeypatch.setattr(working_module, "count_tokens_uncached", counting)
+    memory = _memory(3)
+    memory.get_context_string()
+    memory.get_recent(2)
+    assert counted == []
+
+    full = memory.get_context_string()
+    assert memory.token_count == count_tokens_uncached(full)
+    assert len(counted) == 3
+
+    memory.add_message("assistant", "reply")
+    memory.get_context_string(max_tokens=1000)
+    # Earlier messages keep their counts
+    assert counted[3:] == ["assistant: reply"]
+
+
+def test_budget_keeps_the_most_recent_messages_that_fit():
+    memory = _memory(6)
+    line_tokens = count_tokens_uncached("user: message number 5") + 1
+
+    trimmed = memory.get_context_string(max_tokens=2 * line_tokens)
+    assert trimmed.splitlines() == ["user: message number 4", "user: message number 5"]
+    assert memory.get_context_string(max_tokens=line_tokens - 1) == ""
+
+
+def test_context_string_is_cached_until_the_window_changes():
+    memory = _memory(2)
+    first = memory.get_context_string()
+    assert memory.get_context_string() is first
+
+    memory.add_message("assistant", "reply")
+    updated = memory.get_context_string()
+    assert updated is not first
+    assert updated.endswith("assistant: reply")
+
+    memory.clear()
+    assert memory.get_context_string() == ""
+    assert memory.token_count == 0